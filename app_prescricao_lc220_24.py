@@ -1,12 +1,44 @@
 # app_prescricao_lc220_24.py
+import io
 import streamlit as st
-from datetime import date, datetime
-from dateutil.relativedelta import relativedelta
-from datetime import date as _date_for_prevcheck
+from dataclasses import asdict
+from datetime import date, timedelta
 import pandas as pd
-from io import BytesIO
-import re
-import zipfile
+
+from prescricao_motor import (
+    COLUNAS_RESUMO,
+    ENQUADRAMENTOS,
+    ResultadoGestor,
+    calcular_por_gestor,
+    janela_proximo_marco,
+    limite_intercorrente,
+    linha_resumo,
+    linhas_detalhe,
+    sugerir_enquadramento,
+)
+from prescricao_banco import conectar, consultar_resultados, salvar_caso
+from prescricao_cache import cache_padrao
+from prescricao_cenarios import Cenario, ResumoCenarios, comparar_cenarios
+from prescricao_docx import build_regras_fundamentos_docx_bytes, build_roteiro_docx_bytes
+from prescricao_exportacao import excel_cacheado, fingerprint_caso, make_excel_bytes_expanded
+from prescricao_horizonte import APELIDOS_ENQUADRAMENTO, IndiceVencimentos
+from prescricao_lote import (
+    COLUNAS_ENTRADA,
+    TIPOS_MARCO,
+    ler_casos,
+    linha_do_tempo_resultados,
+    processar_carteira,
+    separar_marcos,
+)
+from prescricao_movimentos import (
+    TabelaRegras,
+    carregar_regras,
+    importar_marcos,
+    linhas_tabela_marcos,
+    varrer_movimentos,
+)
+from prescricao_regras import carregar_conjunto, compilar, tabela_padrao
+from prescricao_telemetria import iniciar_rerun, painel_autorizado
 
 # --------------------------------------------------------------------------------------
 # Configuração da página e layout
@@ -14,281 +46,45 @@ import zipfile
 st.set_page_config(page_title="Prescrição — LC-RJ 63/1990 (art. 5º-A)", layout="wide")
 st.markdown("<style>.block-container {max-width:980px; padding-left:12px; padding-right:12px;}</style>", unsafe_allow_html=True)
 
+# Telemetria do rerun (desligada por padrão; ver prescricao_telemetria)
+_painel_tm = painel_autorizado(st.query_params.get("telemetria"))
+_tm = iniciar_rerun(painel=_painel_tm)
+
+# Conjunto de regras em uso (datas de corte, prazos): os textos da página são derivados dele — ver prescricao_regras
+regras_vigentes = tabela_padrao()
+_cr = regras_vigentes.conjunto
+_fatos, _lei = _cr.marco_fatos.strftime("%d/%m/%Y"), _cr.marco_lei.strftime("%d/%m/%Y")
+_paralisacao = regras_vigentes.rotulo_paralisacao.removeprefix("Paralisação superior a ")
+
 # Limites amplos para aceitar datas antigas e futuras
 MIN_DATA = date(1900, 1, 1)
 MAX_DATA = date(2100, 12, 31)
 
-# --------------------------------------------------------------------------------------
-# Utilitário: gerar DOCX do Roteiro Oficial (sem dependências externas)
-# --------------------------------------------------------------------------------------
-def _xml_escape(s: str) -> str:
-    return (s.replace("&", "&amp;")
-             .replace("<", "&lt;")
-             .replace(">", "&gt;")
-             .replace('"', "&quot;")
-             .replace("'", "&apos;"))
-
-def _build_document_xml(sections):
-    def para(text, is_heading=False):
-        t = _xml_escape(text)
-        if is_heading:
-            return f"<w:p><w:r><w:rPr><w:b/><w:sz w:val='28'/></w:rPr><w:t xml:space='preserve'>{t}</w:t></w:r></w:p>"
-        else:
-            return f"<w:p><w:r><w:t xml:space='preserve'>{t}</w:t></w:r></w:p>"
-
-    body = []
-    for text, is_heading in sections:
-        body.append(para(text, is_heading))
-    xml = (
-        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
-        '<w:document xmlns:wpc="http://schemas.microsoft.com/office/2010/wordprocessingCanvas" '
-        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
-        'xmlns:o="urn:schemas-microsoft-com:office:office" '
-        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
-        'xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" '
-        'xmlns:v="urn:schemas-microsoft-com:vml" '
-        'xmlns:wp14="http://schemas.microsoft.com/office/2010/wordprocessingDrawing" '
-        'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
-        'xmlns:w10="urn:schemas-microsoft-com:office:word" '
-        'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
-        'xmlns:w14="http://schemas.microsoft.com/office/2010/wordml" '
-        'xmlns:wpg="http://schemas.microsoft.com/office/2010/wordprocessingGroup" '
-        'xmlns:wpi="http://schemas.microsoft.com/office/2010/wordprocessingInk" '
-        'xmlns:wne="http://schemas.microsoft.com/office/2006/wordml" '
-        'xmlns:wps="http://schemas.microsoft.com/office/2010/wordprocessingShape" mc:Ignorable="w14 wp14">'
-        '<w:body>' + "".join(body) +
-        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
-        '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" w:header="708" w:footer="708" w:gutter="0"/></w:sectPr>'
-        '</w:body></w:document>'
-    )
-    return xml
-
-def build_roteiro_docx_bytes() -> bytes:
-    sections = [
-        ("ROTEIRO OFICIAL — Calculadora de Prescrição (LC-RJ 63/1990, art. 5º-A)", True),
-        ("1) Finalidade", True),
-        ("Padronizar a aplicação do art. 5º-A (LCE 63/1990) com a chave intertemporal consolidada pelo Plenário: "
-         "fatos ≥ 18/07/2021 → novo regime (5 anos do fato/cessação); fatos < 18/07/2021 → teste pré-lei e, não consumando até 18/07/2024, transição bienal (18/07/2024 → 18/07/2026).", False),
-
-        ("2) Chave intertemporal — visão executiva", True),
-        ("• Fatos ≥ 18/07/2021 → Novo regime (5 anos do fato/cessação).", False),
-        ("• Fatos < 18/07/2021 → faça o TESTE PRÉ-LEI: projete 5 anos da ciência (em regra, autuação) com marcos até 18/07/2024. "
-         "Se consumou até 18/07/2024 → prescrição antes da lei. Se NÃO consumou → Transição (18/07/2024 → 18/07/2026), independentemente de a ciência ser posterior.", False),
-        ("• Decisão administrativa transitada até 18/07/2024 → fora do alcance da LCE 220/2024.", False),
-
-        ("3) Marcos interruptivos", True),
-        ("• Teste pré-lei: apenas marcos entre a ciência e 18/07/2024 (reiniciam o quinquênio do regime anterior).", False),
-        ("• Transição: apenas marcos a partir de 18/07/2024.", False),
-        ("• Novo regime: marcos a partir do fato/cessação.", False),
-        ("• Qualificação: chamamento qualificado é subjetivo e retroage à decisão que o determinou; simples protocolo de TCE não interrompe.", False),
-
-        ("4) Intercorrente e prazo penal", True),
-        ("• Intercorrente: paralisação > 3 anos sem julgamento/despacho (art. 5º-A, §1º).", False),
-        ("• Prazo penal: prevalece sobre o administrativo quando cabível (art. 5º-A, §2º).", False),
-
-        ("5) Passo a passo no aplicativo", True),
-        ("1. Preencha: natureza, conduta, data do fato/cessação (ou base motivada na ressarcitória).", False),
-        ("2. Informe autuação; por padrão, 'Ciência = autuação' fica ligado. Desligue para editar ciência distinta.", False),
-        ("3. Lançe marcos gerais (valem para todos) e, por gestor, os chamamentos qualificados (efeito subjetivo).", False),
-        ("4. O app sugere o enquadramento: novo regime / transição / prescrição antes da lei / fora do alcance. Ajuste se necessário.", False),
-        ("5. Se desejar, habilite intercorrente e informe último ato + termo final (ou 'hoje').", False),
-        ("6. Verifique os cartões por gestor e exporte o Excel (Resumo + abas auxiliares).", False),
-
-        ("6) ÍNDICE E EXPLICAÇÕES DOS VÍDEOS (sem áudio)", True),
-
-        ("01_Novo_Regime_FatoRecente.mp4", True),
-        ("Objetivo: Demonstrar fato ≥ 18/07/2021 com contagem quinquenal a partir do fato/cessação.", False),
-        ("Entradas: Punitiva; Ato 03/11/2021; Autuação/Ciência 12/12/2024; sem marcos; sem intercorrente.", False),
-        ("Resultado: Enquadramento 'Novo regime (art. 5º-A)'; prazo final 03/11/2026.", False),
-
-        ("02_Transicao_CienciaPosterior.mp4", True),
-        ("Objetivo: Fato anterior a 18/07/2021 com ciência posterior à lei (aplica transição bienal).", False),
-        ("Entradas: Punitiva; Ato 15/06/2016; Ciência 12/12/2024; sem marcos.", False),
-        ("Resultado: 'Transição 2 anos (LC 220/24)'; vence 18/07/2026.", False),
-
-        ("03_Prescricao_AntesDaLei.mp4", True),
-        ("Objetivo: Reconhecimento de prescrição pré-lei pelo quinquênio da ciência.", False),
-        ("Entradas: Ato 10/05/2015; Ciência 10/06/2017; sem marcos até 18/07/2024.", False),
-        ("Resultado: 'Prescrição reconhecida (regime anterior)'.", False),
-
-        ("04_Transicao_MarcoGeral.mp4", True),
-        ("Objetivo: Mostrar reinício do bienal por ato inequívoco de apuração pós-lei.", False),
-        ("Entradas: Ato 20/02/2017; Ciência 01/08/2024; Marco geral 10/09/2025.", False),
-        ("Resultado: Novo vencimento 10/09/2027.", False),
-
-        ("05_Transicao_Chamamento_Subjetivo.mp4", True),
-        ("Objetivo: Efeito subjetivo do chamamento qualificado (multi-gestores).", False),
-        ("Entradas: Fato 2016; Ciência 2024; Gestor A com chamamento 20/06/2026 (decisão em 05/05/2026); Gestor B sem chamamento.", False),
-        ("Resultado: Gestor A vence 05/05/2028 (retroação à decisão); Gestor B vence 18/07/2026.", False),
-
-        ("06_Intercorrente.mp4", True),
-        ("Objetivo: Prescrição intercorrente (> 3 anos) durante a tramitação.", False),
-        ("Entradas: Novo regime; último ato 01/08/2021; ato subsequente 05/09/2024.", False),
-        ("Resultado: 'Prescrição intercorrente'.", False),
-
-        ("07_Continuada_Cessacao.mp4", True),
-        ("Objetivo: Conduta continuada (termo na cessação).", False),
-        ("Entradas: Cessação 31/12/2022; sem marcos; sem intercorrente.", False),
-        ("Resultado: Novo regime; prazo final 31/12/2027.", False),
-
-        ("08_Ressarcitoria_UltimaMedicao.mp4", True),
-        ("Objetivo: Ressarcitória (analogia) com base 'última medição/pagamento'.", False),
-        ("Entradas: Última medição 30/03/2019; ciência 2024; sem marcos.", False),
-        ("Resultado: Transição; vence 18/07/2026 (salvo marcos pós-lei).", False),
-
-        ("09_PrazoPenal.mp4", True),
-        ("Objetivo: Prevalência do prazo penal (§2º).", False),
-        ("Entradas: Ato 10/10/2022; 'Fato também é crime: Sim'; Prazo penal 8 anos.", False),
-        ("Resultado: Base = penal (8 anos); vencimento 10/10/2030.", False),
-
-        ("10_Ciencia_Apos_18072026.mp4", True),
-        ("Objetivo: Ciência apenas após 18/07/2026 em caso de transição (sem marcos).", False),
-        ("Entradas: Fato 2017; Ciência 01/08/2026; sem marcos.", False),
-        ("Resultado: Prescrição consumada em 18/07/2026 (ciência tardia não reabre).", False),
-
-        ("11_Multigestores_ExportacaoExcel.mp4", True),
-        ("Objetivo: Preencher vários gestores, com marcos gerais e chamamentos específicos, e exportar o Excel.", False),
-        ("Entradas: Fato 2016; Marco geral 01/03/2025; Chamamento só do Gestor B 15/05/2025.", False),
-        ("Resultado: Planilha com Resumo e abas auxiliares; prazos distintos por gestor.", False),
-    ]
-
-    document_xml = _build_document_xml(sections)
-    content_types_xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
-        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
-        '<Default Extension="xml" ContentType="application/xml"/>'
-        '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
-        '</Types>'
-    )
-    rels_xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
-        '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
-        '</Relationships>'
-    )
-    word_rels_xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        '<Relationships xmlns="http://schemas.microsoft.com/office/2006/relationships"/>'
-    )
-    buf = BytesIO()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
-        z.writestr('[Content_Types].xml', content_types_xml)
-        z.writestr('_rels/.rels', rels_xml)
-        z.writestr('word/document.xml', document_xml)
-        z.writestr('word/_rels/document.xml.rels', word_rels_xml)
-    return buf.getvalue()
-
 # --------------------------------------------------------------------------------------
 # Cabeçalho + botão de download do Roteiro (DOCX)
 # --------------------------------------------------------------------------------------
+_tm.secao("0) Cabeçalho e guias")
 st.title("Calculadora de Prescrição — LC-RJ 63/1990 (art. 5º-A)")
 st.caption("Ferramenta de apoio. Ajuste as premissas ao caso concreto.")
 
 with st.expander("📘 Roteiro Oficial — ver/baixar", expanded=False):
     st.markdown("O Roteiro Oficial consolida as regras, a chave intertemporal e exemplos de uso.")
-    roteiro_bytes = build_roteiro_docx_bytes()
+    # DOCX gerado sob demanda (no clique) e cacheado por processo — ver prescricao_docx
     st.download_button(
         "⬇️ Baixar Roteiro Oficial (DOCX)",
-        data=roteiro_bytes,
+        data=build_roteiro_docx_bytes,
         file_name="Roteiro_Oficial_Calculadora_Prescricao.docx",
         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         use_container_width=True
     )
-# ==============================
-# Novo: "Regras e fundamentos básicos" (DOCX)
-# ==============================
-def build_regras_fundamentos_docx_bytes() -> bytes:
-    intro = (
-        "Este guia resume a chave intertemporal e os principais fundamentos aplicados pela calculadora de "
-        "prescrição (art. 5º-A da LCE 63/1990, redação da LCE 220/2024), a partir dos paradigmas 224.269-8/23, "
-        "227.877-1/14 e 114.199-4/2024. Para fatos ≥ 18/07/2021, aplica-se o novo regime (termo no fato/cessação; "
-        "quinquênio). Para fatos < 18/07/2021, preserva-se o teste pré-lei (quinquênio pela ciência do TCE) e, não "
-        "consumada até 18/07/2024, incide a regra de transição (biênio a partir de 18/07/2024), com marcos interruptivos "
-        "aplicáveis. Interrupções reiniciam o prazo no mesmo regime (5 anos no novo; 2 anos na transição). O chamamento "
-        "qualificado tem efeito subjetivo. As regras podem ser ajustadas por novos votos; registre a motivação no parecer."
-    )
-
-    bullets = [
-        # Chave intertemporal
-        ("CHAVE INTERTEMPORAL", True),
-        ("• Fatos ≥ 18/07/2021 → Novo regime (art. 5º-A): termo no fato/cessação; prazo 5 anos; "
-         "marcos a partir do fato/cessação; intercorrente em 3 anos. (Base: 224.269-8/23; 227.877-1/14)", False),
-        ("• Fatos < 18/07/2021 → Teste pré-lei (regime anterior): quinquênio contado da ciência pelo TCE "
-         "(em regra, a autuação). Se NÃO consumou até 18/07/2024 → Transição bienal (18/07/2024 → 18/07/2026). "
-         "(Base: 227.877-1/14; 114.199-4/2024)", False),
-
-        # Interrupções
-        ("MARCOS INTERRUPTIVOS", True),
-        ("• Novo regime: comunicação/notificação/citação; ato inequívoco de apuração; decisão recorrível; "
-         "tentativa conciliatória; chamamento qualificado. Interrompem e reiniciam 5 anos.", False),
-        ("• Transição: marcos válidos a partir de 18/07/2024 interrompem e reiniciam 2 anos (não convertem em 5). "
-         "(Base: 227.877-1/14)", False),
-        ("• Chamamento qualificado (efeito subjetivo): interrompe apenas para o gestor chamado e pode retroagir "
-         "à decisão que o determinou. (Base: 227.877-1/14)", False),
-        ("• Simples protocolo/movimento interno sem lastro apuratório: não interrompe. (Base: 227.877-1/14)", False),
-
-        # Termos e intercorrente
-        ("TERMOS E INTERCORRENTE", True),
-        ("• Regime anterior (pré-lei): termo inicial na ciência pelo TCE (em regra, a autuação). (Base: 114.199-4/2024)", False),
-        ("• Intercorrente (novo §1º): 3 anos de paralisação sem despacho/julgamento útil. (Base: 227.877-1/14)", False),
-
-        # Observação final
-        ("OBSERVAÇÃO IMPORTANTE", True),
-        ("As regras acima refletem a consolidação atual. Podem ser ajustadas por novos votos/acórdãos. "
-         "O aplicativo permite ajustar premissas (datas, marcos e enquadramento) e recomenda registrar a motivação "
-         "no parecer de cada caso concreto.", False),
-    ]
-
-    # Usa as utilidades já existentes (_xml_escape / _build_document_xml)
-    sections = [("REGRAS E FUNDAMENTOS BÁSICOS — Calculadora de Prescrição", True),
-                (intro, False)]
-    sections.extend(bullets)
-
-    document_xml = _build_document_xml([(t, is_h) for (t, is_h) in sections])
-
-    # Pacote DOCX mínimo (sem dependências)
-    content_types_xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
-        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
-        '<Default Extension="xml" ContentType="application/xml"/>'
-        '<Override PartName="/word/document.xml" '
-        'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
-        '</Types>'
-    )
-    rels_xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
-        '<Relationship Id="rId1" '
-        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
-        'Target="word/document.xml"/>'
-        '</Relationships>'
-    )
-    word_rels_xml = (
-        '<?xml version="1.0" encoding="UTF-8"?>'
-        '<Relationships xmlns="http://schemas.microsoft.com/office/2006/relationships"/>'
-    )
-
-    from io import BytesIO
-    import zipfile
-    buf = BytesIO()
-    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
-        z.writestr('[Content_Types].xml', content_types_xml)
-        z.writestr('_rels/.rels', rels_xml)
-        z.writestr('word/document.xml', document_xml)
-        z.writestr('word/_rels/document.xml.rels', word_rels_xml)
-    return buf.getvalue()
-
 with st.expander("📗 Regras e fundamentos básicos — ver/baixar", expanded=False):
     st.markdown(
         "Este guia resume a chave intertemporal e os fundamentos aplicados pela calculadora. "
         "As regras podem ser ajustadas por novos votos; registre sempre a motivação no parecer."
     )
-    regras_bytes = build_regras_fundamentos_docx_bytes()
     st.download_button(
         "⬇️ Baixar Regras e Fundamentos Básicos (DOCX)",
-        data=regras_bytes,
+        data=build_regras_fundamentos_docx_bytes,
         file_name="Regras_e_Fundamentos_Basicos.docx",
         mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         use_container_width=True
@@ -296,6 +92,7 @@ with st.expander("📗 Regras e fundamentos básicos — ver/baixar", expanded=F
 # --------------------------------------------------------------------------------------
 # 1) Natureza e dados básicos
 # --------------------------------------------------------------------------------------
+_tm.secao("1) Natureza e dados básicos")
 colA, colB = st.columns([1.2, 1])
 with colA:
     natureza = st.selectbox(
@@ -318,7 +115,7 @@ if natureza == "Punitiva":
         "Data do ato (ou da cessação, se continuada)",
         value=date.today(),
         help=("No novo regime (art. 5º-A), o termo é o fato/cessação. "
-              "Também aciona a chave intertemporal: < 18/07/2021 (passivo antigo); ≥ 18/07/2021 (novo regime)."),
+              f"Também aciona a chave intertemporal: < {_fatos} (passivo antigo); ≥ {_fatos} (novo regime)."),
         min_value=MIN_DATA,
         max_value=MAX_DATA,
     )
@@ -343,7 +140,7 @@ else:
 colD, colE, colF = st.columns(3)
 with colD:
     transitou_pre_lc = st.selectbox(
-        "Decisão adm. transitada em julgado antes de 18/07/2024?",
+        f"Decisão adm. transitada em julgado antes de {_lei}?",
         ["Não", "Sim"],
         help="Se 'Sim', a LCE 220/2024 não alcança (ato findo).",
     )
@@ -361,6 +158,7 @@ with colF:
 # --------------------------------------------------------------------------------------
 # Autuação & Ciência com sincronismo (sem campo opcional)
 # --------------------------------------------------------------------------------------
+_tm.secao("Autuação & Ciência")
 # defaults
 if "sync_ciencia" not in st.session_state:
     st.session_state["sync_ciencia"] = True
@@ -407,34 +205,24 @@ st.date_input(
 data_autuacao = st.session_state["data_autuacao"]
 data_ciencia  = st.session_state["data_ciencia"]
 
+# Data "as-of": a situação de todos os gestores (e a intercorrente em aberto) é avaliada nesta data
+data_referencia = st.date_input(
+    "Data de referência da avaliação",
+    value=date.today(),
+    key="data_referencia",
+    help="Padrão: hoje. Use uma data futura para ver a situação projetada (p.ex. 18/07/2026).",
+    min_value=MIN_DATA,
+    max_value=MAX_DATA,
+)
+
 # --------------------------------------------------------------------------------------
-# 2) Funções auxiliares — teste pré-lei e deadline
+# 2) Funções auxiliares — teste pré-lei e deadline: ver prescricao_motor
 # --------------------------------------------------------------------------------------
-def _prelaw_consumou_ate_cutoff(ciencia: _date_for_prevcheck, marcos: list[_date_for_prevcheck]) -> bool:
-    """Verifica se o quinquênio do regime anterior (ciência) consumou até 18/07/2024,
-    considerando apenas marcos entre ciência e cutoff."""
-    cutoff = _date_for_prevcheck(2024, 7, 18)
-    if not isinstance(ciencia, _date_for_prevcheck):
-        return False
-    ints_prev = sorted([d for d in marcos if isinstance(d, _date_for_prevcheck) and ciencia <= d <= cutoff])
-    start = ciencia
-    for d in ints_prev:
-        if d >= start:
-            start = d
-    return start + relativedelta(years=5) <= cutoff
-
-def compute_deadline(data_inicio: date, interrupcoes: list[date], base_anos: int) -> tuple[date, bool]:
-    """Retorna (data_final, houve_interrupcao_valida). Ignora marcos anteriores ao termo inicial."""
-    ints = sorted([d for d in interrupcoes if d and d >= data_inicio])
-    start = data_inicio
-    for d in ints:
-        if d >= start:
-            start = d  # reinicia a contagem a partir do marco
-    return start + relativedelta(years=base_anos), (len(ints) > 0)
 
 # --------------------------------------------------------------------------------------
 # 3) Marcos interruptivos — gerais x subjetivos
 # --------------------------------------------------------------------------------------
+_tm.secao("3) Marcos interruptivos")
 st.subheader("Marcos interruptivos")
 st.caption(
     "Marcos gerais (objetivos, valem para todos): p.ex., determinação formal de auditoria/instauração de TCE/TOF, decisão condenatória recorrível, tentativa de conciliação. "
@@ -442,269 +230,175 @@ st.caption(
     "Marcos subjetivos (por gestor): chamamento qualificado (efeito subjetivo; retroação à decisão que o determinou)."
 )
 
-# Marcos gerais
-st.markdown("#### Marcos gerais (valem para todos)")
-def _init_global_state():
-    if "g_marco_count" not in st.session_state:
-        st.session_state["g_marco_count"] = 1
-    if "g_marco_dates" not in st.session_state:
-        st.session_state["g_marco_dates"] = [None]
-_init_global_state()
-
-no_global_inter = st.checkbox("Não houve marco geral", value=False)
-def _g_add():
-    st.session_state["g_marco_count"] += 1
-    st.session_state["g_marco_dates"].append(None)
-def _g_rem():
-    if st.session_state["g_marco_count"] > 1:
-        st.session_state["g_marco_count"] -= 1
-        st.session_state["g_marco_dates"] = st.session_state["g_marco_dates"][: st.session_state["g_marco_count"]]
-def _g_clr():
-    st.session_state["g_marco_count"] = 1
-    st.session_state["g_marco_dates"] = [None]
-
-global_marcos = []
-if not no_global_inter:
-    for i in range(st.session_state["g_marco_count"]):
-        default_val = st.session_state["g_marco_dates"][i] or date.today()
-        picked = st.date_input(f"Data do marco geral #{i+1}", value=default_val, key=f"g_marco_{i}", min_value=MIN_DATA, max_value=MAX_DATA)
-        st.session_state["g_marco_dates"][i] = picked
-    colA1, colA2, colA3 = st.columns(3)
-    colA1.button("➕ Adicionar marco geral", use_container_width=True, on_click=_g_add)
-    colA2.button("➖ Remover último", disabled=st.session_state["g_marco_count"] <= 1, use_container_width=True, on_click=_g_rem)
-    colA3.button("🗑️ Limpar todos", use_container_width=True, on_click=_g_clr)
-    global_marcos = [d for d in st.session_state["g_marco_dates"] if isinstance(d, date)]
-else:
-    global_marcos = []
-
-st.markdown("---")
-
 # Lista de gestores
 st.markdown("#### Gestores (um por linha)")
 gestores_text = st.text_area(
     "Nomes dos gestores",
     value="Gestor A\nGestor B",
     height=90,
-    help="Indique um gestor por linha. Para cada gestor, informe os chamamentos qualificados (efeito subjetivo).",
+    help="Indique um gestor por linha. Os chamamentos qualificados de cada gestor vão na tabela de marcos abaixo.",
 )
 gestores = [g.strip() for g in gestores_text.splitlines() if g.strip()]
 
-# Chamamentos qualificados por gestor
-st.markdown("#### Chamamentos qualificados por gestor (efeito subjetivo)")
-if "gestor_marcos" not in st.session_state:
-    st.session_state["gestor_marcos"] = {}  # nome -> [dates]
-for g in gestores:
-    if g not in st.session_state["gestor_marcos"]:
-        st.session_state["gestor_marcos"][g] = []
-
-def _ensure_g_state(g):
-    cnt_key = f"{g}__cnt"
-    if cnt_key not in st.session_state:
-        st.session_state[cnt_key] = 1
-        st.session_state["gestor_marcos"][g] = [None]
-    return cnt_key
+# Tabela única de marcos: uma grade (gestor, tipo, data) em vez de um date_input por data
+st.markdown("#### Marcos gerais e chamamentos qualificados")
+st.caption(
+    "Uma linha por data. Tipo \"Marco geral\" vale para todos (gestor em branco); \"Chamamento\" exige o gestor. "
+    "Aceita colar várias linhas de uma planilha (gestor, tipo, data); datas em DD/MM/AAAA ou AAAA-MM-DD."
+)
+if "marcos_tabela_base" not in st.session_state:
+    st.session_state["marcos_tabela_base"] = pd.DataFrame({"gestor": pd.Series(dtype="str"), "tipo": pd.Series(dtype="str"), "data": pd.Series(dtype="str")})
+
+# Importação do histórico de movimentações: classificação por tabela de regras — ver prescricao_movimentos
+with st.expander("📥 Importar marcos do histórico de movimentações", expanded=False):
+    st.caption("CSV/XLSX com data, tipo (e descrição/gestor, se houver) de cada movimentação. Simples protocolo não "
+               "interrompe; a tabela de regras (padrao, classe) pode ser substituída por um arquivo próprio.")
+    arquivo_hist = st.file_uploader("Histórico", type=["csv", "xlsx"], key="marcos_historico_upload")
+    arquivo_regras = st.file_uploader("Tabela de regras (opcional)", type=["csv", "xlsx"], key="marcos_regras_upload")
+    if arquivo_hist is None:
+        st.session_state.pop("marcos_importados", None)
+    else:
+        _chave_hist = (arquivo_hist.file_id, arquivo_regras.file_id if arquivo_regras else None, tuple(gestores))
+        if st.session_state.get("marcos_importados", (None,))[0] != _chave_hist:
+            try:
+                _regras = carregar_regras(arquivo_regras, nome=arquivo_regras.name) if arquivo_regras else TabelaRegras()
+                _importados = list(importar_marcos(ler_casos(arquivo_hist, nome=arquivo_hist.name), _regras, gestores))
+            except ValueError as exc:
+                st.error(f"Histórico ou regras inválidos: {exc}")
+                _importados = []
+            st.session_state["marcos_importados"] = (_chave_hist, _importados)
+    _importados = st.session_state.get("marcos_importados", (None, []))[1]
+    if _importados:
+        _processos_hist = [m.processo for m in _importados]
+        _importado = (_importados[_processos_hist.index(st.selectbox("Processo", _processos_hist, key="marcos_historico_processo"))]
+                      if len(_importados) > 1 else _importados[0])
+        st.caption("; ".join(f"{classe}: {n}" for classe, n in _importado.contagem.items()))
+        for _msg in _importado.erros[:20]:
+            st.warning(_msg)
+
+        def _adicionar_importados(linhas: list[dict]):
+            atual = st.session_state.get("marcos_tabela_atual", st.session_state["marcos_tabela_base"])
+            st.session_state["marcos_tabela_base"] = (
+                pd.concat([atual, pd.DataFrame(linhas, columns=["gestor", "tipo", "data"])], ignore_index=True)
+                .drop_duplicates(ignore_index=True)
+            )
+            st.session_state.pop("marcos_tabela", None)  # recria o editor sobre a nova base
+
+        st.button("➕ Adicionar à tabela de marcos", on_click=_adicionar_importados,
+                  args=(linhas_tabela_marcos(_importado),), use_container_width=True)
+
+with _tm.span("editor_marcos"):
+    marcos_tabela = st.data_editor(
+        st.session_state["marcos_tabela_base"],
+        key="marcos_tabela",
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            "gestor": st.column_config.TextColumn("Gestor", help="Vazio para marco geral."),
+            # Texto livre: aceita o que vier colado da planilha ("geral", "C", "subjetivo"…); separar_marcos normaliza
+            "tipo": st.column_config.TextColumn("Tipo", help=" / ".join(TIPOS_MARCO) + " (ou geral, objetivo, G, subjetivo, C). "
+                                                             "Vazio = marco geral sem gestor / chamamento com gestor."),
+            "data": st.column_config.TextColumn("Data", help="DD/MM/AAAA ou AAAA-MM-DD."),
+        },
+    )
 
-for g in gestores:
-    with st.expander(f"Chamamentos qualificados — {g}", expanded=False):
-        cnt_key = _ensure_g_state(g)
-        no_subj = st.checkbox(f"{g}: não houve chamamento qualificado", value=False, key=f"{g}__none")
-        def _add_g(g=g):
-            st.session_state[cnt_key] += 1
-            st.session_state["gestor_marcos"][g].append(None)
-        def _rem_g(g=g):
-            if st.session_state[cnt_key] > 1:
-                st.session_state[cnt_key] -= 1
-                st.session_state["gestor_marcos"][g] = st.session_state["gestor_marcos"][g][: st.session_state[cnt_key]]
-        def _clr_g(g=g):
-            st.session_state[cnt_key] = 1
-            st.session_state["gestor_marcos"][g] = [None]
-        if not no_subj:
-            for i in range(st.session_state[cnt_key]):
-                default_val = st.session_state["gestor_marcos"][g][i] or date.today()
-                picked = st.date_input(f"{g} — data do chamamento #{i+1}", value=default_val, key=f"{g}__marco_{i}", min_value=MIN_DATA, max_value=MAX_DATA)
-                st.session_state["gestor_marcos"][g][i] = picked
-            c1, c2, c3 = st.columns(3)
-            c1.button("➕ Adicionar", use_container_width=True, key=f"{g}__add_btn", on_click=_add_g)
-            c2.button("➖ Remover última", disabled=st.session_state[cnt_key] <= 1, use_container_width=True, key=f"{g}__rem_btn", on_click=_rem_g)
-            c3.button("🗑️ Limpar todas", use_container_width=True, key=f"{g}__clr_btn", on_click=_clr_g)
-        else:
-            st.session_state[cnt_key] = 1
-            st.session_state["gestor_marcos"][g] = []
+st.session_state["marcos_tabela_atual"] = marcos_tabela
+global_marcos, st.session_state["gestor_marcos"], _erros_marcos = separar_marcos(marcos_tabela.to_dict("records"), gestores)
+for _msg in _erros_marcos:
+    st.warning(_msg)
+_desconhecidos = [g for g in st.session_state["gestor_marcos"] if g not in gestores]
+if _desconhecidos:
+    st.warning("Chamamentos de gestor fora da lista (ignorados): " + ", ".join(_desconhecidos))
+st.caption(f"{len(global_marcos)} marco(s) geral(is); {sum(len(st.session_state['gestor_marcos'][g]) for g in gestores)} chamamento(s) dos gestores listados.")
 
 # --------------------------------------------------------------------------------------
 # 4) Enquadramento intertemporal (global — SUGESTÃO CORRIGIDA)
 # --------------------------------------------------------------------------------------
-fatos_pre_2021 = (termo_inicial_fato < date(2021, 7, 18))
-
-if transitou_pre_lc == "Sim":
-    sugerido = "Fora do alcance: decisão anterior a 18/07/2024"
-elif not fatos_pre_2021:
-    # Fatos ≥ 18/07/2021 → novo regime (5 anos do fato/cessação), independentemente da data de ciência/autuação
-    sugerido = "Novo regime (art. 5º-A)"
-else:
-    # Fatos < 18/07/2021 → TESTE PRÉ-LEI: consumou até 18/07/2024 pelo quinquênio da ciência?
-    if _prelaw_consumou_ate_cutoff(data_ciencia, global_marcos):
-        sugerido = "Prescrição consumada antes da lei"
-    else:
-        # NÃO consumou → Transição bienal (18/07/2024 → 18/07/2026), mesmo que a ciência seja posterior.
-        sugerido = "Transição 2 anos (LC 220/24)"
+_tm.secao("4) Enquadramento")
+# Chave intertemporal: ver prescricao_motor.sugerir_enquadramento (datas/prazos: prescricao_regras)
+sugerido = sugerir_enquadramento(transitou_pre_lc, termo_inicial_fato, data_ciencia, global_marcos, regras_vigentes)
 
+# Valor = identificador estável (ENQUADRAMENTOS); texto exibido = rótulo do conjunto de regras em uso
 enquadramento = st.selectbox(
     "Selecione o enquadramento (global; ajuste se necessário)",
-    [
-        "Novo regime (art. 5º-A)",
-        "Transição 2 anos (LC 220/24)",
-        "Prescrição consumada antes da lei",
-        "Fora do alcance: decisão anterior a 18/07/2024",
-    ],
-    index=[
-        "Novo regime (art. 5º-A)",
-        "Transição 2 anos (LC 220/24)",
-        "Prescrição consumada antes da lei",
-        "Fora do alcance: decisão anterior a 18/07/2024",
-    ].index(sugerido),
+    ENQUADRAMENTOS,
+    index=ENQUADRAMENTOS.index(sugerido),
+    format_func=regras_vigentes.rotular,
     help=("Chave intertemporal\n"
-          "• Fatos < 18/07/2021 → Teste pré-lei: quinquênio da ciência até 18/07/2024; se não consumou, Transição (18/07/2024 → 18/07/2026).\n"
-          "• Fatos ≥ 18/07/2021 → Novo regime (5 anos do fato/cessação).\n"
-          "• Fora do alcance → decisão adm. transitada até 18/07/2024."),
+          f"• Fatos < {_fatos} → Teste pré-lei: {_cr.anos_regime_anterior} anos da ciência até {_lei}; se não consumou, "
+          f"Transição ({_lei} → {_lei[:6]}{_cr.marco_lei.year + _cr.anos_transicao}).\n"
+          f"• Fatos ≥ {_fatos} → Novo regime ({_cr.anos_novo_regime} anos do fato/cessação).\n"
+          f"• Fora do alcance → decisão adm. transitada até {_lei}."),
 )
+st.caption(f"Conjunto de regras {regras_vigentes.versao}"
+           + (f" — paradigmas {', '.join(regras_vigentes.conjunto.paradigmas)}" if regras_vigentes.conjunto.paradigmas else "")
+           + ".")
 
 # --------------------------------------------------------------------------------------
 # 5) Prescrição intercorrente (§ 1º)
 # --------------------------------------------------------------------------------------
+_tm.secao("5) Intercorrente")
 st.subheader("Prescrição intercorrente (§ 1º)")
-st.caption("Paralisação > 3 anos sem julgamento/despacho? Caso positivo, informe as datas.")
+st.caption(f"Paralisação > {_paralisacao} sem julgamento/despacho? Caso positivo, informe as datas.")
 check_intercorrente = st.checkbox("Checar intercorrente?", value=False)
 
 data_ultimo_ato = None
 idata_subseq = None
 if check_intercorrente:
+    # Histórico de movimentações: varredura de todas as paralisações — ver prescricao_movimentos
+    sugestao_ultimo_ato, sugestao_subseq = date.today(), None
+    with st.expander("📜 Histórico de movimentações (varredura completa)", expanded=False):
+        st.caption(f"CSV/XLSX com a data (e o tipo) de cada movimentação. Todas as paralisações de {_paralisacao} ou mais são "
+                   "listadas; a primeira preenche as datas abaixo.")
+        arquivo_mov = st.file_uploader("Histórico", type=["csv", "xlsx"], key="movimentos_upload")
+        if arquivo_mov is None:
+            st.session_state.pop("movimentos_varredura", None)
+        elif st.session_state.get("movimentos_varredura", (None,))[0] != (arquivo_mov.file_id, data_referencia):
+            try:
+                _varreduras = list(varrer_movimentos(ler_casos(arquivo_mov, nome=arquivo_mov.name), data_referencia,
+                                                     dias_minimos=_cr.dias_intercorrente))
+            except ValueError as exc:
+                st.error(f"Histórico inválido: {exc}")
+                _varreduras = []
+            st.session_state["movimentos_varredura"] = ((arquivo_mov.file_id, data_referencia), _varreduras)
+        _varreduras = st.session_state.get("movimentos_varredura", (None, []))[1]
+        if _varreduras:
+            _processos_mov = [v.processo for v in _varreduras]
+            _varredura = _varreduras[_processos_mov.index(st.selectbox("Processo", _processos_mov))] if len(_varreduras) > 1 else _varreduras[0]
+            st.caption(f"{_varredura.movimentos} movimentação(ões); {len(_varredura.paralisacoes)} paralisação(ões) de {_paralisacao} ou mais.")
+            if _varredura.paralisacoes:
+                st.dataframe(pd.DataFrame([
+                    {"último ato": p.inicio, "ato subsequente": None if p.aberta else p.fim, "dias": p.dias}
+                    for p in _varredura.paralisacoes
+                ]), hide_index=True, use_container_width=True)
+            for _msg in _varredura.erros:
+                st.warning(_msg)
+            if _varredura.primeira:
+                sugestao_ultimo_ato = _varredura.primeira.inicio
+                sugestao_subseq = None if _varredura.primeira.aberta else _varredura.primeira.fim
+            elif _varredura.ultimo_ato:
+                sugestao_ultimo_ato = _varredura.ultimo_ato
+
     c1, c2 = st.columns(2)
     with c1:
-        data_ultimo_ato = st.date_input("Data do último ato útil", value=date.today(), min_value=MIN_DATA, max_value=MAX_DATA)
+        data_ultimo_ato = st.date_input("Data do último ato útil", value=sugestao_ultimo_ato, min_value=MIN_DATA, max_value=MAX_DATA)
     with c2:
-        use_hoje = st.checkbox("Usar a data de hoje como termo final", value=True)
+        use_hoje = st.checkbox("Usar a data de referência como termo final", value=sugestao_subseq is None,
+                               help="Ato subsequente ainda não praticado: a paralisação conta até a data de referência.")
         if use_hoje:
-            idata_subseq = date.today()
+            idata_subseq = data_referencia
         else:
-            idata_subseq = st.date_input("Data do ato subsequente", value=date.today(), min_value=MIN_DATA, max_value=MAX_DATA)
+            idata_subseq = st.date_input("Data do ato subsequente", value=sugestao_subseq or date.today(), min_value=MIN_DATA, max_value=MAX_DATA)
 
 # --------------------------------------------------------------------------------------
-# 6) Motor de cálculo por gestor
+# 6) Motor de cálculo por gestor — ver prescricao_motor.calcular_por_gestor
 # --------------------------------------------------------------------------------------
-def calcular_por_gestor(nome_gestor: str,
-                        enquadramento: str,
-                        termo_inicial_fato: date,
-                        data_ciencia: date,
-                        global_marcos: list[date],
-                        subj_marcos: list[date],
-                        aplicar_prazo_penal: str,
-                        prazo_penal_anos: int | None,
-                        check_intercorrente: bool,
-                        data_ultimo_ato: date | None,
-                        idata_subseq: date | None) -> dict:
-    resultado = {}
-    # Interrupções dependem do regime
-    if enquadramento == "Transição 2 anos (LC 220/24)":
-        interrupcoes = sorted([d for d in (global_marcos + subj_marcos) if isinstance(d, date) and d >= date(2024, 7, 18)])
-    elif enquadramento == "Novo regime (art. 5º-A)":
-        interrupcoes = sorted([d for d in (global_marcos + subj_marcos) if isinstance(d, date) and d >= termo_inicial_fato])
-    else:
-        interrupcoes = sorted([d for d in (global_marcos + subj_marcos) if isinstance(d, date)])
-
-    # Prescrição antes da lei — bloco exclusivo
-    if enquadramento == "Prescrição consumada antes da lei":
-        cutoff = date(2024, 7, 18)
-        ciencia = data_ciencia if isinstance(data_ciencia, date) else None
-        ints_prev = [d for d in (global_marcos + subj_marcos) if isinstance(d, date) and d <= cutoff and (ciencia is None or d >= ciencia)]
-
-        def _prelaw_date(ciencia, ints):
-            if not ciencia:
-                return None
-            ints_prev_sorted = sorted(ints)
-            start = ciencia
-            for d in ints_prev_sorted:
-                if d >= start:
-                    start = d
-            return start + relativedelta(years=5)
-
-        data_prelaw = _prelaw_date(ciencia, ints_prev)
-        resultado["sit"] = "Prescrição reconhecida (regime anterior)"
-        resultado["detalhe"] = (f"Consumação em {data_prelaw.strftime('%d/%m/%Y')} (antes de 18/07/2024)."
-                                if isinstance(data_prelaw, date) else
-                                "Consumação integral antes de 18/07/2024 (regime anterior).")
-        resultado["natureza"] = natureza
-        resultado["conduta"] = conduta
-        resultado["termo_inicial"] = ciencia
-        resultado["termo_inicial_label"] = "Ciência (TCE-RJ) — regime anterior"
-        resultado["base"] = "quinquenal (regime anterior)"
-        resultado["prazo_final"] = data_prelaw
-        resultado["interrupcoes"] = sorted(ints_prev)
-        return resultado
-
-    # Base de prazo
-    if aplicar_prazo_penal == "Sim" and prazo_penal_anos:
-        base_anos = prazo_penal_anos
-        base_label = f"prazo penal ({prazo_penal_anos} anos)"
-    else:
-        if enquadramento == "Novo regime (art. 5º-A)":
-            base_anos = 5
-            base_label = "quinquenal"
-        elif enquadramento == "Transição 2 anos (LC 220/24)":
-            base_anos = 2
-            base_label = "bienal (transição)"
-        else:
-            base_anos = 5
-            base_label = "quinquenal"
-
-    # Termo inicial do cálculo por regime
-    if enquadramento == "Novo regime (art. 5º-A)":
-        termo_inicial_efetivo = termo_inicial_fato
-        termo_inicial_label = "Termo inicial (fato/cessação)"
-    elif enquadramento == "Transição 2 anos (LC 220/24)":
-        termo_inicial_efetivo = date(2024, 7, 18)
-        termo_inicial_label = "Transição (18/07/2024)"
-    else:
-        termo_inicial_efetivo = data_ciencia
-        termo_inicial_label = "Ciência (TCE-RJ)"
-
-    prazo_final, has_valid_interruptions = compute_deadline(termo_inicial_efetivo, interrupcoes, base_anos)
-
-    # Intercorrente
-    intercorrente = False
-    periodo_intercorrente = None
-    if check_intercorrente and data_ultimo_ato and idata_subseq:
-        dias = (idata_subseq - data_ultimo_ato).days
-        if dias >= 365 * 3:
-            intercorrente = True
-            periodo_intercorrente = dias
-
-    hoje = date.today()
-    interrupcoes_consideradas = sorted([d for d in interrupcoes if d and d >= termo_inicial_efetivo])
-
-    if intercorrente:
-        resultado["sit"] = "Prescrição intercorrente"
-        resultado["detalhe"] = f"Paralisação superior a 3 anos ({periodo_intercorrente} dias)."
-    else:
-        if hoje >= prazo_final:
-            resultado["sit"] = "Prescrição consumada"
-            resultado["detalhe"] = f"Esgotado o prazo {base_label}: {prazo_final.strftime('%d/%m/%Y')}."
-        else:
-            resultado["sit"] = "Não prescrito"
-            resultado["detalhe"] = f"Data-alvo projetada ({base_label}): {prazo_final.strftime('%d/%m/%Y')}."
-
-    resultado["natureza"] = natureza
-    resultado["conduta"] = conduta
-    resultado["termo_inicial"] = termo_inicial_efetivo
-    resultado["termo_inicial_label"] = termo_inicial_label
-    resultado["prazo_final"] = prazo_final
-    resultado["base"] = base_label
-    resultado["interrupcoes"] = interrupcoes_consideradas
-    return resultado
 
 # --------------------------------------------------------------------------------------
 # 7) Resultados por gestor
 # --------------------------------------------------------------------------------------
+_tm.secao("7) Resultados por gestor")
 st.markdown("### Resultados por gestor")
 
 def _color_for_status(s: str) -> str:
@@ -716,90 +410,10 @@ def _color_for_status(s: str) -> str:
     else:
         return '#1A73E8'
 
-export_rows = []
 rows_marcos_gerais = [{"marco_geral_data": d.strftime("%Y-%m-%d")} for d in global_marcos]
-
-rows_marcos_subj = []
 ciencia_info_hum = data_ciencia.strftime('%d/%m/%Y') if isinstance(data_ciencia, date) else '—'
 fato_info_hum = termo_inicial_fato.strftime('%d/%m/%Y') if isinstance(termo_inicial_fato, date) else '—'
 
-por_gestor_details = {}
-
-for g in gestores:
-    subj_list = [d for d in st.session_state["gestor_marcos"].get(g, []) if isinstance(d, date)]
-    for d in subj_list:
-        rows_marcos_subj.append({"gestor": g, "chamamento_data": d.strftime("%Y-%m-%d")})
-
-    res = calcular_por_gestor(
-        nome_gestor=g,
-        enquadramento=enquadramento,
-        termo_inicial_fato=termo_inicial_fato,
-        data_ciencia=data_ciencia,
-        global_marcos=global_marcos,
-        subj_marcos=subj_list,
-        aplicar_prazo_penal=aplicar_prazo_penal,
-        prazo_penal_anos=prazo_penal_anos,
-        check_intercorrente=check_intercorrente,
-        data_ultimo_ato=data_ultimo_ato,
-        idata_subseq=idata_subseq
-    )
-
-    _sit = res.get('sit', '—')
-    _status_color = _color_for_status(_sit)
-    _termo = res.get('termo_inicial')
-    _prazo = res.get('prazo_final')
-    _ints = res.get('interrupcoes', [])
-    _ints_str = ", ".join([d.strftime('%d/%m/%Y') for d in _ints]) if _ints else '—'
-
-    _html = f"""
-    <div style='border:1px solid {_status_color}; padding:16px; border-radius:12px; margin-bottom:8px;'>
-      <div style='font-weight:700; font-size:1.05rem; color:{_status_color};'>[{g}] Situação: {res.get('sit','—')}</div>
-      <div style='margin-top:6px;'>{res.get('detalhe','—')}</div>
-      <hr style='border:none; border-top:1px dashed #ddd; margin:12px 0;'>
-      <div style='display:grid; grid-template-columns: 1fr 1fr; gap:8px;'>
-        <div><b>Enquadramento:</b> {enquadramento}</div>
-        <div><b>Base:</b> {res.get('base','—')}</div>
-        <div><b>Natureza:</b> {res.get('natureza','—')}</div>
-        <div><b>Conduta:</b> {res.get('conduta','—')}</div>
-        <div><b>Termo inicial (cálculo):</b> {(_termo.strftime('%d/%m/%Y') if isinstance(_termo, date) else '—')} ({res.get('termo_inicial_label','')})</div>
-        <div><b>Data-alvo de prescrição:</b> {(_prazo.strftime('%d/%m/%Y') if isinstance(_prazo, date) else '—')}</div>
-        <div><b>Ciência considerada (TCE-RJ):</b> {ciencia_info_hum}</div>
-        <div><b>Data do fato/cessação:</b> {fato_info_hum}</div>
-        <div style='grid-column: 1 / -1;'><b>Interrupções (gerais + {g}):</b> {_ints_str}</div>
-      </div>
-    </div>
-    """
-    st.markdown(_html, unsafe_allow_html=True)
-
-    export_rows.append({
-        "gestor": g,
-        "situacao": res.get('sit','—'),
-        "enquadramento": enquadramento,
-        "base": res.get('base','—'),
-        "termo_inicial": _termo.strftime('%Y-%m-%d') if isinstance(_termo, date) else '',
-        "prazo_final": _prazo.strftime('%Y-%m-%d') if isinstance(_prazo, date) else '',
-        "ciencia": data_ciencia.strftime('%Y-%m-%d') if isinstance(data_ciencia, date) else '',
-        "fato_cessacao": termo_inicial_fato.strftime('%Y-%m-%d') if isinstance(termo_inicial_fato, date) else '',
-        "interrupcoes": "; ".join([d.strftime('%Y-%m-%d') for d in _ints]) if _ints else ''
-    })
-
-    # detalhes por gestor (aba individual no Excel)
-    linhas = [
-        {"campo": "Gestor", "valor": g},
-        {"campo": "Situação", "valor": res.get("sit","—")},
-        {"campo": "Enquadramento (global)", "valor": enquadramento},
-        {"campo": "Base", "valor": res.get("base","—")},
-        {"campo": "Termo inicial (cálculo)", "valor": res.get("termo_inicial").strftime("%Y-%m-%d") if isinstance(res.get("termo_inicial"), date) else ""},
-        {"campo": "Label do termo", "valor": res.get("termo_inicial_label","")},
-        {"campo": "Data-alvo de prescrição", "valor": res.get("prazo_final").strftime("%Y-%m-%d") if isinstance(res.get("prazo_final"), date) else ""},
-        {"campo": "Ciência considerada (TCE-RJ)", "valor": data_ciencia.strftime("%Y-%m-%d") if isinstance(data_ciencia, date) else ""},
-        {"campo": "Fato/Cessação (transparência)", "valor": termo_inicial_fato.strftime("%Y-%m-%d") if isinstance(termo_inicial_fato, date) else ""},
-        {"campo": "Marcos gerais (datas)", "valor": ", ".join(sorted({d.strftime('%Y-%m-%d') for d in global_marcos})) if global_marcos else ""},
-        {"campo": f"Chamamentos qualificados de {g}", "valor": ", ".join(sorted({d.strftime('%Y-%m-%d') for d in [d for d in st.session_state['gestor_marcos'].get(g, []) if isinstance(d, date)]})) if st.session_state['gestor_marcos'].get(g) else ""},
-        {"campo": "Interrupções consideradas (após o termo)", "valor": ", ".join([d.strftime('%Y-%m-%d') for d in res.get('interrupcoes', [])]) if res.get('interrupcoes') else ""},
-    ]
-    por_gestor_details[g] = {"linhas": linhas}
-
 # Parâmetros globais do caso (para aba "Parametros_do_Caso")
 parametros_do_caso = {
     "natureza": natureza,
@@ -815,170 +429,388 @@ parametros_do_caso = {
     "check_intercorrente": "Sim" if check_intercorrente else "Não",
     "intercorrente_ultimo_ato": data_ultimo_ato.strftime("%Y-%m-%d") if isinstance(data_ultimo_ato, date) else "",
     "intercorrente_ato_subseq_ou_hoje": idata_subseq.strftime("%Y-%m-%d") if isinstance(idata_subseq, date) else "",
+    "data_referencia": data_referencia.strftime("%Y-%m-%d"),
+    "versao_regras": regras_vigentes.versao,
 }
 
-# --------------------------------------------------------------------------------------
-# 8) Exportação Excel (somente .xlsx) — com fallback de engine
-# --------------------------------------------------------------------------------------
-def sanitize_sheet_name(name: str) -> str:
-    name = re.sub(r'[:\\/?*\[\]]', '_', name).strip()
-    return name[:31] if len(name) > 31 else name
-
-def make_excel_bytes_expanded(rows_resumo: list[dict],
-                              rows_marcos_gerais: list[dict],
-                              rows_marcos_subj: list[dict],
-                              parametros: dict,
-                              por_gestor_details: dict) -> bytes:
+# Resultado de cada gestor memoizado pela chave das entradas de que depende:
+#   caso (enquadramento, termo, ciência, marcos gerais, penal, intercorrente, natureza/conduta, data de referência)
+#   + chamamentos do próprio gestor.
+# Mudar um chamamento invalida só aquele gestor; mudar uma entrada do caso invalida todos.
+if "resultados_gestor" not in st.session_state:
+    st.session_state["resultados_gestor"] = {}  # nome -> {"chave", "res", "subj", "resumo", "detalhe"}
+resultados_gestor = st.session_state["resultados_gestor"]
+
+_chave_caso = (
+    enquadramento, termo_inicial_fato, data_ciencia, tuple(global_marcos),
+    aplicar_prazo_penal, prazo_penal_anos, check_intercorrente, data_ultimo_ato, idata_subseq,
+    natureza, conduta, data_referencia,
+)
+for g in [g for g in resultados_gestor if g not in gestores]:
+    del resultados_gestor[g]
+
+# Cache em disco (prescricao_cache): resultados do caso inteiro pela impressão digital, entre sessões/reinícios
+_fp_caso = fingerprint_caso(parametros_do_caso, global_marcos, st.session_state["gestor_marcos"], gestores, hoje=data_referencia)
+_cache_disco = cache_padrao()
+_res_disco = None
+_calculados = 0
+
+for g in gestores:
+    subj_list = [d for d in st.session_state["gestor_marcos"].get(g, []) if isinstance(d, date)]
+    chave = (_chave_caso, tuple(subj_list))
+    item = resultados_gestor.get(g)
+    if item is not None and item["chave"] == chave:
+        continue
+    if _res_disco is None and _cache_disco:
+        with _tm.span("cache_disco"):
+            _res_disco = _cache_disco.obter_json(_fp_caso, "resultados.json") or {}
+    if _res_disco and g in _res_disco:
+        resultados_gestor[g] = {"chave": chave, "res": ResultadoGestor(**_res_disco[g]), "subj": subj_list, "resumo": None, "detalhe": None}
+        continue
+    _calculados += 1
+    with _tm.span("calcular_por_gestor"):
+        res = calcular_por_gestor(
+            nome_gestor=g,
+            enquadramento=enquadramento,
+            termo_inicial_fato=termo_inicial_fato,
+            data_ciencia=data_ciencia,
+            global_marcos=global_marcos,
+            subj_marcos=subj_list,
+            aplicar_prazo_penal=aplicar_prazo_penal,
+            prazo_penal_anos=prazo_penal_anos,
+            check_intercorrente=check_intercorrente,
+            data_ultimo_ato=data_ultimo_ato,
+            idata_subseq=idata_subseq,
+            natureza=natureza,
+            conduta=conduta,
+            data_referencia=data_referencia,
+        )
+    # Linhas de exportação (resumo/detalhe) são refeitas sob demanda só para os gestores invalidados
+    resultados_gestor[g] = {"chave": chave, "res": res, "subj": subj_list, "resumo": None, "detalhe": None}
+
+if _calculados and _cache_disco:
+    _cache_disco.gravar_json(_fp_caso, "resultados.json", {g: asdict(resultados_gestor[g]["res"]) for g in gestores})
+
+def _janela_marco(res):
+    return janela_proximo_marco(res, enquadramento, aplicar_prazo_penal, prazo_penal_anos, data_referencia)
+
+def _cartao_html(g, res) -> str:
+    """Cartão completo de um gestor (exibido só para o gestor selecionado na tabela)."""
+    _status_color = _color_for_status(res.sit)
+    _termo = res.termo_inicial
+    _prazo = res.prazo_final
+    _ints = res.interrupcoes
+    _ints_str = ", ".join([d.strftime('%d/%m/%Y') for d in _ints]) if _ints else '—'
+    return f"""
+    <div style='border:1px solid {_status_color}; padding:16px; border-radius:12px; margin-bottom:8px;'>
+      <div style='font-weight:700; font-size:1.05rem; color:{_status_color};'>[{g}] Situação: {res.sit}</div>
+      <div style='margin-top:6px;'>{res.detalhe}</div>
+      <hr style='border:none; border-top:1px dashed #ddd; margin:12px 0;'>
+      <div style='display:grid; grid-template-columns: 1fr 1fr; gap:8px;'>
+        <div><b>Enquadramento:</b> {regras_vigentes.rotular(enquadramento)}</div>
+        <div><b>Base:</b> {res.base}</div>
+        <div><b>Natureza:</b> {res.natureza or '—'}</div>
+        <div><b>Conduta:</b> {res.conduta or '—'}</div>
+        <div><b>Termo inicial (cálculo):</b> {(_termo.strftime('%d/%m/%Y') if isinstance(_termo, date) else '—')} ({res.termo_inicial_label})</div>
+        <div><b>Data-alvo de prescrição:</b> {(_prazo.strftime('%d/%m/%Y') if isinstance(_prazo, date) else '—')}</div>
+        <div><b>Ciência considerada (TCE-RJ):</b> {ciencia_info_hum}</div>
+        <div><b>Data do fato/cessação:</b> {fato_info_hum}</div>
+        <div style='grid-column: 1 / -1;'><b>Interrupções (gerais + {g}):</b> {_ints_str}</div>
+        <div style='grid-column: 1 / -1;'><b>Próximo marco:</b> {_janela_marco(res).motivo}</div>
+      </div>
+    </div>
     """
-    Gera .xlsx com fallback automático:
-    - Se 'xlsxwriter' estiver disponível → usa formatações/condicional.
-    - Caso contrário → usa 'openpyxl' (sem formatações avançadas).
+
+@st.fragment
+def _painel_resultados():
+    """Tabela de resultados (virtualizada: o navegador desenha só as linhas visíveis) + cartão do gestor selecionado.
+
+    Filtro e seleção reexecutam apenas este fragmento; nesses reruns o registro da página
+    já foi fechado, então o fragmento abre e fecha o seu próprio.
     """
-    engine = "openpyxl"
+    if not gestores:
+        return
+    tm = iniciar_rerun(painel=_painel_tm) if _tm.finalizado else _tm
     try:
-        import xlsxwriter  # noqa: F401
-        engine = "xlsxwriter"
-    except Exception:
-        engine = "openpyxl"
-
-    buf = BytesIO()
-    with pd.ExcelWriter(buf, engine=engine, datetime_format="yyyy-mm-dd", date_format="yyyy-mm-dd") as writer:
-        # Resumo
-        df_resumo = pd.DataFrame(rows_resumo) if rows_resumo else pd.DataFrame(columns=[
-            "gestor","situacao","enquadramento","base","termo_inicial","prazo_final","ciencia","fato_cessacao","interrupcoes"
-        ])
-        df_resumo.to_excel(writer, sheet_name="Resumo", index=False)
-        ws_resumo = writer.sheets["Resumo"]
-
-        if engine == "xlsxwriter":
-            wb = writer.book
-            widths = [26, 20, 28, 22, 15, 15, 15, 15, 40]
-            for i, w in enumerate(widths):
-                ws_resumo.set_column(i, i, w)
-            ws_resumo.freeze_panes(1, 0)
-
-            red_fmt = wb.add_format({"font_color": "#D93025"})
-            green_fmt = wb.add_format({"font_color": "#1E8E3E"})
-            blue_fmt = wb.add_format({"font_color": "#1A73E8"})
-            last_row = len(df_resumo) + 1
-            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "text", "criteria": "containing", "value": "Prescrição consumada", "format": red_fmt})
-            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "text", "criteria": "containing", "value": "intercorrente", "format": red_fmt})
-            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "text", "criteria": "containing", "value": "Não prescrito", "format": green_fmt})
-            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "no_blanks", "format": blue_fmt})
-        else:
-            from openpyxl.utils import get_column_letter
-            widths = [26, 20, 28, 22, 15, 15, 15, 15, 40]
-            for idx, w in enumerate(widths, start=1):
-                ws_resumo.column_dimensions[get_column_letter(idx)].width = w
-            ws_resumo.freeze_panes = "A2"
-
-        # Marcos_Gerais
-        df_g = pd.DataFrame(rows_marcos_gerais) if rows_marcos_gerais else pd.DataFrame(columns=["marco_geral_data"])
-        df_g.to_excel(writer, sheet_name="Marcos_Gerais", index=False)
-        ws_g = writer.sheets["Marcos_Gerais"]
-        if engine == "xlsxwriter":
-            ws_g.set_column("A:A", 18)
-            ws_g.freeze_panes(1, 0)
-        else:
-            from openpyxl.utils import get_column_letter
-            ws_g.column_dimensions[get_column_letter(1)].width = 18
-            ws_g.freeze_panes = "A2"
-
-        # Marcos_Subjetivos
-        df_s = pd.DataFrame(rows_marcos_subj) if rows_marcos_subj else pd.DataFrame(columns=["gestor","chamamento_data"])
-        df_s.to_excel(writer, sheet_name="Marcos_Subjetivos", index=False)
-        ws_s = writer.sheets["Marcos_Subjetivos"]
-        if engine == "xlsxwriter":
-            ws_s.set_column("A:A", 26)
-            ws_s.set_column("B:B", 18)
-            ws_s.freeze_panes(1, 0)
-        else:
-            from openpyxl.utils import get_column_letter
-            ws_s.column_dimensions[get_column_letter(1)].width = 26
-            ws_s.column_dimensions[get_column_letter(2)].width = 18
-            ws_s.freeze_panes = "A2"
-
-        # Parametros_do_Caso
-        p_rows = [(k, v) for k, v in parametros.items()]
-        df_p = pd.DataFrame(p_rows, columns=["parametro", "valor"])
-        df_p.to_excel(writer, sheet_name="Parametros_do_Caso", index=False)
-        ws_p = writer.sheets["Parametros_do_Caso"]
-        if engine == "xlsxwriter":
-            ws_p.set_column("A:A", 36)
-            ws_p.set_column("B:B", 60)
-            ws_p.freeze_panes(1, 0)
-        else:
-            from openpyxl.utils import get_column_letter
-            ws_p.column_dimensions[get_column_letter(1)].width = 36
-            ws_p.column_dimensions[get_column_letter(2)].width = 60
-            ws_p.freeze_panes = "A2"
-
-        # Dicionario
-        dic_data = [
-            ("gestor", "Nome do gestor (uma linha por gestor)."),
-            ("situacao", "Não prescrito / Prescrição consumada / Prescrição intercorrente / Prescrição reconhecida (regime anterior)."),
-            ("enquadramento", "Novo regime / Transição 2 anos / Prescrição antes da lei / Fora do alcance."),
-            ("base", "quinquenal / penal (X anos) / bienal (transição)."),
-            ("termo_inicial", "Data usada no cálculo, conforme enquadramento."),
-            ("prazo_final", "Data-alvo projetada, após interrupções consideradas."),
-            ("ciencia", "Data de ciência considerada (TCE-RJ)."),
-            ("fato_cessacao", "Data do fato/cessação (transparência)."),
-            ("interrupcoes", "Interrupções consideradas (marcos gerais + chamamentos do gestor)."),
-            ("marco_geral_data", "Ato inequívoco de apuração / decisão recorrível / tentativa conciliatória (valem para todos)."),
-            ("chamamento_data", "Chamamento qualificado (efeito subjetivo, por gestor)."),
-            ("parametro/valor", "Parâmetros do caso — contexto global da execução."),
-        ]
-        df_dic = pd.DataFrame(dic_data, columns=["coluna", "descrição"])
-        df_dic.to_excel(writer, sheet_name="Dicionario", index=False)
-        ws_d = writer.sheets["Dicionario"]
-        if engine == "xlsxwriter":
-            ws_d.set_column("A:A", 30)
-            ws_d.set_column("B:B", 90)
-            ws_d.freeze_panes(1, 0)
-        else:
-            from openpyxl.utils import get_column_letter
-            ws_d.column_dimensions[get_column_letter(1)].width = 30
-            ws_d.column_dimensions[get_column_letter(2)].width = 90
-            ws_d.freeze_panes = "A2"
-
-        # Abas individuais por gestor
-        for g, detail in por_gestor_details.items():
-            sheet = sanitize_sheet_name(f"G - {g}")
-            df_det = pd.DataFrame(detail["linhas"])
-            if df_det.empty:
-                df_det = pd.DataFrame(columns=["campo", "valor"])
-            df_det.to_excel(writer, sheet_name=sheet, index=False)
-            ws_x = writer.sheets[sheet]
-            if engine == "xlsxwriter":
-                ws_x.set_column("A:A", 34)
-                ws_x.set_column("B:B", 70)
-                ws_x.freeze_panes(1, 0)
-            else:
-                from openpyxl.utils import get_column_letter
-                ws_x.column_dimensions[get_column_letter(1)].width = 34
-                ws_x.column_dimensions[get_column_letter(2)].width = 70
-                ws_x.freeze_panes = "A2"
-
-    return buf.getvalue()
+        _tabela_e_cartao(tm)
+    finally:
+        if tm is not _tm:
+            tm.finalizar(fragmento="_painel_resultados", gestores=len(gestores))
+
+def _tabela_e_cartao(tm):
+    """Corpo de ``_painel_resultados``; os spans vão para ``tm``."""
+    tabela = pd.DataFrame(
+        {
+            "gestor": g,
+            "situacao": item["res"].sit,
+            "prazo_final": item["res"].prazo_final,
+            "base": item["res"].base,
+            "termo_inicial": item["res"].termo_inicial,
+            "interrupcoes": len(item["res"].interrupcoes),
+            "ultimo_dia_marco": _janela_marco(item["res"]).ultimo_dia,
+        }
+        for g in gestores
+        if (item := resultados_gestor.get(g)) is not None
+    )
+    tabela["prazo_final"] = pd.to_datetime(tabela["prazo_final"])
+    tabela["termo_inicial"] = pd.to_datetime(tabela["termo_inicial"])
+    tabela["ultimo_dia_marco"] = pd.to_datetime(tabela["ultimo_dia_marco"])
+
+    situacoes = sorted(tabela["situacao"].unique())
+    filtro = st.multiselect("Filtrar por situação", situacoes, default=situacoes, key="resultados_filtro_sit")
+    vista = tabela[tabela["situacao"].isin(filtro)].sort_values("prazo_final", kind="stable", na_position="last").reset_index(drop=True)
+    st.caption(f"{len(vista)} de {len(tabela)} gestor(es). Clique numa linha para ver o cartão completo; clique no cabeçalho para reordenar.")
+
+    with tm.span("tabela_resultados"):
+        evento = st.dataframe(
+            vista,
+            key="resultados_tabela",
+            on_select="rerun",
+            selection_mode="single-row",
+            hide_index=True,
+            use_container_width=True,
+            height=min(38 + 35 * max(len(vista), 1), 420),
+            column_config={
+                "gestor": st.column_config.TextColumn("Gestor"),
+                "situacao": st.column_config.TextColumn("Situação"),
+                "prazo_final": st.column_config.DateColumn("Data-alvo de prescrição", format="DD/MM/YYYY"),
+                "base": st.column_config.TextColumn("Base"),
+                "termo_inicial": st.column_config.DateColumn("Termo inicial", format="DD/MM/YYYY"),
+                "interrupcoes": st.column_config.NumberColumn("Interrupções"),
+                "ultimo_dia_marco": st.column_config.DateColumn(
+                    "Último dia p/ novo marco", format="DD/MM/YYYY",
+                    help="Último dia em que um novo marco válido ainda evita a prescrição (vazio: sem janela)."),
+            },
+        )
+
+    linhas_sel = evento.selection.rows if evento is not None else []
+    if linhas_sel and linhas_sel[0] < len(vista):
+        g = vista.at[linhas_sel[0], "gestor"]
+        with tm.span("cartao_html"):
+            st.markdown(_cartao_html(g, resultados_gestor[g]["res"]), unsafe_allow_html=True)
+
+_painel_resultados()
+
+def _agregar_resultados():
+    """Linhas do Resumo, chamamentos e detalhes a partir de ``resultados_gestor``.
+
+    Resumo e detalhe de cada gestor ficam guardados na própria entrada; só os invalidados são refeitos.
+    """
+    export_rows, rows_marcos_subj, por_gestor_details, subj_por_gestor = [], [], {}, {}
+    for g in gestores:
+        item = resultados_gestor.get(g)
+        if item is None:
+            continue
+        res, subj_list = item["res"], item["subj"]
+        if item["resumo"] is None:
+            item["resumo"] = linha_resumo(g, enquadramento, res, data_ciencia, termo_inicial_fato)
+            item["detalhe"] = linhas_detalhe(g, enquadramento, res, data_ciencia, termo_inicial_fato, global_marcos, subj_list)
+        subj_por_gestor[g] = subj_list
+        for d in subj_list:
+            rows_marcos_subj.append({"gestor": g, "chamamento_data": d.strftime("%Y-%m-%d")})
+        export_rows.append(item["resumo"])
+        # detalhes por gestor (aba individual no Excel)
+        por_gestor_details[g] = {"linhas": item["detalhe"]}
+    return export_rows, rows_marcos_subj, por_gestor_details, subj_por_gestor
 
 # --------------------------------------------------------------------------------------
-# 9) Exportação — botão Excel
+# 8) Exportação Excel (somente .xlsx) — ver prescricao_exportacao
+# 9) Exportação — botão Excel (gerado só no clique; cache pela impressão digital do caso)
 # --------------------------------------------------------------------------------------
+_tm.secao("9) Exportação")
 st.markdown("#### Exportação (Excel)")
-if export_rows:
-    xlsx_bytes = make_excel_bytes_expanded(
-        rows_resumo=export_rows,
-        rows_marcos_gerais=rows_marcos_gerais,
-        rows_marcos_subj=rows_marcos_subj,
-        parametros=parametros_do_caso,
-        por_gestor_details=por_gestor_details
-    )
+if gestores:
+    def _excel_caso_atual() -> bytes:
+        # Agregado só no clique (e só se a planilha não estiver em cache)
+        export_rows, rows_marcos_subj, por_gestor_details, _ = _agregar_resultados()
+        return excel_cacheado(_fp_caso, lambda: make_excel_bytes_expanded(
+            rows_resumo=export_rows,
+            rows_marcos_gerais=rows_marcos_gerais,
+            rows_marcos_subj=rows_marcos_subj,
+            parametros=parametros_do_caso,
+            por_gestor_details=por_gestor_details
+        ))
+
     st.download_button(
         "⬇️ Baixar resumo (Excel)",
-        data=xlsx_bytes,
+        data=_excel_caso_atual,
         file_name="prescricao_resultados_gestores.xlsx",
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         use_container_width=True
     )
 else:
     st.info("Preencha os dados e calcule ao menos um gestor para habilitar a exportação.")
+
+# Base local (SQLite): salvar o caso é um upsert pelo número do processo — ver prescricao_banco
+st.markdown("#### Base local de casos")
+if gestores:
+    c_proc, c_salvar = st.columns([3, 1])
+    processo_id = c_proc.text_input("Número do processo", key="processo_id", placeholder="p.ex. TCE-RJ 123456-7/2024")
+    c_salvar.markdown("<div style='height:28px'></div>", unsafe_allow_html=True)
+    # A reavaliação diária só avança a situação no tempo: grava-se apenas a situação de hoje
+    salvar_hoje = data_referencia == date.today()
+    if not salvar_hoje:
+        st.caption("Para salvar o caso, volte a data de referência para hoje: a base guarda a situação atual.")
+    if c_salvar.button("💾 Salvar caso", disabled=not (processo_id.strip() and salvar_hoje), use_container_width=True):
+        export_rows, _, _, subj_por_gestor = _agregar_resultados()
+        con = conectar()
+        try:
+            # Limite da intercorrente: permite à reavaliação diária (prescricao_reavaliacao) virar a situação sem recalcular
+            _limite = limite_intercorrente(enquadramento, check_intercorrente, data_ultimo_ato,
+                                           bool(check_intercorrente and use_hoje))
+            linhas_banco = [{**r, "limite_intercorrente": _limite.isoformat() if _limite else ""} for r in export_rows]
+            salvar_caso(con, processo_id.strip(), parametros_do_caso, global_marcos, subj_por_gestor, linhas_banco, fingerprint=_fp_caso)
+        finally:
+            con.close()
+        st.success(f"Caso {processo_id.strip()} salvo ({len(export_rows)} gestor(es)).")
+
+# --------------------------------------------------------------------------------------
+# 10) Carteira de casos (modo lote)
+# --------------------------------------------------------------------------------------
+_tm.secao("10) Carteira")
+st.markdown("#### Carteira de casos (modo lote)")
+with st.expander("📂 Calcular uma carteira a partir de CSV/XLSX", expanded=False):
+    st.caption("Uma linha por caso/gestor. Colunas: " + ", ".join(c for c, _ in COLUNAS_ENTRADA) + ".")
+    arquivo_carteira = st.file_uploader("Arquivo de casos", type=["csv", "xlsx"], key="carteira_upload")
+    if arquivo_carteira is not None and st.button("▶️ Calcular carteira", use_container_width=True):
+        linhas_carteira = list(ler_casos(arquivo_carteira, nome=arquivo_carteira.name))
+        total_carteira = max(len(linhas_carteira), 1)
+        barra_carteira = st.progress(0.0, text="Calculando…")
+
+        def _progresso_carteira(feitas: int):
+            barra_carteira.progress(min(feitas / total_carteira, 1.0), text=f"{feitas}/{total_carteira} linha(s)")
+
+        st.session_state["carteira_resultados"] = list(
+            processar_carteira(linhas_carteira, progresso=_progresso_carteira, data_referencia=data_referencia)
+        )
+        barra_carteira.empty()
+
+    resultados_carteira = st.session_state.get("carteira_resultados")
+    if resultados_carteira:
+        df_carteira = pd.DataFrame(resultados_carteira, columns=["processo"] + COLUNAS_RESUMO)
+        st.dataframe(df_carteira.head(1000), use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Baixar resultados da carteira (CSV)",
+            data=df_carteira.to_csv(index=False).encode("utf-8-sig"),
+            file_name="prescricao_resultados_lote.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+# Triagem de vencimentos: índice ordenado por prazo_final — ver prescricao_horizonte
+with st.expander("⏳ Vencimentos próximos (triagem)", expanded=False):
+    fonte_venc = st.radio("Fonte", ["Carteira calculada acima", "Base local (SQLite)"], horizontal=True, key="venc_fonte")
+    c_dias, c_enq = st.columns([1, 2])
+    dias_venc = c_dias.number_input("Próximos N dias", min_value=1, max_value=3650, value=90, step=30, key="venc_dias")
+    enq_venc = c_enq.multiselect("Enquadramentos", ENQUADRAMENTOS, default=ENQUADRAMENTOS, key="venc_enq",
+                                 format_func=regras_vigentes.rotular)
+    hoje_venc = data_referencia
+    if fonte_venc.startswith("Carteira"):
+        resultados_carteira = st.session_state.get("carteira_resultados")
+        if not resultados_carteira:
+            linhas_venc = None
+            st.info("Calcule uma carteira para usar o índice de vencimentos.")
+        else:
+            # Índice refeito só quando a carteira muda
+            if st.session_state.get("venc_indice_origem") is not resultados_carteira:
+                st.session_state["venc_indice"] = IndiceVencimentos(resultados_carteira)
+                st.session_state["venc_indice_origem"] = resultados_carteira
+            linhas_venc = st.session_state["venc_indice"].proximos(dias_venc, hoje_venc, enq_venc)
+    else:
+        con = conectar()
+        try:
+            linhas_venc = []
+            for enq in enq_venc:
+                linhas_venc += consultar_resultados(con, enquadramento=enq, prazo_de=hoje_venc,
+                                                    prazo_ate=hoje_venc + timedelta(days=dias_venc), limite=None)
+            linhas_venc.sort(key=lambda l: l["prazo_final"])
+        finally:
+            con.close()
+    if linhas_venc is not None:
+        st.caption(f"{len(linhas_venc)} gestor(es) com data-alvo até {(hoje_venc + timedelta(days=dias_venc)).strftime('%d/%m/%Y')}.")
+        st.dataframe(
+            pd.DataFrame(linhas_venc, columns=["processo"] + COLUNAS_RESUMO),
+            use_container_width=True, hide_index=True
+        )
+
+# Linha do tempo: situação da carteira no fim de cada mês + vencimentos por mês — ver prescricao_vetorial
+with st.expander("📈 Linha do tempo da carteira", expanded=False):
+    resultados_carteira = st.session_state.get("carteira_resultados")
+    if not resultados_carteira:
+        st.info("Calcule uma carteira para ver a linha do tempo.")
+    else:
+        meses_lt = st.number_input("Meses a partir da data de referência", min_value=1, max_value=240, value=60, step=12, key="lt_meses")
+        with _tm.span("linha_do_tempo"):
+            df_lt = pd.DataFrame(linha_do_tempo_resultados(resultados_carteira, data_referencia.replace(day=1), meses_lt)).set_index("mes")
+        st.caption("Vencimentos (data-alvo) por mês")
+        st.bar_chart(df_lt["vencimentos_no_mes"])
+        st.caption("Situação no fim de cada mês")
+        st.area_chart(df_lt.drop(columns=["data_referencia", "vencimentos_no_mes"]))
+
+# Cenários: a mesma carteira sob enquadramentos forçados / outro conjunto de regras — ver prescricao_cenarios
+with st.expander("🔀 Comparar cenários", expanded=False):
+    if arquivo_carteira is None:
+        st.info("Envie um arquivo de casos (acima) para comparar cenários.")
+    else:
+        st.caption(f"Referência: conjunto {regras_vigentes.versao}, enquadramento da planilha (ou sugerido). "
+                   "Só entram as linhas cuja situação ou data-alvo muda em algum cenário.")
+        enq_cen = st.multiselect("Enquadramento forçado", ENQUADRAMENTOS[:3], default=ENQUADRAMENTOS[:3], key="cen_enq",
+                                 format_func=regras_vigentes.rotular)
+        arquivo_conjunto = st.file_uploader("Conjunto de regras alternativo (JSON, opcional)", type=["json"], key="cen_conjunto")
+        if st.button("🔀 Comparar", use_container_width=True, key="cen_comparar"):
+            cenarios = [Cenario("referencia", regras_vigentes)]
+            apelidos = {e: a for a, e in APELIDOS_ENQUADRAMENTO.items()}
+            cenarios += [Cenario(apelidos[e], regras_vigentes, ENQUADRAMENTOS.index(e)) for e in enq_cen]
+            try:
+                if arquivo_conjunto is not None:
+                    alternativo = compilar(carregar_conjunto(arquivo_conjunto))
+                    cenarios.append(Cenario(f"v{alternativo.versao}", alternativo))
+            except ValueError as e:
+                st.error(f"Conjunto de regras inválido: {e}")
+            else:
+                if len(cenarios) < 2:
+                    st.warning("Selecione ao menos um cenário.")
+                else:
+                    resumo_cen = ResumoCenarios(cenarios)
+                    with _tm.span("cenarios"):
+                        # Cópia do upload: ler_casos fecha o arquivo ao terminar
+                        divergencias = list(comparar_cenarios(
+                            ler_casos(io.BytesIO(arquivo_carteira.getvalue()), nome=arquivo_carteira.name),
+                            cenarios, data_referencia, resumo=resumo_cen,
+                        ))
+                    st.session_state["cenarios_resultado"] = (cenarios, resumo_cen, divergencias)
+
+        resultado_cen = st.session_state.get("cenarios_resultado")
+        if resultado_cen:
+            cenarios, resumo_cen, divergencias = resultado_cen
+            st.caption(f"{resumo_cen.divergentes} de {resumo_cen.linhas} linha(s) divergem"
+                       + (f" ({resumo_cen.erros} com erro de entrada)" if resumo_cen.erros else "") + ".")
+            st.dataframe(pd.DataFrame(resumo_cen.linhas_resumo()[1:]), use_container_width=True, hide_index=True)
+            if divergencias:
+                df_cen = pd.DataFrame(divergencias)
+                st.dataframe(df_cen.head(1000), use_container_width=True, hide_index=True)
+                st.download_button(
+                    "⬇️ Baixar divergências (CSV)",
+                    data=df_cen.to_csv(index=False).encode("utf-8-sig"),
+                    file_name="prescricao_divergencias.csv",
+                    mime="text/csv",
+                    use_container_width=True
+                )
+
+# --------------------------------------------------------------------------------------
+# Painel de telemetria (administração)
+# --------------------------------------------------------------------------------------
+_registro_tm = _tm.finalizar(gestores=len(gestores), marcos_gerais=len(global_marcos))
+if _registro_tm and _painel_tm:
+    with st.expander("⏱️ Telemetria deste rerun", expanded=False):
+        st.caption(f"Total: {_registro_tm['total_ms']:.1f} ms — {len(gestores)} gestor(es)")
+        st.dataframe(
+            pd.DataFrame(_registro_tm["secoes"]).sort_values("ms", ascending=False),
+            use_container_width=True, hide_index=True
+        )
+        if _registro_tm["spans"]:
+            st.dataframe(
+                pd.DataFrame([{"span": k, **v} for k, v in _registro_tm["spans"].items()]),
+                use_container_width=True, hide_index=True
+            )
+        st.json(_registro_tm, expanded=False)
@@ -0,0 +1,315 @@
+# benchmarks/bench_prescricao.py
+"""Benchmarks do motor de cálculo, da exportação Excel e dos guias DOCX.
+
+Gera carteiras sintéticas determinísticas (1, 100, 10 mil e 1 milhão de linhas
+gestor), avaliadas numa data de referência fixa (``DATA_REFERENCIA``, não
+``date.today()``), mede vazão (ops/s), latência (p50/p95/p99) e pico de memória
+(tracemalloc) e compara com a linha de base gravada em ``baseline.json``.
+
+A comparação de vazão não usa ops/s absolutos, que dependem da máquina: junto de
+cada medição roda um laço de calibração em Python puro (datas, ordenação,
+dicionários) e a base guarda a vazão relativa a ele (``vazao_relativa``). Acusa
+regressão a vazão relativa abaixo de base·(1−tolerância) — padrão 25%, que
+absorve o ruído entre execuções — ou o pico de memória acima de base·(1+tolerância).
+
+Uso:
+    python benchmarks/bench_prescricao.py                       # tamanhos padrão, compara com a base
+    python benchmarks/bench_prescricao.py --tamanhos 1 100 10000 1000000
+    python benchmarks/bench_prescricao.py --salvar-baseline     # regrava baseline.json
+    python benchmarks/bench_prescricao.py --tolerancia 0.3 --saida resultado.json
+
+Retorna código 1 se algum benchmark regredir além da tolerância.
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+
+from prescricao_motor import (  # noqa: E402
+    ENQUADRAMENTOS,
+    _prelaw_consumou_ate_cutoff,
+    calcular_por_gestor,
+    compute_deadline,
+    linha_resumo,
+    linhas_detalhe,
+)
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+TAMANHOS_PADRAO = [1, 100, 10_000]
+# A exportação Excel é medida até este tamanho (acima disso, use gravar_excel_streaming)
+MAX_LINHAS_EXCEL = 10_000
+MIN_SEGUNDOS_COMPARACAO = 0.05
+# Data "as-of" dos casos sintéticos: o mesmo caminho de cálculo em qualquer dia
+DATA_REFERENCIA = date(2026, 1, 1)
+
+# --------------------------------------------------------------------------------------
+# Geradores sintéticos
+# --------------------------------------------------------------------------------------
+def _data(rng: random.Random, inicio: date, fim: date) -> date:
+    return inicio + timedelta(days=rng.randrange((fim - inicio).days))
+
+def gerar_casos(n: int, seed: int = 220) -> list[dict]:
+    """``n`` conjuntos de argumentos de ``calcular_por_gestor`` (casos com ~3 gestores cada)."""
+    rng = random.Random(seed)
+    casos = []
+    caso = None
+    for i in range(n):
+        if i % 3 == 0:
+            fato = _data(rng, date(2012, 1, 1), date(2025, 12, 31))
+            caso = {
+                "enquadramento": rng.choice(ENQUADRAMENTOS[:3]),
+                "termo_inicial_fato": fato,
+                "data_ciencia": _data(rng, fato, date(2026, 6, 30)),
+                "global_marcos": [_data(rng, fato, date(2027, 12, 31)) for _ in range(rng.randrange(4))],
+                "aplicar_prazo_penal": "Sim" if rng.random() < 0.1 else "Não",
+                "prazo_penal_anos": 8,
+                "check_intercorrente": rng.random() < 0.2,
+                "data_ultimo_ato": _data(rng, fato, date(2026, 6, 30)),
+                "idata_subseq": date(2026, 7, 18),
+                "data_referencia": DATA_REFERENCIA,
+            }
+        casos.append({
+            **caso,
+            "nome_gestor": f"Gestor {i}",
+            "subj_marcos": [_data(rng, date(2020, 1, 1), date(2027, 12, 31)) for _ in range(rng.randrange(3))],
+        })
+    return casos
+
+# --------------------------------------------------------------------------------------
+# Medição
+# --------------------------------------------------------------------------------------
+def _laco_calibracao() -> int:
+    """Carga fixa em Python puro, parecida com a do motor (datas, ordenação, dicionários)."""
+    base = date(2020, 1, 1)
+    datas = [base + timedelta(days=(i * 7919) % 3650) for i in range(2000)]
+    datas.sort()
+    contagem: dict[int, int] = {}
+    for d in datas:
+        contagem[d.year] = contagem.get(d.year, 0) + (d >= base)
+    return len(contagem)
+
+def calibrar(repeticoes: int = 3, lacos: int = 10) -> float:
+    """Laços de calibração por segundo nesta máquina (melhor de ``repeticoes``, menos sensível a ruído)."""
+    _laco_calibracao()
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        t = time.perf_counter()
+        for _ in range(lacos):
+            _laco_calibracao()
+        melhor = min(melhor, time.perf_counter() - t)
+    return lacos / melhor
+
+def _percentil(valores: list[float], p: float) -> float:
+    if not valores:
+        return 0.0
+    k = min(len(valores) - 1, max(0, round(p / 100 * (len(valores) - 1))))
+    return valores[k]
+
+def medir(nome: str,
+          tamanho: int,
+          passos,
+          ops_por_passo: int = 1,
+          max_passos_memoria: int = 1000,
+          rodadas: int = 3) -> dict:
+    """Executa ``passos`` (iterável de callables) medindo tempo por passo.
+
+    Uma chamada de aquecimento precede a medição; vazão, vazão relativa e latências vêm da
+    melhor de ``rodadas`` passadas (como ``timeit``: ruído só deixa mais lento). O pico de memória vem
+    de uma passada sob tracemalloc, limitada aos primeiros ``max_passos_memoria`` passos.
+    """
+    passos = list(passos)
+    passos[0]()
+    gc.collect()
+    ops = len(passos) * ops_por_passo
+    total, lat, relativa = float("inf"), [], 0.0
+    for _ in range(rodadas):
+        # Calibração colada a cada rodada: acompanha as oscilações de velocidade da máquina (VMs, turbo)
+        calibracao = calibrar()
+        lat_rodada = []
+        t0 = time.perf_counter()
+        for f in passos:
+            t = time.perf_counter_ns()
+            f()
+            lat_rodada.append(time.perf_counter_ns() - t)
+        decorrido = time.perf_counter() - t0
+        calibracao = (calibracao + calibrar()) / 2
+        relativa = max(relativa, ops / decorrido / calibracao) if decorrido else relativa
+        if decorrido < total:
+            total, lat = decorrido, lat_rodada
+
+    gc.collect()
+    tracemalloc.start()
+    for f in passos[:max_passos_memoria]:
+        f()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    lat.sort()
+    return {
+        "nome": nome,
+        "tamanho": tamanho,
+        "ops": ops,
+        "segundos": round(total, 4),
+        "ops_por_s": round(ops / total, 1) if total else 0.0,
+        "vazao_relativa": round(relativa, 4),
+        "p50_us": round(_percentil(lat, 50) / 1000, 2),
+        "p95_us": round(_percentil(lat, 95) / 1000, 2),
+        "p99_us": round(_percentil(lat, 99) / 1000, 2),
+        "pico_mem_kb": round(pico / 1024, 1),
+    }
+
+# --------------------------------------------------------------------------------------
+# Benchmarks
+# --------------------------------------------------------------------------------------
+def bench_compute_deadline(casos: list[dict]) -> dict:
+    return medir("compute_deadline", len(casos), [
+        (lambda c=c: compute_deadline(c["termo_inicial_fato"], c["global_marcos"] + c["subj_marcos"], 5))
+        for c in casos
+    ])
+
+def bench_prelaw(casos: list[dict]) -> dict:
+    return medir("_prelaw_consumou_ate_cutoff", len(casos), [
+        (lambda c=c: _prelaw_consumou_ate_cutoff(c["data_ciencia"], c["global_marcos"]))
+        for c in casos
+    ])
+
+def bench_calcular_por_gestor(casos: list[dict]) -> dict:
+    return medir("calcular_por_gestor", len(casos), [(lambda c=c: calcular_por_gestor(**c)) for c in casos])
+
+def bench_vetorial(casos: list[dict]) -> dict | None:
+    try:
+        import numpy as np
+        from prescricao_vetorial import (
+            calcular_vetorial, codificar_enquadramentos, empacotar_interrupcoes, para_datetime64,
+        )
+    except ImportError:
+        return None
+    enq = codificar_enquadramentos([c["enquadramento"] for c in casos])
+    fato = para_datetime64([c["termo_inicial_fato"] for c in casos])
+    ciencia = para_datetime64([c["data_ciencia"] for c in casos])
+    offsets, valores = empacotar_interrupcoes([c["global_marcos"] + c["subj_marcos"] for c in casos])
+    penal = np.array([8 if c["aplicar_prazo_penal"] == "Sim" else 0 for c in casos])
+    return medir("calcular_vetorial", len(casos), [
+        lambda: calcular_vetorial(enq, fato, ciencia, offsets, valores, prazo_penal_anos=penal,
+                                  data_referencia=DATA_REFERENCIA)
+    ], ops_por_passo=len(casos))
+
+def bench_excel(casos: list[dict], repeticoes: int = 3) -> dict:
+    """Vazão em linhas gestor/s; pico de memória de uma geração completa."""
+    from prescricao_exportacao import make_excel_bytes_expanded
+
+    rows, detalhes, subj = [], {}, []
+    for c in casos:
+        res = calcular_por_gestor(**c)
+        g = c["nome_gestor"]
+        rows.append(linha_resumo(g, c["enquadramento"], res, c["data_ciencia"], c["termo_inicial_fato"]))
+        detalhes[g] = {"linhas": linhas_detalhe(g, c["enquadramento"], res, c["data_ciencia"],
+                                               c["termo_inicial_fato"], c["global_marcos"], c["subj_marcos"])}
+        subj.extend({"gestor": g, "chamamento_data": d.isoformat()} for d in c["subj_marcos"])
+    gerais = [{"marco_geral_data": d.isoformat()} for d in casos[0]["global_marcos"]]
+    return medir("make_excel_bytes_expanded", len(casos), [
+        lambda: make_excel_bytes_expanded(rows, gerais, subj, {"natureza": "Punitiva"}, detalhes)
+    ] * repeticoes, ops_por_passo=len(casos), max_passos_memoria=1)
+
+def bench_docx(repeticoes: int = 20) -> list[dict]:
+    from prescricao_docx import SECOES_REGRAS, SECOES_ROTEIRO, _docx_bytes
+
+    # Mede a geração real (sem o cache por processo)
+    return [
+        medir("build_roteiro_docx_bytes", 1, [lambda: _docx_bytes(SECOES_ROTEIRO)] * repeticoes),
+        medir("build_regras_fundamentos_docx_bytes", 1, [lambda: _docx_bytes(SECOES_REGRAS)] * repeticoes),
+    ]
+
+def executar(tamanhos: list[int]) -> list[dict]:
+    resultados = []
+    for n in tamanhos:
+        casos = gerar_casos(n)
+        resultados.append(bench_compute_deadline(casos))
+        resultados.append(bench_prelaw(casos))
+        resultados.append(bench_calcular_por_gestor(casos))
+        vet = bench_vetorial(casos)
+        if vet:
+            resultados.append(vet)
+        if n <= MAX_LINHAS_EXCEL:
+            resultados.append(bench_excel(casos, repeticoes=1 if n >= MAX_LINHAS_EXCEL else 3))
+    resultados.extend(bench_docx())
+    return resultados
+
+# --------------------------------------------------------------------------------------
+# Relatório e comparação com a linha de base
+# --------------------------------------------------------------------------------------
+def _chave(r: dict) -> str:
+    return f"{r['nome']}@{r['tamanho']}"
+
+def imprimir(resultados: list[dict]) -> None:
+    print(f"{'benchmark':<44}{'ops/s':>14}{'relativa':>11}{'p50 µs':>11}{'p95 µs':>11}{'p99 µs':>11}{'pico KB':>12}")
+    for r in resultados:
+        print(f"{_chave(r):<44}{r['ops_por_s']:>14,.0f}{r['vazao_relativa']:>11.3f}{r['p50_us']:>11.1f}{r['p95_us']:>11.1f}"
+              f"{r['p99_us']:>11.1f}{r['pico_mem_kb']:>12,.0f}")
+
+def comparar(resultados: list[dict], base: dict, tolerancia: float) -> list[str]:
+    """Lista as regressões: vazão relativa (à calibração) abaixo de base·(1−tol) ou pico de
+    memória acima de base·(1+tol).
+
+    Medições de vazão com menos de ``MIN_SEGUNDOS_COMPARACAO`` na base são ruidosas demais e ficam
+    de fora, assim como entradas de bases antigas sem ``vazao_relativa``.
+    """
+    regressoes = []
+    for r in resultados:
+        b = base.get(_chave(r))
+        if not b:
+            continue
+        if ("vazao_relativa" in b and b["segundos"] >= MIN_SEGUNDOS_COMPARACAO
+                and r["vazao_relativa"] < b["vazao_relativa"] * (1 - tolerancia)):
+            regressoes.append(f"{_chave(r)}: vazão relativa {r['vazao_relativa']:,.3f} < base {b['vazao_relativa']:,.3f}")
+        if r["pico_mem_kb"] > b["pico_mem_kb"] * (1 + tolerancia) and r["pico_mem_kb"] - b["pico_mem_kb"] > 64:
+            regressoes.append(f"{_chave(r)}: memória {r['pico_mem_kb']:,.0f} KB > base {b['pico_mem_kb']:,.0f} KB")
+    return regressoes
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks da calculadora de prescrição.")
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=TAMANHOS_PADRAO,
+                        help="Números de linhas gestor (padrão: %(default)s; inclua 1000000 para a carga máxima).")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="Variação aceita (fração) da vazão relativa e da memória antes de acusar regressão. "
+                             "Padrão: %(default)s")
+    parser.add_argument("--baseline", type=Path, default=BASELINE, help="Arquivo da linha de base.")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Grava os resultados como nova linha de base.")
+    parser.add_argument("--saida", type=Path, help="Grava os resultados em JSON.")
+    args = parser.parse_args(argv)
+
+    resultados = executar(args.tamanhos)
+    imprimir(resultados)
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    if args.salvar_baseline:
+        base = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        base.update({_chave(r): r for r in resultados})
+        args.baseline.write_text(json.dumps(base, indent=2, ensure_ascii=False, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"\nLinha de base gravada em {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("\nSem linha de base; rode com --salvar-baseline para criar.")
+        return 0
+    regressoes = comparar(resultados, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerancia)
+    if regressoes:
+        print("\nRegressões:")
+        for r in regressoes:
+            print(f"  - {r}")
+        return 1
+    print("\nSem regressões em relação à linha de base.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+# prescricao_banco.py
+"""Base local (SQLite) de casos, marcos e resultados por gestor.
+
+Tabelas:
+- ``casos``: um registro por processo (parâmetros em JSON + impressão digital);
+- ``marcos``: marcos gerais (gestor vazio) e chamamentos por gestor;
+- ``resultados``: uma linha por processo/gestor no layout da aba "Resumo" (+ limite da intercorrente);
+- ``transicoes``/``reavaliacoes``: registro da reavaliação diária (``prescricao_reavaliacao``).
+
+Datas são gravadas em texto ISO (AAAA-MM-DD), que ordena cronologicamente; os
+índices em ``prazo_final``, ``situacao`` e ``enquadramento`` atendem as consultas
+de carteira sem varrer a tabela. Salvar um caso é um *upsert*: o registro do
+processo é atualizado e seus marcos/resultados são substituídos na mesma transação.
+
+Caminho padrão: ``PRESCRICAO_BANCO`` ou ``prescricao.sqlite3`` no diretório corrente.
+"""
+import json
+import os
+import sqlite3
+from datetime import date, datetime
+from typing import Iterable
+
+from prescricao_lote import PREFIXO_ERRO
+from prescricao_motor import COLUNAS_RESUMO
+
+CAMINHO_PADRAO = "prescricao.sqlite3"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS casos (
+    processo      TEXT PRIMARY KEY,
+    fingerprint   TEXT,
+    parametros    TEXT NOT NULL DEFAULT '{}',
+    atualizado_em TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS marcos (
+    processo TEXT NOT NULL REFERENCES casos(processo) ON DELETE CASCADE,
+    gestor   TEXT NOT NULL DEFAULT '',
+    tipo     TEXT NOT NULL,
+    data     TEXT NOT NULL,
+    PRIMARY KEY (processo, gestor, tipo, data)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resultados (
+    processo      TEXT NOT NULL REFERENCES casos(processo) ON DELETE CASCADE,
+    gestor        TEXT NOT NULL,
+    situacao      TEXT,
+    enquadramento TEXT,
+    base          TEXT,
+    termo_inicial TEXT,
+    prazo_final   TEXT,
+    ciencia       TEXT,
+    fato_cessacao TEXT,
+    interrupcoes  TEXT,
+    limite_intercorrente TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (processo, gestor)
+);
+CREATE TABLE IF NOT EXISTS transicoes (
+    processo        TEXT NOT NULL,
+    gestor          TEXT NOT NULL,
+    de              TEXT NOT NULL,
+    para            TEXT NOT NULL,
+    data_referencia TEXT NOT NULL,
+    registrado_em   TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS reavaliacoes (
+    data_referencia TEXT NOT NULL,
+    executado_em    TEXT NOT NULL,
+    transicoes      INTEGER NOT NULL
+);
+"""
+
+# Criados depois da migração de colunas (bases anteriores não têm ``limite_intercorrente``)
+_INDICES = """
+CREATE INDEX IF NOT EXISTS idx_resultados_prazo_final ON resultados(prazo_final);
+CREATE INDEX IF NOT EXISTS idx_resultados_situacao ON resultados(situacao, prazo_final);
+CREATE INDEX IF NOT EXISTS idx_resultados_enquadramento ON resultados(enquadramento, prazo_final);
+CREATE INDEX IF NOT EXISTS idx_resultados_limite_intercorrente ON resultados(limite_intercorrente)
+    WHERE limite_intercorrente > '';
+"""
+
+_COLUNAS_RESULTADO = ["processo"] + COLUNAS_RESUMO
+# Gravadas, mas fora do layout do Resumo: limite da intercorrente (reavaliação diária)
+_COLUNAS_GRAVADAS = _COLUNAS_RESULTADO + ["limite_intercorrente"]
+
+_UPSERT_CASO = """
+INSERT INTO casos (processo, fingerprint, parametros, atualizado_em) VALUES (?, ?, ?, ?)
+ON CONFLICT(processo) DO UPDATE SET
+    fingerprint = excluded.fingerprint,
+    parametros = excluded.parametros,
+    atualizado_em = excluded.atualizado_em
+"""
+
+_UPSERT_RESULTADO = (
+    f"INSERT INTO resultados ({', '.join(_COLUNAS_GRAVADAS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUNAS_GRAVADAS))}) "
+    "ON CONFLICT(processo, gestor) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in _COLUNAS_GRAVADAS[2:])
+)
+
+def conectar(caminho: str | None = None) -> sqlite3.Connection:
+    """Abre (e cria, se preciso) a base. Linhas retornam como ``sqlite3.Row``."""
+    con = sqlite3.connect(caminho or os.environ.get("PRESCRICAO_BANCO") or CAMINHO_PADRAO)
+    con.row_factory = sqlite3.Row
+    con.execute("PRAGMA journal_mode=WAL")
+    con.execute("PRAGMA synchronous=NORMAL")  # WAL: durável a cada checkpoint, bem mais rápido em lote
+    con.execute("PRAGMA foreign_keys=ON")
+    con.executescript(_ESQUEMA)
+    colunas = {r[1] for r in con.execute("PRAGMA table_info(resultados)")}
+    if "limite_intercorrente" not in colunas:
+        con.execute("ALTER TABLE resultados ADD COLUMN limite_intercorrente TEXT NOT NULL DEFAULT ''")
+    con.executescript(_INDICES)
+    return con
+
+def _agora() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+def _iso(d) -> str:
+    return d.isoformat() if isinstance(d, date) else str(d or "")
+
+# --------------------------------------------------------------------------------------
+# Gravação
+# --------------------------------------------------------------------------------------
+def salvar_caso(con: sqlite3.Connection,
+                processo: str,
+                parametros: dict,
+                marcos_gerais: Iterable[date],
+                marcos_subj: dict[str, list[date]],
+                linhas_resumo: Iterable[dict],
+                fingerprint: str | None = None) -> None:
+    """Upsert do caso: atualiza o registro do processo e substitui marcos e resultados."""
+    marcos = [(processo, "", "Marco geral", _iso(d)) for d in set(marcos_gerais)]
+    marcos += [(processo, g, "Chamamento", _iso(d)) for g, ds in marcos_subj.items() for d in set(ds)]
+    with con:
+        con.execute(_UPSERT_CASO, (processo, fingerprint, json.dumps(parametros, ensure_ascii=False, default=str), _agora()))
+        con.execute("DELETE FROM marcos WHERE processo = ?", (processo,))
+        con.execute("DELETE FROM resultados WHERE processo = ?", (processo,))
+        con.executemany("INSERT INTO marcos (processo, gestor, tipo, data) VALUES (?, ?, ?, ?)", marcos)
+        con.executemany(_UPSERT_RESULTADO, ([processo] + [l.get(c) or "" for c in _COLUNAS_GRAVADAS[1:]] for l in linhas_resumo))
+
+def salvar_resultados_lote(con: sqlite3.Connection,
+                           linhas: Iterable[dict],
+                           tamanho_lote: int = 10000,
+                           erros: list[dict] | None = None) -> int:
+    """Upsert em massa de linhas do modo lote (``processo`` + colunas do Resumo); retorna o total gravado.
+
+    Grava em transações de ``tamanho_lote`` linhas; casos ainda inexistentes são criados
+    sem parâmetros. Linhas com erro de entrada (situação "Erro na linha …") não são
+    resultados: ficam fora da base e são acrescentadas a ``erros``, se informada.
+    """
+    total = 0
+    agora = _agora()
+    lote: list[list] = []
+
+    def _descarregar():
+        with con:
+            con.executemany(
+                "INSERT INTO casos (processo, atualizado_em) VALUES (?, ?) "
+                "ON CONFLICT(processo) DO UPDATE SET atualizado_em = excluded.atualizado_em",
+                {(v[0], agora) for v in lote},
+            )
+            con.executemany(_UPSERT_RESULTADO, lote)
+
+    for linha in linhas:
+        if str(linha.get("situacao") or "").startswith(PREFIXO_ERRO):
+            if erros is not None:
+                erros.append(linha)
+            continue
+        lote.append([str(linha.get(c, "") or "") for c in _COLUNAS_GRAVADAS])
+        if len(lote) >= tamanho_lote:
+            _descarregar()
+            total += len(lote)
+            lote = []
+    if lote:
+        _descarregar()
+        total += len(lote)
+    return total
+
+# --------------------------------------------------------------------------------------
+# Consultas de carteira
+# --------------------------------------------------------------------------------------
+def consultar_resultados(con: sqlite3.Connection,
+                         situacao: str | None = None,
+                         enquadramento: str | None = None,
+                         prazo_de: date | None = None,
+                         prazo_ate: date | None = None,
+                         limite: int | None = 1000) -> list[dict]:
+    """Resultados filtrados por situação/enquadramento/intervalo de ``prazo_final``, ordenados pelo prazo."""
+    filtros, args = [], []
+    if situacao:
+        filtros.append("situacao = ?")
+        args.append(situacao)
+    if enquadramento:
+        filtros.append("enquadramento = ?")
+        args.append(enquadramento)
+    if prazo_de:
+        filtros.append("prazo_final >= ?")
+        args.append(_iso(prazo_de))
+    if prazo_ate:
+        filtros.append("prazo_final <= ?")
+        args.append(_iso(prazo_ate))
+    sql = f"SELECT {', '.join(_COLUNAS_RESULTADO)} FROM resultados"
+    if filtros:
+        sql += " WHERE " + " AND ".join(filtros)
+    sql += " ORDER BY prazo_final, processo, gestor"
+    if limite:
+        sql += " LIMIT ?"
+        args.append(limite)
+    return [dict(r) for r in con.execute(sql, args)]
+
+def contar_por_situacao(con: sqlite3.Connection) -> dict[str, int]:
+    """Total de linhas gestor por situação (usa o índice de ``situacao``)."""
+    return {r[0]: r[1] for r in con.execute("SELECT situacao, COUNT(*) FROM resultados GROUP BY situacao")}
+
+def carregar_caso(con: sqlite3.Connection, processo: str) -> dict | None:
+    """Parâmetros, marcos e resultados de um processo salvo (None se não existir)."""
+    caso = con.execute("SELECT * FROM casos WHERE processo = ?", (processo,)).fetchone()
+    if caso is None:
+        return None
+    marcos = con.execute("SELECT gestor, tipo, data FROM marcos WHERE processo = ? ORDER BY gestor, data", (processo,)).fetchall()
+    return {
+        "processo": processo,
+        "fingerprint": caso["fingerprint"],
+        "parametros": json.loads(caso["parametros"] or "{}"),
+        "atualizado_em": caso["atualizado_em"],
+        "marcos": [dict(m) for m in marcos],
+        "resultados": [dict(r) for r in con.execute(
+            "SELECT * FROM resultados WHERE processo = ? ORDER BY gestor", (processo,))],
+    }
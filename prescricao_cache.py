@@ -0,0 +1,139 @@
+# prescricao_cache.py
+"""Cache persistente em disco, endereçado pelo conteúdo do caso (``fingerprint_caso``).
+
+Guarda resultados calculados e planilhas geradas entre sessões, usuários e
+reinícios do servidor. Layout::
+
+    <diretorio>/<AAAA-MM-DD>/<impressao_digital>.<tipo>
+
+A data de referência é uma dimensão explícita do cache: a situação depende de
+``date.today()``, então entradas de outros dias nunca voltam a ser usadas e são
+apagadas na primeira gravação do dia. Dentro do dia, o tamanho total é limitado
+e as entradas menos usadas recentemente saem primeiro (a leitura renova o mtime).
+
+Configuração por ambiente:
+- ``PRESCRICAO_CACHE_DIR``: diretório (padrão: ``<tmp>/prescricao_cache``);
+- ``PRESCRICAO_CACHE_MB``: limite em MB (padrão 256; ``0`` desliga o cache).
+
+Objetos são guardados em JSON (datas como ``{"$data": "AAAA-MM-DD"}``), nunca com
+``pickle``. O diretório é criado com modo 0700 e só é usado se pertencer ao usuário
+do processo e não for acessível a outros (senão o cache fica desligado): ninguém
+mais pode plantar entradas, nem planilhas servidas para download.
+"""
+import json
+import os
+import shutil
+import stat
+import tempfile
+from datetime import date
+from functools import lru_cache
+from pathlib import Path
+
+LIMITE_PADRAO_MB = 256
+
+class CacheDisco:
+    """Cache chave → bytes em disco, por dia de referência, com despejo LRU por tamanho."""
+
+    def __init__(self, diretorio: str | os.PathLike, limite_bytes: int = LIMITE_PADRAO_MB * 1024 * 1024):
+        self.diretorio = Path(diretorio)
+        self.limite_bytes = limite_bytes
+        self._seguro: bool | None = None
+
+    def _diretorio_seguro(self) -> bool:
+        """Cria o diretório (0700) e confere dono e permissões, uma vez por instância."""
+        if self._seguro is None:
+            try:
+                self.diretorio.mkdir(mode=0o700, parents=True, exist_ok=True)
+                st = os.lstat(self.diretorio)
+                self._seguro = (stat.S_ISDIR(st.st_mode)
+                                and not st.st_mode & 0o077
+                                and (not hasattr(os, "getuid") or st.st_uid == os.getuid()))
+            except OSError:
+                self._seguro = False
+        return self._seguro
+
+    def _caminho(self, chave: str, tipo: str, hoje: date | None) -> Path:
+        return self.diretorio / (hoje or date.today()).isoformat() / f"{chave}.{tipo}"
+
+    def obter(self, chave: str, tipo: str, hoje: date | None = None) -> bytes | None:
+        """Bytes guardados para ``chave``/``tipo`` no dia ``hoje`` (None se ausente)."""
+        if not self._diretorio_seguro():
+            return None
+        caminho = self._caminho(chave, tipo, hoje)
+        try:
+            dados = caminho.read_bytes()
+            os.utime(caminho)  # renova a posição LRU
+        except OSError:
+            return None
+        return dados
+
+    def gravar(self, chave: str, tipo: str, dados: bytes, hoje: date | None = None) -> None:
+        """Grava de forma atômica (arquivo temporário + ``os.replace``) e aplica os limites."""
+        if not self._diretorio_seguro():
+            return
+        caminho = self._caminho(chave, tipo, hoje)
+        try:
+            caminho.parent.mkdir(exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(dados)
+            os.replace(tmp, caminho)
+        except OSError:
+            return  # cache é só aceleração: falha de disco não interrompe o cálculo
+        self._podar(caminho.parent)
+
+    def obter_json(self, chave: str, tipo: str, hoje: date | None = None):
+        dados = self.obter(chave, tipo, hoje)
+        if dados is None:
+            return None
+        try:
+            return json.loads(dados, object_hook=_decodificar_datas)
+        except ValueError:
+            return None  # entrada corrompida ou de versão anterior do código: tratada como ausente
+
+    def gravar_json(self, chave: str, tipo: str, objeto, hoje: date | None = None) -> None:
+        self.gravar(chave, tipo, json.dumps(objeto, default=_codificar_data, ensure_ascii=False).encode("utf-8"), hoje)
+
+    def _podar(self, dia: Path) -> None:
+        """Remove os outros dias e, no dia corrente, as entradas mais antigas além do limite."""
+        try:
+            for outro in self.diretorio.iterdir():
+                if outro.is_dir() and outro != dia:
+                    shutil.rmtree(outro, ignore_errors=True)
+            entradas = []
+            for arq in dia.iterdir():
+                try:
+                    st = arq.stat()
+                except OSError:
+                    continue
+                entradas.append((st.st_mtime, st.st_size, arq))
+        except OSError:
+            return
+        total = sum(tam for _, tam, _ in entradas)
+        if total <= self.limite_bytes:
+            return
+        for _, tam, arq in sorted(entradas):
+            try:
+                arq.unlink()
+            except OSError:
+                continue
+            total -= tam
+            if total <= self.limite_bytes:
+                break
+
+def _codificar_data(valor):
+    if isinstance(valor, date):
+        return {"$data": valor.isoformat()}
+    raise TypeError(f"não serializável no cache: {type(valor).__name__}")
+
+def _decodificar_datas(obj: dict):
+    return date.fromisoformat(obj["$data"]) if obj.keys() == {"$data"} else obj
+
+@lru_cache(maxsize=1)
+def cache_padrao() -> CacheDisco | None:
+    """Cache configurado pelo ambiente (None se ``PRESCRICAO_CACHE_MB=0``)."""
+    limite_mb = float(os.environ.get("PRESCRICAO_CACHE_MB", LIMITE_PADRAO_MB))
+    if limite_mb <= 0:
+        return None
+    diretorio = os.environ.get("PRESCRICAO_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "prescricao_cache")
+    return CacheDisco(diretorio, int(limite_mb * 1024 * 1024))
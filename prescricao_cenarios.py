@@ -0,0 +1,276 @@
+# prescricao_cenarios.py
+"""Comparação de cenários: quantos casos mudam sob outra interpretação.
+
+Um ``Cenario`` é uma tabela de decisão (``prescricao_regras``) e, opcionalmente,
+um enquadramento forçado para todas as linhas (novo regime, transição, pré-lei).
+``comparar_cenarios`` lê a carteira uma única vez, em blocos: cada bloco é
+convertido uma vez em arrays (datas ``datetime64[D]``, marcos ordenados em
+formato CSR) e avaliado em todos os cenários pelo motor vetorizado, sem
+reler nem reconverter a entrada. O primeiro cenário é a referência; saem só as
+linhas caso/gestor cuja situação ou data-alvo difere dela em algum cenário
+(matriz de divergências: uma coluna de situação e uma de prazo por cenário).
+
+``ResumoCenarios`` acumula, por cenário, o número de mudanças e a matriz de
+transições de situação (referência → cenário).
+
+Uso:
+    python prescricao_cenarios.py casos.csv -c novo -c transicao -c pre_lei -o divergencias.csv
+    python prescricao_cenarios.py casos.csv -c v2025=regras_2025.json --matriz transicoes.csv
+"""
+import argparse
+import csv
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import islice
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from prescricao_horizonte import APELIDOS_ENQUADRAMENTO
+from prescricao_lote import _datas, _parse_data, _sim_nao, ler_casos
+from prescricao_regras import ENQUADRAMENTOS, TabelaDecisao, carregar_conjunto, compilar, tabela_padrao
+from prescricao_vetorial import (
+    SITUACOES,
+    calcular_vetorial,
+    empacotar_interrupcoes,
+    para_datetime64,
+    sugerir_enquadramentos,
+)
+
+@dataclass(frozen=True, slots=True)
+class Cenario:
+    """Tabela de decisão + enquadramento forçado (código em ``ENQUADRAMENTOS``; None = o da linha ou o sugerido)."""
+    nome: str
+    regras: TabelaDecisao
+    enquadramento: int | None = None
+
+def resolver_cenario(espec: str, regras_base: TabelaDecisao | None = None) -> Cenario:
+    """Cenário a partir de ``[nome=]valor``.
+
+    ``valor``: apelido de enquadramento (novo, transicao, pre_lei, fora), JSON de um conjunto
+    de regras, ou ``regras.json:apelido`` (os dois). Sem ``nome``, o próprio valor nomeia o cenário.
+    """
+    nome, _, valor = espec.rpartition("=")
+    nome = nome or valor
+    if valor.lower().endswith(".json"):
+        caminho, apelido = valor, ""
+    else:
+        caminho, _, apelido = valor.rpartition(":")
+    regras = compilar(carregar_conjunto(caminho)) if caminho else (regras_base or tabela_padrao())
+    enquadramento = None
+    if apelido:
+        try:
+            enquadramento = ENQUADRAMENTOS.index(APELIDOS_ENQUADRAMENTO[apelido.strip().lower()])
+        except KeyError:
+            raise ValueError(f"cenário {espec!r}: enquadramento desconhecido ({apelido}; use "
+                             f"{', '.join(APELIDOS_ENQUADRAMENTO)})") from None
+    return Cenario(nome, regras, enquadramento)
+
+# --------------------------------------------------------------------------------------
+# Resumo (acumulado durante a leitura)
+# --------------------------------------------------------------------------------------
+@dataclass(slots=True)
+class ResumoCenarios:
+    """Contagens por cenário em relação ao primeiro (referência)."""
+    cenarios: list[Cenario]
+    linhas: int = 0
+    erros: int = 0
+    divergentes: int = 0
+    situacao_alterada: list[int] = field(default_factory=list)
+    prazo_alterado: list[int] = field(default_factory=list)
+    transicoes: np.ndarray | None = None  # cenários × SITUACOES (referência) × SITUACOES (cenário)
+
+    def __post_init__(self):
+        self.situacao_alterada = [0] * len(self.cenarios)
+        self.prazo_alterado = [0] * len(self.cenarios)
+        self.transicoes = np.zeros((len(self.cenarios), len(SITUACOES), len(SITUACOES)), dtype=np.int64)
+
+    def linhas_resumo(self) -> list[dict]:
+        """Uma linha por cenário: mudanças de situação e de data-alvo."""
+        return [
+            {"cenario": c.nome, "versao_regras": c.regras.versao,
+             "enquadramento": ENQUADRAMENTOS[c.enquadramento] if c.enquadramento is not None else "",
+             "linhas": self.linhas, "situacao_alterada": self.situacao_alterada[j],
+             "prazo_alterado": self.prazo_alterado[j]}
+            for j, c in enumerate(self.cenarios)
+        ]
+
+    def linhas_transicoes(self) -> list[dict]:
+        """Matriz de transições (só as células não nulas fora da diagonal)."""
+        return [
+            {"cenario": c.nome, "de": SITUACOES[a], "para": SITUACOES[b], "casos": int(self.transicoes[j, a, b])}
+            for j, c in enumerate(self.cenarios[1:], start=1)
+            for a in range(len(SITUACOES)) for b in range(len(SITUACOES))
+            if a != b and self.transicoes[j, a, b]
+        ]
+
+# --------------------------------------------------------------------------------------
+# Comparação em uma passada
+# --------------------------------------------------------------------------------------
+@dataclass(slots=True)
+class _Bloco:
+    """Entradas de um bloco convertidas uma vez; compartilhadas por todos os cenários."""
+    chaves: list[tuple[str, str]]
+    enquadramento: np.ndarray   # int8; -1 = sugerir
+    transitou: np.ndarray
+    fato: np.ndarray
+    ciencia: np.ndarray
+    gerais: tuple[np.ndarray, np.ndarray]   # CSR dos marcos gerais (teste pré-lei)
+    marcos: tuple[np.ndarray, np.ndarray]   # CSR de gerais + chamamentos, ordenados
+    penal: np.ndarray
+    ultimo_ato: np.ndarray
+    ato_subseq: np.ndarray
+
+def _preparar(linhas: list[dict]) -> tuple[_Bloco, int]:
+    chaves, enqs, transitou, fatos, ciencias, gerais, marcos, penal, ultimos, subseqs = ([] for _ in range(10))
+    erros = 0
+    for linha in linhas:
+        try:
+            fato = _parse_data(linha.get("fato_cessacao"))
+            if fato is None:
+                raise ValueError("fato_cessacao ausente")
+            ciencia = _parse_data(linha.get("ciencia"))
+            g = sorted(set(_datas(linha.get("marcos_gerais"))))
+            todos = sorted(set(g).union(_datas(linha.get("chamamentos"))))
+            rotulo = str(linha.get("enquadramento") or "").strip()
+            enq = ENQUADRAMENTOS.index(rotulo) if rotulo else -1
+            anos_penal = (int(float(linha["prazo_penal_anos"]))
+                          if _sim_nao(linha.get("aplicar_prazo_penal")) == "Sim" and linha.get("prazo_penal_anos") not in (None, "")
+                          else 0)
+            check = _sim_nao(linha.get("check_intercorrente")) == "Sim"
+            ultimo = _parse_data(linha.get("intercorrente_ultimo_ato")) if check else None
+            subseq = _parse_data(linha.get("intercorrente_ato_subseq")) if check else None
+        except (ValueError, TypeError):
+            erros += 1
+            continue
+        chaves.append((str(linha.get("processo") or "").strip(), str(linha.get("gestor") or "").strip()))
+        enqs.append(enq)
+        transitou.append(_sim_nao(linha.get("transitou_pre_lc")) == "Sim")
+        fatos.append(fato)
+        ciencias.append(ciencia)
+        gerais.append(g)
+        marcos.append(todos)
+        penal.append(anos_penal)
+        ultimos.append(ultimo)
+        subseqs.append(subseq)
+    bloco = _Bloco(
+        chaves=chaves,
+        enquadramento=np.array(enqs, dtype=np.int8),
+        transitou=np.array(transitou, dtype=bool),
+        fato=para_datetime64(fatos),
+        ciencia=para_datetime64(ciencias),
+        gerais=empacotar_interrupcoes(gerais),
+        marcos=empacotar_interrupcoes(marcos),
+        penal=np.array(penal, dtype=np.int16),
+        ultimo_ato=para_datetime64(ultimos),
+        ato_subseq=para_datetime64(subseqs),
+    )
+    return bloco, erros
+
+def _avaliar(b: _Bloco, cenario: Cenario, sugeridos: dict[int, np.ndarray], ref: date):
+    if cenario.enquadramento is not None:
+        codigos = np.full(len(b.chaves), cenario.enquadramento, dtype=np.int8)
+    else:
+        chave = id(cenario.regras)
+        if chave not in sugeridos:
+            sugeridos[chave] = sugerir_enquadramentos(b.transitou, b.fato, b.ciencia, *b.gerais, cenario.regras)
+        codigos = np.where(b.enquadramento >= 0, b.enquadramento, sugeridos[chave]).astype(np.int8)
+    res = calcular_vetorial(codigos, b.fato, b.ciencia, *b.marcos, prazo_penal_anos=b.penal,
+                            data_ultimo_ato=b.ultimo_ato, idata_subseq=b.ato_subseq,
+                            data_referencia=ref, regras=cenario.regras)
+    return res.situacao, res.prazo_final
+
+def _colunas(cenarios: list[Cenario]) -> list[str]:
+    return ["processo", "gestor"] + [f"{campo}_{c.nome}" for c in cenarios for campo in ("situacao", "prazo_final")] + ["cenarios_divergentes"]
+
+def comparar_cenarios(linhas: Iterable[dict],
+                      cenarios: list[Cenario],
+                      data_referencia: date | None = None,
+                      tamanho_bloco: int = 50000,
+                      resumo: ResumoCenarios | None = None) -> Iterator[dict]:
+    """Linhas caso/gestor que divergem da referência (primeiro cenário) em situação ou data-alvo.
+
+    Lê ``linhas`` uma vez, em blocos de ``tamanho_bloco``; linhas com erro de entrada são
+    contadas em ``resumo.erros`` e ignoradas. ``resumo`` (opcional) é atualizado a cada bloco.
+    """
+    if len(cenarios) < 2:
+        raise ValueError("informe ao menos um cenário além da referência")
+    ref = data_referencia or date.today()
+    resumo = resumo or ResumoCenarios(cenarios)
+    nomes = [c.nome for c in cenarios]
+    it = iter(linhas)
+    while bloco_linhas := list(islice(it, tamanho_bloco)):
+        b, erros = _preparar(bloco_linhas)
+        resumo.erros += erros
+        resumo.linhas += len(b.chaves)
+        if not b.chaves:
+            continue
+        sugeridos: dict[int, np.ndarray] = {}
+        avaliados = [_avaliar(b, c, sugeridos, ref) for c in cenarios]
+        sit0, prazo0 = avaliados[0]
+        diverge = np.zeros((len(cenarios), len(b.chaves)), dtype=bool)
+        for j, (sit, prazo) in enumerate(avaliados[1:], start=1):
+            muda_sit = sit != sit0
+            muda_prazo = (prazo != prazo0) & ~(np.isnat(prazo) & np.isnat(prazo0))  # NaT != NaT
+            diverge[j] = muda_sit | muda_prazo
+            resumo.situacao_alterada[j] += int(muda_sit.sum())
+            resumo.prazo_alterado[j] += int(muda_prazo.sum())
+            np.add.at(resumo.transicoes[j], (sit0, sit), 1)
+        linhas_divergentes = np.flatnonzero(diverge.any(axis=0))
+        resumo.divergentes += len(linhas_divergentes)
+        prazos_txt = [np.datetime_as_string(p).astype(object) for _, p in avaliados]
+        for i in linhas_divergentes:
+            saida = {"processo": b.chaves[i][0], "gestor": b.chaves[i][1]}
+            for c, (sit, _), txt in zip(cenarios, avaliados, prazos_txt):
+                saida[f"situacao_{c.nome}"] = SITUACOES[sit[i]]
+                saida[f"prazo_final_{c.nome}"] = "" if txt[i] == "NaT" else txt[i]
+            saida["cenarios_divergentes"] = "; ".join(n for n, d in zip(nomes, diverge[:, i]) if d)
+            yield saida
+
+# --------------------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------------------
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Compara a carteira sob vários cenários (conjuntos de regras / enquadramento forçado) numa só leitura.",
+    )
+    parser.add_argument("entrada", help="Arquivo de casos (.csv ou .xlsx), no formato do modo lote.")
+    parser.add_argument("-c", "--cenario", action="append", required=True, metavar="[NOME=]VALOR",
+                        help="Cenário (repetível): apelido de enquadramento (" + ", ".join(APELIDOS_ENQUADRAMENTO)
+                             + "), conjunto de regras .json ou regras.json:apelido.")
+    parser.add_argument("--conjunto-regras", default=None, metavar="JSON",
+                        help="Conjunto de regras da referência. Padrão: PRESCRICAO_REGRAS ou o embutido.")
+    parser.add_argument("--data-referencia", type=date.fromisoformat, default=None,
+                        help="Data \"as-of\" da situação (AAAA-MM-DD). Padrão: hoje.")
+    parser.add_argument("-o", "--saida", default="prescricao_divergencias.csv",
+                        help="CSV das linhas divergentes. Padrão: %(default)s")
+    parser.add_argument("--matriz", default=None, help="CSV da matriz de transições de situação por cenário.")
+    parser.add_argument("--tamanho-bloco", type=int, default=50000, help="Linhas por bloco. Padrão: %(default)s")
+    args = parser.parse_args(argv)
+
+    base = compilar(carregar_conjunto(args.conjunto_regras)) if args.conjunto_regras else tabela_padrao()
+    try:
+        cenarios = [Cenario("referencia", base)] + [resolver_cenario(e, base) for e in args.cenario]
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+    resumo = ResumoCenarios(cenarios)
+    with open(args.saida, "w", newline="", encoding="utf-8-sig") as f:
+        escritor = csv.DictWriter(f, fieldnames=_colunas(cenarios))
+        escritor.writeheader()
+        escritor.writerows(comparar_cenarios(ler_casos(args.entrada), cenarios, args.data_referencia,
+                                             args.tamanho_bloco, resumo))
+    if args.matriz:
+        with open(args.matriz, "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.DictWriter(f, fieldnames=["cenario", "de", "para", "casos"])
+            escritor.writeheader()
+            escritor.writerows(resumo.linhas_transicoes())
+    for r in resumo.linhas_resumo()[1:]:
+        print(f"{r['cenario']}: {r['situacao_alterada']} situação(ões) e {r['prazo_alterado']} data(s)-alvo alterada(s)",
+              file=sys.stderr)
+    print(f"{resumo.divergentes} de {resumo.linhas} linha(s) divergem ({resumo.erros} com erro de entrada) → {args.saida}",
+          file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+# prescricao_datas.py
+"""Aritmética de datas do motor: "data + N anos inteiros".
+
+Substitui ``date + relativedelta(years=n)`` no caminho quente. A regra é a
+mesma do ``relativedelta``: mantém dia e mês e, quando a data de origem é
+29/02 e o ano de destino não é bissexto, recua para 28/02. A equivalência
+foi conferida para todas as datas de 1900 a 2100 com n de 1 a 40.
+
+Os prazos usados pelo motor formam um conjunto pequeno (2, 5 e penais de 1
+a 40 anos) e as datas de partida se repetem muito numa carteira (18/07/2024,
+marcos gerais, ciência comum a vários gestores), por isso os resultados são
+memoizados.
+"""
+from datetime import date
+from functools import lru_cache
+
+@lru_cache(maxsize=1 << 17)
+def somar_anos(d: date, anos: int) -> date:
+    """Retorna ``d`` + ``anos`` anos (29/02 → 28/02 em ano não bissexto).
+
+    ``TypeError`` se ``d`` não for data (p.ex. ciência vazia), como a soma com ``relativedelta``.
+    """
+    if not isinstance(d, date):
+        raise TypeError(f"data inválida para somar {anos} ano(s): {d!r}")
+    try:
+        return d.replace(year=d.year + anos)
+    except ValueError:
+        # Única data inexistente no ano de destino: 29/02 em ano não bissexto
+        return d.replace(year=d.year + anos, day=28)
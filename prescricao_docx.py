@@ -0,0 +1,246 @@
+# prescricao_docx.py
+"""Guias em DOCX (Roteiro Oficial e Regras e fundamentos básicos), sem dependências externas.
+
+O conteúdo dos guias é estático: cada pacote DOCX é gerado uma única vez por
+processo e compartilhado por todas as sessões do Streamlit. A chave do cache
+é o hash SHA-256 do texto das seções, de modo que qualquer edição em
+``SECOES_ROTEIRO``/``SECOES_REGRAS`` gera um novo arquivo.
+"""
+import hashlib
+import zipfile
+from io import BytesIO
+
+# --------------------------------------------------------------------------------------
+# XML do documento
+# --------------------------------------------------------------------------------------
+def _xml_escape(s: str) -> str:
+    return (s.replace("&", "&amp;")
+             .replace("<", "&lt;")
+             .replace(">", "&gt;")
+             .replace('"', "&quot;")
+             .replace("'", "&apos;"))
+
+def _build_document_xml(sections):
+    def para(text, is_heading=False):
+        t = _xml_escape(text)
+        if is_heading:
+            return f"<w:p><w:r><w:rPr><w:b/><w:sz w:val='28'/></w:rPr><w:t xml:space='preserve'>{t}</w:t></w:r></w:p>"
+        else:
+            return f"<w:p><w:r><w:t xml:space='preserve'>{t}</w:t></w:r></w:p>"
+
+    body = []
+    for text, is_heading in sections:
+        body.append(para(text, is_heading))
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:wpc="http://schemas.microsoft.com/office/2010/wordprocessingCanvas" '
+        'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+        'xmlns:o="urn:schemas-microsoft-com:office:office" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships" '
+        'xmlns:m="http://schemas.openxmlformats.org/officeDocument/2006/math" '
+        'xmlns:v="urn:schemas-microsoft-com:vml" '
+        'xmlns:wp14="http://schemas.microsoft.com/office/2010/wordprocessingDrawing" '
+        'xmlns:wp="http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing" '
+        'xmlns:w10="urn:schemas-microsoft-com:office:word" '
+        'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+        'xmlns:w14="http://schemas.microsoft.com/office/2010/wordml" '
+        'xmlns:wpg="http://schemas.microsoft.com/office/2010/wordprocessingGroup" '
+        'xmlns:wpi="http://schemas.microsoft.com/office/2010/wordprocessingInk" '
+        'xmlns:wne="http://schemas.microsoft.com/office/2006/wordml" '
+        'xmlns:wps="http://schemas.microsoft.com/office/2010/wordprocessingShape" mc:Ignorable="w14 wp14">'
+        '<w:body>' + "".join(body) +
+        '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+        '<w:pgMar w:top="1440" w:right="1440" w:bottom="1440" w:left="1440" w:header="708" w:footer="708" w:gutter="0"/></w:sectPr>'
+        '</w:body></w:document>'
+    )
+    return xml
+
+# --------------------------------------------------------------------------------------
+# Conteúdo dos guias
+# --------------------------------------------------------------------------------------
+SECOES_ROTEIRO = [
+    ("ROTEIRO OFICIAL — Calculadora de Prescrição (LC-RJ 63/1990, art. 5º-A)", True),
+    ("1) Finalidade", True),
+    ("Padronizar a aplicação do art. 5º-A (LCE 63/1990) com a chave intertemporal consolidada pelo Plenário: "
+     "fatos ≥ 18/07/2021 → novo regime (5 anos do fato/cessação); fatos < 18/07/2021 → teste pré-lei e, não consumando até 18/07/2024, transição bienal (18/07/2024 → 18/07/2026).", False),
+
+    ("2) Chave intertemporal — visão executiva", True),
+    ("• Fatos ≥ 18/07/2021 → Novo regime (5 anos do fato/cessação).", False),
+    ("• Fatos < 18/07/2021 → faça o TESTE PRÉ-LEI: projete 5 anos da ciência (em regra, autuação) com marcos até 18/07/2024. "
+     "Se consumou até 18/07/2024 → prescrição antes da lei. Se NÃO consumou → Transição (18/07/2024 → 18/07/2026), independentemente de a ciência ser posterior.", False),
+    ("• Decisão administrativa transitada até 18/07/2024 → fora do alcance da LCE 220/2024.", False),
+
+    ("3) Marcos interruptivos", True),
+    ("• Teste pré-lei: apenas marcos entre a ciência e 18/07/2024 (reiniciam o quinquênio do regime anterior).", False),
+    ("• Transição: apenas marcos a partir de 18/07/2024.", False),
+    ("• Novo regime: marcos a partir do fato/cessação.", False),
+    ("• Qualificação: chamamento qualificado é subjetivo e retroage à decisão que o determinou; simples protocolo de TCE não interrompe.", False),
+
+    ("4) Intercorrente e prazo penal", True),
+    ("• Intercorrente: paralisação > 3 anos sem julgamento/despacho (art. 5º-A, §1º).", False),
+    ("• Prazo penal: prevalece sobre o administrativo quando cabível (art. 5º-A, §2º).", False),
+
+    ("5) Passo a passo no aplicativo", True),
+    ("1. Preencha: natureza, conduta, data do fato/cessação (ou base motivada na ressarcitória).", False),
+    ("2. Informe autuação; por padrão, 'Ciência = autuação' fica ligado. Desligue para editar ciência distinta.", False),
+    ("3. Lançe marcos gerais (valem para todos) e, por gestor, os chamamentos qualificados (efeito subjetivo).", False),
+    ("4. O app sugere o enquadramento: novo regime / transição / prescrição antes da lei / fora do alcance. Ajuste se necessário.", False),
+    ("5. Se desejar, habilite intercorrente e informe último ato + termo final (ou 'hoje').", False),
+    ("6. Verifique os cartões por gestor e exporte o Excel (Resumo + abas auxiliares).", False),
+
+    ("6) ÍNDICE E EXPLICAÇÕES DOS VÍDEOS (sem áudio)", True),
+
+    ("01_Novo_Regime_FatoRecente.mp4", True),
+    ("Objetivo: Demonstrar fato ≥ 18/07/2021 com contagem quinquenal a partir do fato/cessação.", False),
+    ("Entradas: Punitiva; Ato 03/11/2021; Autuação/Ciência 12/12/2024; sem marcos; sem intercorrente.", False),
+    ("Resultado: Enquadramento 'Novo regime (art. 5º-A)'; prazo final 03/11/2026.", False),
+
+    ("02_Transicao_CienciaPosterior.mp4", True),
+    ("Objetivo: Fato anterior a 18/07/2021 com ciência posterior à lei (aplica transição bienal).", False),
+    ("Entradas: Punitiva; Ato 15/06/2016; Ciência 12/12/2024; sem marcos.", False),
+    ("Resultado: 'Transição 2 anos (LC 220/24)'; vence 18/07/2026.", False),
+
+    ("03_Prescricao_AntesDaLei.mp4", True),
+    ("Objetivo: Reconhecimento de prescrição pré-lei pelo quinquênio da ciência.", False),
+    ("Entradas: Ato 10/05/2015; Ciência 10/06/2017; sem marcos até 18/07/2024.", False),
+    ("Resultado: 'Prescrição reconhecida (regime anterior)'.", False),
+
+    ("04_Transicao_MarcoGeral.mp4", True),
+    ("Objetivo: Mostrar reinício do bienal por ato inequívoco de apuração pós-lei.", False),
+    ("Entradas: Ato 20/02/2017; Ciência 01/08/2024; Marco geral 10/09/2025.", False),
+    ("Resultado: Novo vencimento 10/09/2027.", False),
+
+    ("05_Transicao_Chamamento_Subjetivo.mp4", True),
+    ("Objetivo: Efeito subjetivo do chamamento qualificado (multi-gestores).", False),
+    ("Entradas: Fato 2016; Ciência 2024; Gestor A com chamamento 20/06/2026 (decisão em 05/05/2026); Gestor B sem chamamento.", False),
+    ("Resultado: Gestor A vence 05/05/2028 (retroação à decisão); Gestor B vence 18/07/2026.", False),
+
+    ("06_Intercorrente.mp4", True),
+    ("Objetivo: Prescrição intercorrente (> 3 anos) durante a tramitação.", False),
+    ("Entradas: Novo regime; último ato 01/08/2021; ato subsequente 05/09/2024.", False),
+    ("Resultado: 'Prescrição intercorrente'.", False),
+
+    ("07_Continuada_Cessacao.mp4", True),
+    ("Objetivo: Conduta continuada (termo na cessação).", False),
+    ("Entradas: Cessação 31/12/2022; sem marcos; sem intercorrente.", False),
+    ("Resultado: Novo regime; prazo final 31/12/2027.", False),
+
+    ("08_Ressarcitoria_UltimaMedicao.mp4", True),
+    ("Objetivo: Ressarcitória (analogia) com base 'última medição/pagamento'.", False),
+    ("Entradas: Última medição 30/03/2019; ciência 2024; sem marcos.", False),
+    ("Resultado: Transição; vence 18/07/2026 (salvo marcos pós-lei).", False),
+
+    ("09_PrazoPenal.mp4", True),
+    ("Objetivo: Prevalência do prazo penal (§2º).", False),
+    ("Entradas: Ato 10/10/2022; 'Fato também é crime: Sim'; Prazo penal 8 anos.", False),
+    ("Resultado: Base = penal (8 anos); vencimento 10/10/2030.", False),
+
+    ("10_Ciencia_Apos_18072026.mp4", True),
+    ("Objetivo: Ciência apenas após 18/07/2026 em caso de transição (sem marcos).", False),
+    ("Entradas: Fato 2017; Ciência 01/08/2026; sem marcos.", False),
+    ("Resultado: Prescrição consumada em 18/07/2026 (ciência tardia não reabre).", False),
+
+    ("11_Multigestores_ExportacaoExcel.mp4", True),
+    ("Objetivo: Preencher vários gestores, com marcos gerais e chamamentos específicos, e exportar o Excel.", False),
+    ("Entradas: Fato 2016; Marco geral 01/03/2025; Chamamento só do Gestor B 15/05/2025.", False),
+    ("Resultado: Planilha com Resumo e abas auxiliares; prazos distintos por gestor.", False),
+]
+
+_INTRO_REGRAS = (
+    "Este guia resume a chave intertemporal e os principais fundamentos aplicados pela calculadora de "
+    "prescrição (art. 5º-A da LCE 63/1990, redação da LCE 220/2024), a partir dos paradigmas 224.269-8/23, "
+    "227.877-1/14 e 114.199-4/2024. Para fatos ≥ 18/07/2021, aplica-se o novo regime (termo no fato/cessação; "
+    "quinquênio). Para fatos < 18/07/2021, preserva-se o teste pré-lei (quinquênio pela ciência do TCE) e, não "
+    "consumada até 18/07/2024, incide a regra de transição (biênio a partir de 18/07/2024), com marcos interruptivos "
+    "aplicáveis. Interrupções reiniciam o prazo no mesmo regime (5 anos no novo; 2 anos na transição). O chamamento "
+    "qualificado tem efeito subjetivo. As regras podem ser ajustadas por novos votos; registre a motivação no parecer."
+)
+
+SECOES_REGRAS = [
+    ("REGRAS E FUNDAMENTOS BÁSICOS — Calculadora de Prescrição", True),
+    (_INTRO_REGRAS, False),
+    # Chave intertemporal
+    ("CHAVE INTERTEMPORAL", True),
+    ("• Fatos ≥ 18/07/2021 → Novo regime (art. 5º-A): termo no fato/cessação; prazo 5 anos; "
+     "marcos a partir do fato/cessação; intercorrente em 3 anos. (Base: 224.269-8/23; 227.877-1/14)", False),
+    ("• Fatos < 18/07/2021 → Teste pré-lei (regime anterior): quinquênio contado da ciência pelo TCE "
+     "(em regra, a autuação). Se NÃO consumou até 18/07/2024 → Transição bienal (18/07/2024 → 18/07/2026). "
+     "(Base: 227.877-1/14; 114.199-4/2024)", False),
+
+    # Interrupções
+    ("MARCOS INTERRUPTIVOS", True),
+    ("• Novo regime: comunicação/notificação/citação; ato inequívoco de apuração; decisão recorrível; "
+     "tentativa conciliatória; chamamento qualificado. Interrompem e reiniciam 5 anos.", False),
+    ("• Transição: marcos válidos a partir de 18/07/2024 interrompem e reiniciam 2 anos (não convertem em 5). "
+     "(Base: 227.877-1/14)", False),
+    ("• Chamamento qualificado (efeito subjetivo): interrompe apenas para o gestor chamado e pode retroagir "
+     "à decisão que o determinou. (Base: 227.877-1/14)", False),
+    ("• Simples protocolo/movimento interno sem lastro apuratório: não interrompe. (Base: 227.877-1/14)", False),
+
+    # Termos e intercorrente
+    ("TERMOS E INTERCORRENTE", True),
+    ("• Regime anterior (pré-lei): termo inicial na ciência pelo TCE (em regra, a autuação). (Base: 114.199-4/2024)", False),
+    ("• Intercorrente (novo §1º): 3 anos de paralisação sem despacho/julgamento útil. (Base: 227.877-1/14)", False),
+
+    # Observação final
+    ("OBSERVAÇÃO IMPORTANTE", True),
+    ("As regras acima refletem a consolidação atual. Podem ser ajustadas por novos votos/acórdãos. "
+     "O aplicativo permite ajustar premissas (datas, marcos e enquadramento) e recomenda registrar a motivação "
+     "no parecer de cada caso concreto.", False),
+]
+
+# --------------------------------------------------------------------------------------
+# Pacote DOCX mínimo + cache por conteúdo
+# --------------------------------------------------------------------------------------
+_CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    '</Types>'
+)
+_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    '</Relationships>'
+)
+_WORD_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.microsoft.com/office/2006/relationships"/>'
+)
+
+_CACHE_DOCX: dict[str, bytes] = {}
+
+def _hash_secoes(sections) -> str:
+    h = hashlib.sha256()
+    for text, is_heading in sections:
+        h.update(b"H" if is_heading else b"P")
+        h.update(text.encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+def _docx_bytes(sections) -> bytes:
+    document_xml = _build_document_xml(sections)
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, 'w', zipfile.ZIP_DEFLATED) as z:
+        z.writestr('[Content_Types].xml', _CONTENT_TYPES_XML)
+        z.writestr('_rels/.rels', _RELS_XML)
+        z.writestr('word/document.xml', document_xml)
+        z.writestr('word/_rels/document.xml.rels', _WORD_RELS_XML)
+    return buf.getvalue()
+
+def docx_cacheado(sections) -> bytes:
+    """Bytes do DOCX das ``sections``, gerados na primeira chamada e reaproveitados depois."""
+    chave = _hash_secoes(sections)
+    dados = _CACHE_DOCX.get(chave)
+    if dados is None:
+        dados = _CACHE_DOCX.setdefault(chave, _docx_bytes(sections))
+    return dados
+
+def build_roteiro_docx_bytes() -> bytes:
+    return docx_cacheado(SECOES_ROTEIRO)
+
+def build_regras_fundamentos_docx_bytes() -> bytes:
+    return docx_cacheado(SECOES_REGRAS)
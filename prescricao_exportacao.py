@@ -0,0 +1,332 @@
+# prescricao_exportacao.py
+"""Exportação dos resultados em Excel (.xlsx) — Resumo, marcos, parâmetros, dicionário e abas por gestor.
+
+A planilha só é gerada quando o usuário pede o download; os bytes ficam num
+cache em memória (LRU) indexado pela impressão digital canônica do caso
+(``fingerprint_caso``), de modo que downloads repetidos do mesmo caso não
+refazem o workbook. Abaixo do cache em memória há o cache em disco
+(``prescricao_cache``), compartilhado entre sessões e reinícios.
+
+Para carteiras grandes, ``gravar_excel_streaming`` grava as mesmas abas linha
+a linha (xlsxwriter em ``constant_memory``), direto em arquivo, com memória
+constante em relação ao número de linhas.
+"""
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from datetime import date
+from io import BytesIO
+from typing import Callable, Iterable
+
+from prescricao_cache import cache_padrao
+from prescricao_motor import COLUNAS_RESUMO
+
+LARGURAS_RESUMO = [26, 20, 28, 22, 15, 15, 15, 15, 40]
+
+# Acima deste número de gestores, o detalhamento vai para uma única aba longa
+# ("Detalhes_Gestores": gestor/campo/valor) em vez de uma aba "G - <nome>" por gestor.
+LIMIAR_ABAS_GESTOR = 20
+
+DICIONARIO = [
+    ("gestor", "Nome do gestor (uma linha por gestor)."),
+    ("situacao", "Não prescrito / Prescrição consumada / Prescrição intercorrente / Prescrição reconhecida (regime anterior)."),
+    ("enquadramento", "Novo regime / Transição 2 anos / Prescrição antes da lei / Fora do alcance."),
+    ("base", "quinquenal / penal (X anos) / bienal (transição)."),
+    ("termo_inicial", "Data usada no cálculo, conforme enquadramento."),
+    ("prazo_final", "Data-alvo projetada, após interrupções consideradas."),
+    ("ciencia", "Data de ciência considerada (TCE-RJ)."),
+    ("fato_cessacao", "Data do fato/cessação (transparência)."),
+    ("interrupcoes", "Interrupções consideradas (marcos gerais + chamamentos do gestor)."),
+    ("marco_geral_data", "Ato inequívoco de apuração / decisão recorrível / tentativa conciliatória (valem para todos)."),
+    ("chamamento_data", "Chamamento qualificado (efeito subjetivo, por gestor)."),
+    ("parametro/valor", "Parâmetros do caso — contexto global da execução."),
+    ("gestor/campo/valor", "Detalhamento por gestor (abas \"G - <nome>\" ou, com muitos gestores, aba única \"Detalhes_Gestores\")."),
+]
+
+def sanitize_sheet_name(name: str) -> str:
+    name = re.sub(r'[:\\/?*\[\]]', '_', name).strip()
+    return name[:31] if len(name) > 31 else name
+
+def nomes_abas_gestores(gestores) -> dict[str, str]:
+    """Nome de aba único por gestor ("G - <nome>"), desambiguando colisões após o corte em 31 caracteres.
+
+    O Excel compara nomes de aba sem diferenciar maiúsculas; colisões recebem o sufixo " (2)", " (3)"…
+    """
+    usados = set()
+    nomes = {}
+    for g in gestores:
+        base = sanitize_sheet_name(f"G - {g}")
+        nome, n = base, 1
+        while nome.lower() in usados:
+            n += 1
+            sufixo = f" ({n})"
+            nome = base[:31 - len(sufixo)] + sufixo
+        usados.add(nome.lower())
+        nomes[g] = nome
+    return nomes
+
+def _linhas_longas(por_gestor_details: dict):
+    for g, detail in por_gestor_details.items():
+        for linha in detail["linhas"]:
+            yield (g, linha.get("campo", ""), linha.get("valor", ""))
+
+def make_excel_bytes_expanded(rows_resumo: list[dict],
+                              rows_marcos_gerais: list[dict],
+                              rows_marcos_subj: list[dict],
+                              parametros: dict,
+                              por_gestor_details: dict,
+                              limiar_abas_gestor: int = LIMIAR_ABAS_GESTOR) -> bytes:
+    """
+    Gera .xlsx com fallback automático:
+    - Se 'xlsxwriter' estiver disponível → usa formatações/condicional.
+    - Caso contrário → usa 'openpyxl' (sem formatações avançadas).
+    Com mais de ``limiar_abas_gestor`` gestores, o detalhamento vai para a aba longa "Detalhes_Gestores".
+    """
+    import pandas as pd
+
+    engine = "openpyxl"
+    try:
+        import xlsxwriter  # noqa: F401
+        engine = "xlsxwriter"
+    except Exception:
+        engine = "openpyxl"
+
+    buf = BytesIO()
+    with pd.ExcelWriter(buf, engine=engine, datetime_format="yyyy-mm-dd", date_format="yyyy-mm-dd") as writer:
+        # Resumo
+        df_resumo = pd.DataFrame(rows_resumo) if rows_resumo else pd.DataFrame(columns=COLUNAS_RESUMO)
+        df_resumo.to_excel(writer, sheet_name="Resumo", index=False)
+        ws_resumo = writer.sheets["Resumo"]
+
+        if engine == "xlsxwriter":
+            wb = writer.book
+            for i, w in enumerate(LARGURAS_RESUMO):
+                ws_resumo.set_column(i, i, w)
+            ws_resumo.freeze_panes(1, 0)
+
+            red_fmt = wb.add_format({"font_color": "#D93025"})
+            green_fmt = wb.add_format({"font_color": "#1E8E3E"})
+            blue_fmt = wb.add_format({"font_color": "#1A73E8"})
+            last_row = len(df_resumo) + 1
+            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "text", "criteria": "containing", "value": "Prescrição consumada", "format": red_fmt})
+            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "text", "criteria": "containing", "value": "intercorrente", "format": red_fmt})
+            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "text", "criteria": "containing", "value": "Não prescrito", "format": green_fmt})
+            ws_resumo.conditional_format(f"B2:B{last_row}", {"type": "no_blanks", "format": blue_fmt})
+        else:
+            from openpyxl.utils import get_column_letter
+            for idx, w in enumerate(LARGURAS_RESUMO, start=1):
+                ws_resumo.column_dimensions[get_column_letter(idx)].width = w
+            ws_resumo.freeze_panes = "A2"
+
+        # Marcos_Gerais
+        df_g = pd.DataFrame(rows_marcos_gerais) if rows_marcos_gerais else pd.DataFrame(columns=["marco_geral_data"])
+        df_g.to_excel(writer, sheet_name="Marcos_Gerais", index=False)
+        ws_g = writer.sheets["Marcos_Gerais"]
+        if engine == "xlsxwriter":
+            ws_g.set_column("A:A", 18)
+            ws_g.freeze_panes(1, 0)
+        else:
+            from openpyxl.utils import get_column_letter
+            ws_g.column_dimensions[get_column_letter(1)].width = 18
+            ws_g.freeze_panes = "A2"
+
+        # Marcos_Subjetivos
+        df_s = pd.DataFrame(rows_marcos_subj) if rows_marcos_subj else pd.DataFrame(columns=["gestor","chamamento_data"])
+        df_s.to_excel(writer, sheet_name="Marcos_Subjetivos", index=False)
+        ws_s = writer.sheets["Marcos_Subjetivos"]
+        if engine == "xlsxwriter":
+            ws_s.set_column("A:A", 26)
+            ws_s.set_column("B:B", 18)
+            ws_s.freeze_panes(1, 0)
+        else:
+            from openpyxl.utils import get_column_letter
+            ws_s.column_dimensions[get_column_letter(1)].width = 26
+            ws_s.column_dimensions[get_column_letter(2)].width = 18
+            ws_s.freeze_panes = "A2"
+
+        # Parametros_do_Caso
+        p_rows = [(k, v) for k, v in parametros.items()]
+        df_p = pd.DataFrame(p_rows, columns=["parametro", "valor"])
+        df_p.to_excel(writer, sheet_name="Parametros_do_Caso", index=False)
+        ws_p = writer.sheets["Parametros_do_Caso"]
+        if engine == "xlsxwriter":
+            ws_p.set_column("A:A", 36)
+            ws_p.set_column("B:B", 60)
+            ws_p.freeze_panes(1, 0)
+        else:
+            from openpyxl.utils import get_column_letter
+            ws_p.column_dimensions[get_column_letter(1)].width = 36
+            ws_p.column_dimensions[get_column_letter(2)].width = 60
+            ws_p.freeze_panes = "A2"
+
+        # Dicionario
+        df_dic = pd.DataFrame(DICIONARIO, columns=["coluna", "descrição"])
+        df_dic.to_excel(writer, sheet_name="Dicionario", index=False)
+        ws_d = writer.sheets["Dicionario"]
+        if engine == "xlsxwriter":
+            ws_d.set_column("A:A", 30)
+            ws_d.set_column("B:B", 90)
+            ws_d.freeze_panes(1, 0)
+        else:
+            from openpyxl.utils import get_column_letter
+            ws_d.column_dimensions[get_column_letter(1)].width = 30
+            ws_d.column_dimensions[get_column_letter(2)].width = 90
+            ws_d.freeze_panes = "A2"
+
+        # Detalhamento por gestor: aba longa (muitos gestores) ou abas individuais
+        if len(por_gestor_details) > limiar_abas_gestor:
+            df_long = pd.DataFrame(list(_linhas_longas(por_gestor_details)), columns=["gestor", "campo", "valor"])
+            df_long.to_excel(writer, sheet_name="Detalhes_Gestores", index=False)
+            ws_l = writer.sheets["Detalhes_Gestores"]
+            if engine == "xlsxwriter":
+                ws_l.set_column("A:A", 26)
+                ws_l.set_column("B:B", 34)
+                ws_l.set_column("C:C", 70)
+                ws_l.freeze_panes(1, 0)
+                ws_l.autofilter(0, 0, len(df_long), 2)
+            else:
+                from openpyxl.utils import get_column_letter
+                for idx, w in enumerate([26, 34, 70], start=1):
+                    ws_l.column_dimensions[get_column_letter(idx)].width = w
+                ws_l.freeze_panes = "A2"
+                ws_l.auto_filter.ref = f"A1:C{len(df_long) + 1}"
+        else:
+            nomes = nomes_abas_gestores(por_gestor_details)
+            for g, detail in por_gestor_details.items():
+                sheet = nomes[g]
+                df_det = pd.DataFrame(detail["linhas"])
+                if df_det.empty:
+                    df_det = pd.DataFrame(columns=["campo", "valor"])
+                df_det.to_excel(writer, sheet_name=sheet, index=False)
+                ws_x = writer.sheets[sheet]
+                if engine == "xlsxwriter":
+                    ws_x.set_column("A:A", 34)
+                    ws_x.set_column("B:B", 70)
+                    ws_x.freeze_panes(1, 0)
+                else:
+                    from openpyxl.utils import get_column_letter
+                    ws_x.column_dimensions[get_column_letter(1)].width = 34
+                    ws_x.column_dimensions[get_column_letter(2)].width = 70
+                    ws_x.freeze_panes = "A2"
+
+    return buf.getvalue()
+
+# --------------------------------------------------------------------------------------
+# Exportação em streaming (carteiras grandes)
+# --------------------------------------------------------------------------------------
+def _aba_streaming(wb, nome: str, colunas: list[str], larguras: list[int]):
+    ws = wb.add_worksheet(nome)
+    for i, w in enumerate(larguras):
+        ws.set_column(i, i, w)
+    ws.freeze_panes(1, 0)
+    ws.write_row(0, 0, colunas)
+    return ws
+
+def _gravar_linhas(ws, linhas: Iterable, colunas: list[str] | None = None) -> int:
+    """Grava ``linhas`` (dicts, se ``colunas`` for dado; tuplas, caso contrário) a partir da linha 2."""
+    r = 0
+    for r, linha in enumerate(linhas, start=1):
+        ws.write_row(r, 0, [linha.get(c, "") for c in colunas] if colunas else linha)
+    return r
+
+def gravar_excel_streaming(destino: str,
+                           rows_resumo: Iterable[dict],
+                           rows_marcos_gerais: Iterable[dict] = (),
+                           rows_marcos_subj: Iterable[dict] = (),
+                           parametros: dict | None = None,
+                           por_gestor_details: dict | None = None,
+                           colunas_resumo: list[str] = COLUNAS_RESUMO,
+                           limiar_abas_gestor: int = LIMIAR_ABAS_GESTOR) -> int:
+    """Grava o .xlsx em ``destino`` consumindo os iteráveis uma única vez, linha a linha.
+
+    Mesmas abas e formatação de ``make_excel_bytes_expanded`` (requer xlsxwriter).
+    ``colunas_resumo`` permite colunas extras (p.ex. ``processo`` no modo lote, à
+    esquerda). Retorna o número de linhas gravadas no Resumo.
+    """
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(destino, {"constant_memory": True})
+    try:
+        larguras = dict(zip(COLUNAS_RESUMO, LARGURAS_RESUMO))
+        ws_resumo = _aba_streaming(wb, "Resumo", colunas_resumo, [larguras.get(c, 18) for c in colunas_resumo])
+        ws_g = _aba_streaming(wb, "Marcos_Gerais", ["marco_geral_data"], [18])
+        ws_s = _aba_streaming(wb, "Marcos_Subjetivos", ["gestor", "chamamento_data"], [26, 18])
+        ws_p = _aba_streaming(wb, "Parametros_do_Caso", ["parametro", "valor"], [36, 60])
+        ws_d = _aba_streaming(wb, "Dicionario", ["coluna", "descrição"], [30, 90])
+
+        total = _gravar_linhas(ws_resumo, rows_resumo, colunas_resumo)
+        if total:
+            red_fmt = wb.add_format({"font_color": "#D93025"})
+            green_fmt = wb.add_format({"font_color": "#1E8E3E"})
+            blue_fmt = wb.add_format({"font_color": "#1A73E8"})
+            col = colunas_resumo.index("situacao")
+            faixa = (1, col, total, col)
+            ws_resumo.conditional_format(*faixa, {"type": "text", "criteria": "containing", "value": "Prescrição consumada", "format": red_fmt})
+            ws_resumo.conditional_format(*faixa, {"type": "text", "criteria": "containing", "value": "intercorrente", "format": red_fmt})
+            ws_resumo.conditional_format(*faixa, {"type": "text", "criteria": "containing", "value": "Não prescrito", "format": green_fmt})
+            ws_resumo.conditional_format(*faixa, {"type": "no_blanks", "format": blue_fmt})
+
+        _gravar_linhas(ws_g, rows_marcos_gerais, ["marco_geral_data"])
+        _gravar_linhas(ws_s, rows_marcos_subj, ["gestor", "chamamento_data"])
+        _gravar_linhas(ws_p, (parametros or {}).items())
+        _gravar_linhas(ws_d, DICIONARIO)
+
+        por_gestor_details = por_gestor_details or {}
+        if len(por_gestor_details) > limiar_abas_gestor:
+            ws_l = _aba_streaming(wb, "Detalhes_Gestores", ["gestor", "campo", "valor"], [26, 34, 70])
+            n = _gravar_linhas(ws_l, _linhas_longas(por_gestor_details))
+            ws_l.autofilter(0, 0, n, 2)
+        else:
+            nomes = nomes_abas_gestores(por_gestor_details)
+            for g, detail in por_gestor_details.items():
+                ws_x = _aba_streaming(wb, nomes[g], ["campo", "valor"], [34, 70])
+                _gravar_linhas(ws_x, detail["linhas"], ["campo", "valor"])
+    finally:
+        wb.close()
+    return total
+
+# --------------------------------------------------------------------------------------
+# Impressão digital do caso + cache dos bytes
+# --------------------------------------------------------------------------------------
+_CACHE_MAX = 32
+_CACHE_XLSX: "OrderedDict[str, bytes]" = OrderedDict()
+
+def fingerprint_caso(parametros: dict,
+                     marcos_gerais: list[date],
+                     marcos_subj: dict[str, list[date]],
+                     gestores: list[str],
+                     hoje: date | None = None) -> str:
+    """SHA-256 de uma serialização canônica das entradas do caso.
+
+    Datas de marcos são ordenadas e deduplicadas (a ordem de digitação não altera o
+    resultado); a ordem dos gestores é mantida (define a ordem das linhas). ``hoje``
+    entra na chave porque a situação depende da data de referência.
+    """
+    canon = {
+        "parametros": sorted((str(k), str(v)) for k, v in parametros.items()),
+        "marcos_gerais": sorted({d.isoformat() for d in marcos_gerais}),
+        "gestores": [
+            [g, sorted({d.isoformat() for d in marcos_subj.get(g, [])})] for g in gestores
+        ],
+        "hoje": (hoje or date.today()).isoformat(),
+    }
+    blob = json.dumps(canon, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+def excel_cacheado(chave: str, gerar: Callable[[], bytes]) -> bytes:
+    """Devolve os bytes do cache para ``chave`` (memória, depois disco) ou chama ``gerar()`` e guarda o resultado."""
+    dados = _CACHE_XLSX.get(chave)
+    if dados is not None:
+        _CACHE_XLSX.move_to_end(chave)
+        return dados
+    disco = cache_padrao()
+    dados = disco.obter(chave, "xlsx") if disco else None
+    if dados is None:
+        dados = gerar()
+        if disco:
+            disco.gravar(chave, "xlsx", dados)
+    _CACHE_XLSX[chave] = dados
+    while len(_CACHE_XLSX) > _CACHE_MAX:
+        _CACHE_XLSX.popitem(last=False)
+    return dados
@@ -0,0 +1,139 @@
+# prescricao_horizonte.py
+"""Índice de vencimentos: "quais gestores prescrevem nos próximos N dias".
+
+``IndiceVencimentos`` ordena uma vez os ``prazo_final`` das linhas de resultado
+(layout da aba "Resumo", com ou sem ``processo``) e responde consultas por
+intervalo com busca binária: O(log n + k) para k linhas devolvidas. Há um
+sub-índice por enquadramento, de modo que "próximos 90 dias, só transição"
+também não varre a carteira.
+
+Uso (CLI):
+    python prescricao_horizonte.py resultados.csv --dias 90
+    python prescricao_horizonte.py carteira.sqlite3 --de 2026-01-01 --ate 2026-06-30 -e transicao
+"""
+import argparse
+import csv
+import heapq
+import sys
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from typing import Iterable
+
+from prescricao_motor import COLUNAS_RESUMO, ENQUADRAMENTOS
+
+# Apelidos de enquadramento aceitos na CLI (mesma ordem de ENQUADRAMENTOS)
+APELIDOS_ENQUADRAMENTO = dict(zip(["novo", "transicao", "pre_lei", "fora"], ENQUADRAMENTOS))
+
+class IndiceVencimentos:
+    """Linhas de resultado ordenadas por ``prazo_final`` (texto ISO), geral e por enquadramento.
+
+    Linhas sem ``prazo_final`` (p.ex. erro de entrada) ficam fora do índice.
+    """
+
+    def __init__(self, linhas: Iterable[dict]):
+        ordenadas = sorted(
+            (l for l in linhas if l.get("prazo_final")),
+            key=lambda l: str(l["prazo_final"])[:10],
+        )
+        self._prazos = [str(l["prazo_final"])[:10] for l in ordenadas]
+        self._linhas = ordenadas
+        self._por_enq: dict[str, tuple[list[str], list[dict]]] = {}
+        for prazo, linha in zip(self._prazos, ordenadas):  # já em ordem: cada sub-índice sai ordenado
+            prazos, itens = self._por_enq.setdefault(linha.get("enquadramento") or "", ([], []))
+            prazos.append(prazo)
+            itens.append(linha)
+
+    def __len__(self) -> int:
+        return len(self._linhas)
+
+    @staticmethod
+    def _fatia(prazos: list[str], itens: list[dict], de: str, ate: str) -> list[dict]:
+        return itens[bisect_left(prazos, de):bisect_right(prazos, ate)]
+
+    def consultar(self,
+                  de: date | None = None,
+                  ate: date | None = None,
+                  enquadramentos: Iterable[str] | None = None) -> list[dict]:
+        """Linhas com ``de <= prazo_final <= ate`` (limites inclusivos), em ordem de prazo."""
+        de_iso = de.isoformat() if de else ""
+        ate_iso = ate.isoformat() if ate else "9999-12-31"
+        if enquadramentos is None:
+            return self._fatia(self._prazos, self._linhas, de_iso, ate_iso)
+        fatias = [
+            self._fatia(*self._por_enq[e], de_iso, ate_iso)
+            for e in dict.fromkeys(enquadramentos) if e in self._por_enq
+        ]
+        if len(fatias) == 1:
+            return fatias[0]
+        return list(heapq.merge(*fatias, key=lambda l: str(l["prazo_final"])[:10]))
+
+    def proximos(self,
+                 dias: int,
+                 hoje: date | None = None,
+                 enquadramentos: Iterable[str] | None = None) -> list[dict]:
+        """Prescrevem de ``hoje`` (inclusive) até ``hoje + dias``."""
+        hoje = hoje or date.today()
+        return self.consultar(hoje, hoje + timedelta(days=dias), enquadramentos)
+
+# --------------------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------------------
+def _resolver_enquadramento(valor: str) -> str:
+    if valor in ENQUADRAMENTOS:
+        return valor
+    try:
+        return APELIDOS_ENQUADRAMENTO[valor.strip().lower()]
+    except KeyError:
+        raise argparse.ArgumentTypeError(
+            f"enquadramento desconhecido: {valor} (use {', '.join(APELIDOS_ENQUADRAMENTO)})"
+        ) from None
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Lista os gestores cuja data-alvo de prescrição cai num intervalo (triagem de vencimentos).",
+    )
+    parser.add_argument("origem", help="Resultados do modo lote (.csv/.xlsx) ou base local (.sqlite3/.sqlite/.db).")
+    parser.add_argument("--dias", type=int, default=None, help="Próximos N dias a partir de hoje (padrão: 90 se não houver --de/--ate).")
+    parser.add_argument("--de", type=date.fromisoformat, default=None, help="Início do intervalo (AAAA-MM-DD).")
+    parser.add_argument("--ate", type=date.fromisoformat, default=None, help="Fim do intervalo (AAAA-MM-DD).")
+    parser.add_argument("-e", "--enquadramento", action="append", type=_resolver_enquadramento,
+                        help="Filtra por enquadramento (repetível): " + ", ".join(APELIDOS_ENQUADRAMENTO) + ".")
+    parser.add_argument("-o", "--saida", default=None, help="CSV de saída (padrão: stdout).")
+    args = parser.parse_args(argv)
+
+    de, ate = args.de, args.ate
+    if args.dias is not None or (de is None and ate is None):
+        de = date.today()
+        ate = de + timedelta(days=90 if args.dias is None else args.dias)
+
+    if args.origem.lower().endswith((".sqlite", ".sqlite3", ".db")):
+        # A base já tem índice B-tree em prazo_final/enquadramento: consulta direta
+        from prescricao_banco import conectar, consultar_resultados
+
+        con = conectar(args.origem)
+        try:
+            linhas = []
+            for enq in args.enquadramento or [None]:
+                linhas += consultar_resultados(con, enquadramento=enq, prazo_de=de, prazo_ate=ate, limite=None)
+            linhas.sort(key=lambda l: l["prazo_final"])
+        finally:
+            con.close()
+    else:
+        from prescricao_lote import ler_casos
+
+        linhas = IndiceVencimentos(ler_casos(args.origem)).consultar(de, ate, args.enquadramento)
+
+    colunas = ["processo"] + COLUNAS_RESUMO
+    f = open(args.saida, "w", newline="", encoding="utf-8-sig") if args.saida else sys.stdout
+    try:
+        escritor = csv.DictWriter(f, fieldnames=colunas, extrasaction="ignore")
+        escritor.writeheader()
+        escritor.writerows(linhas)
+    finally:
+        if args.saida:
+            f.close()
+    print(f"{len(linhas)} linha(s) com prazo entre {de or '—'} e {ate or '—'}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
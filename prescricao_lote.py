@@ -0,0 +1,493 @@
+# prescricao_lote.py
+"""Modo lote (sem Streamlit): calcula a prescrição de uma carteira de casos a partir de CSV/XLSX.
+
+Cada linha do arquivo de entrada corresponde a um par caso/gestor. Os resultados
+são gravados no mesmo layout da aba "Resumo" da exportação do app, precedidos
+da coluna ``processo``.
+
+Uso:
+    python prescricao_lote.py casos.csv -o resultados.csv
+    python prescricao_lote.py casos.xlsx -o resultados.xlsx -j 8
+    python prescricao_lote.py casos.csv -o carteira.sqlite3      # upsert na base local
+    python prescricao_lote.py casos.csv --data-referencia 2026-07-18 -o em_18_07_2026.csv
+    python prescricao_lote.py casos.csv --linha-do-tempo 2026-01 60 -o linha_do_tempo.csv
+    python prescricao_lote.py casos.csv --janela-marco -o prazos_para_marco.csv
+    python prescricao_lote.py casos.csv --movimentos movimentos.csv -o resultados.csv
+    python prescricao_lote.py casos.csv --conjunto-regras regras_2025.json -o resultados.csv
+"""
+import argparse
+import csv
+import io
+import os
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from prescricao_motor import (
+    COLUNAS_RESUMO,
+    ENQUADRAMENTOS,
+    calcular_por_gestor,
+    janela_proximo_marco,
+    limite_intercorrente,
+    linha_resumo,
+    sugerir_enquadramento,
+)
+from prescricao_regras import TERMO_CIENCIA, TabelaDecisao, carregar_conjunto, compilar, tabela_padrao
+
+# Colunas aceitas na entrada (cabeçalho; maiúsculas/espaços são normalizados)
+COLUNAS_ENTRADA = [
+    ("processo", "Identificação do processo/caso."),
+    ("gestor", "Nome do gestor (uma linha por gestor)."),
+    ("natureza", "Punitiva / Ressarcitória (analogia)."),
+    ("conduta", "Instantânea / Continuada."),
+    ("fato_cessacao", "Data do fato/cessação (ou base motivada na ressarcitória)."),
+    ("ciencia", "Data de ciência pelo TCE-RJ (em regra, a autuação)."),
+    ("transitou_pre_lc", "Sim/Não — decisão adm. transitada antes de 18/07/2024."),
+    ("enquadramento", "Opcional; vazio = enquadramento sugerido pela chave intertemporal."),
+    ("marcos_gerais", "Datas dos marcos gerais, separadas por ';'."),
+    ("chamamentos", "Datas dos chamamentos qualificados do gestor, separadas por ';'."),
+    ("aplicar_prazo_penal", "Sim/Não."),
+    ("prazo_penal_anos", "Prazo penal em anos (se aplicável)."),
+    ("check_intercorrente", "Sim/Não."),
+    ("intercorrente_ultimo_ato", "Data do último ato útil."),
+    ("intercorrente_ato_subseq", "Data do ato subsequente (vazio = hoje)."),
+]
+
+_ALIASES = {
+    "data_ciencia": "ciencia",
+    "data_fato": "fato_cessacao",
+    "termo_inicial_fato": "fato_cessacao",
+    "marcos": "marcos_gerais",
+    "chamamentos_qualificados": "chamamentos",
+    "intercorrente_ato_subseq_ou_hoje": "intercorrente_ato_subseq",
+}
+
+_SIM = {"sim", "s", "1", "true", "x", "yes"}
+
+# Colunas extras da saída com --janela-marco (ver prescricao_motor.janela_proximo_marco)
+COLUNAS_JANELA_MARCO = ["marco_janela_inicio", "marco_ultimo_dia", "prazo_com_marco"]
+
+# --------------------------------------------------------------------------------------
+# Conversões de entrada
+# --------------------------------------------------------------------------------------
+def _normalizar_coluna(nome) -> str:
+    chave = re.sub(r"\s+", "_", str(nome or "").strip().lower())
+    return _ALIASES.get(chave, chave)
+
+@lru_cache(maxsize=65536)
+def _parse_data_str(valor: str) -> date | None:
+    valor = valor.strip()
+    if not valor:
+        return None
+    if "/" in valor:
+        return datetime.strptime(valor, "%d/%m/%Y").date()
+    return date.fromisoformat(valor[:10])
+
+def _parse_data(valor) -> date | None:
+    """Aceita ``date``/``datetime`` (XLSX), AAAA-MM-DD ou DD/MM/AAAA."""
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return _parse_data_str(str(valor))
+
+@lru_cache(maxsize=65536)
+def _parse_lista_datas(valor: str) -> tuple[date, ...]:
+    partes = [p for p in re.split(r"[;,|\s]+", valor) if p]
+    return tuple(_parse_data_str(p) for p in partes)
+
+def _datas(valor) -> list[date]:
+    if valor is None:
+        return []
+    if isinstance(valor, (date, datetime)):
+        return [_parse_data(valor)]
+    return list(_parse_lista_datas(str(valor)))
+
+def _sim_nao(valor) -> str:
+    return "Sim" if str(valor or "").strip().lower() in _SIM else "Não"
+
+# --------------------------------------------------------------------------------------
+# Tabela de marcos (gestor, tipo, data) — grade de entrada do app
+# --------------------------------------------------------------------------------------
+TIPO_MARCO_GERAL = "Marco geral"
+TIPO_CHAMAMENTO = "Chamamento"
+TIPOS_MARCO = [TIPO_MARCO_GERAL, TIPO_CHAMAMENTO]
+
+_TIPOS_ALIASES = {
+    "marco geral": TIPO_MARCO_GERAL, "geral": TIPO_MARCO_GERAL, "objetivo": TIPO_MARCO_GERAL, "g": TIPO_MARCO_GERAL,
+    "chamamento": TIPO_CHAMAMENTO, "chamamento qualificado": TIPO_CHAMAMENTO,
+    "subjetivo": TIPO_CHAMAMENTO, "c": TIPO_CHAMAMENTO,
+}
+
+def separar_marcos(linhas: Iterable[dict], gestores: Iterable[str] = ()) -> tuple[list[date], dict[str, list[date]], list[str]]:
+    """Separa as linhas da tabela de marcos em marcos gerais e chamamentos por gestor, numa só passada.
+
+    Cada linha tem ``gestor``, ``tipo`` e ``data`` (``date`` ou texto AAAA-MM-DD/DD/MM/AAAA,
+    como vem de uma colagem de planilha). Tipo vazio: marco geral se não houver gestor,
+    chamamento se houver. Linhas totalmente vazias são ignoradas.
+
+    Retorna ``(marcos_gerais, chamamentos_por_gestor, erros)``; as datas saem ordenadas e sem
+    repetição, e todo gestor de ``gestores`` aparece no dicionário (lista vazia se não tiver chamamento).
+    """
+    gerais: set[date] = set()
+    por_gestor: dict[str, set[date]] = {g: set() for g in gestores}
+    erros: list[str] = []
+    for n, linha in enumerate(linhas, start=1):
+        gestor = str(linha.get("gestor") or "").strip()
+        tipo_txt = str(linha.get("tipo") or "").strip()
+        valor = linha.get("data")
+        if valor != valor:  # NaN/NaT vindos do DataFrame do editor
+            valor = None
+        if not gestor and not tipo_txt and valor in (None, ""):
+            continue
+        try:
+            d = _parse_data(valor)
+        except ValueError:
+            erros.append(f"Linha {n}: data inválida ({valor}).")
+            continue
+        if d is None:
+            erros.append(f"Linha {n}: data ausente.")
+            continue
+        tipo = _TIPOS_ALIASES.get(tipo_txt.lower()) if tipo_txt else (TIPO_CHAMAMENTO if gestor else TIPO_MARCO_GERAL)
+        if tipo is None:
+            erros.append(f"Linha {n}: tipo desconhecido ({tipo_txt}).")
+        elif tipo == TIPO_MARCO_GERAL:
+            gerais.add(d)
+        elif not gestor:
+            erros.append(f"Linha {n}: chamamento sem gestor.")
+        else:
+            por_gestor.setdefault(gestor, set()).add(d)
+    return sorted(gerais), {g: sorted(ds) for g, ds in por_gestor.items()}, erros
+
+# --------------------------------------------------------------------------------------
+# Leitura
+# --------------------------------------------------------------------------------------
+def _ler_csv_texto(f) -> Iterator[dict]:
+    amostra = f.read(4096)
+    f.seek(0)
+    try:
+        dialeto = csv.Sniffer().sniff(amostra, delimiters=",;\t")
+    except csv.Error:
+        dialeto = csv.excel
+    leitor = csv.reader(f, dialeto)
+    cabecalho = [_normalizar_coluna(c) for c in next(leitor, [])]
+    for valores in leitor:
+        if any(v.strip() for v in valores):
+            yield dict(zip(cabecalho, valores))
+
+def _ler_csv(origem) -> Iterator[dict]:
+    if hasattr(origem, "read"):
+        yield from _ler_csv_texto(io.TextIOWrapper(origem, encoding="utf-8-sig", newline=""))
+        return
+    with open(origem, newline="", encoding="utf-8-sig") as f:
+        yield from _ler_csv_texto(f)
+
+def _ler_xlsx(origem) -> Iterator[dict]:
+    from openpyxl import load_workbook
+
+    wb = load_workbook(origem, read_only=True, data_only=True)
+    try:
+        linhas = wb.worksheets[0].iter_rows(values_only=True)
+        cabecalho = [_normalizar_coluna(c) for c in next(linhas, ())]
+        for valores in linhas:
+            if any(v not in (None, "") for v in valores):
+                yield dict(zip(cabecalho, valores))
+    finally:
+        wb.close()
+
+def ler_casos(origem, nome: str | None = None) -> Iterator[dict]:
+    """Lê o arquivo de casos (CSV ou XLSX) linha a linha, com colunas normalizadas.
+
+    ``origem`` pode ser um caminho ou um arquivo binário aberto (p.ex. upload do
+    Streamlit); neste caso, ``nome`` define o formato pela extensão.
+    """
+    nome = nome or str(origem)
+    if nome.lower().endswith((".xlsx", ".xlsm")):
+        return _ler_xlsx(origem)
+    return _ler_csv(origem)
+
+# --------------------------------------------------------------------------------------
+# Cálculo
+# --------------------------------------------------------------------------------------
+def calcular_linha(linha: dict, data_referencia: date | None = None, regras: TabelaDecisao | None = None) -> dict:
+    """Aplica enquadramento + ``calcular_por_gestor`` a uma linha caso/gestor, avaliada em ``data_referencia`` (padrão: hoje)
+    sob a tabela de decisão ``regras`` (padrão: ``tabela_padrao()``)."""
+    regras = regras or tabela_padrao()
+    gestor = str(linha.get("gestor") or "").strip()
+    fato = _parse_data(linha.get("fato_cessacao"))
+    ciencia = _parse_data(linha.get("ciencia"))
+    if not isinstance(fato, date):
+        raise ValueError("fato_cessacao ausente")
+    global_marcos = _datas(linha.get("marcos_gerais"))
+    subj_marcos = _datas(linha.get("chamamentos"))
+
+    enquadramento = str(linha.get("enquadramento") or "").strip()
+    if not enquadramento:
+        enquadramento = sugerir_enquadramento(_sim_nao(linha.get("transitou_pre_lc")), fato, ciencia, global_marcos, regras)
+    elif enquadramento not in ENQUADRAMENTOS:
+        raise ValueError(f"enquadramento desconhecido: {enquadramento!r}")
+    if ciencia is None and regras.termo_origem[regras.codificar(enquadramento)] == TERMO_CIENCIA:
+        raise ValueError("ciencia ausente")
+
+    aplicar_prazo_penal = _sim_nao(linha.get("aplicar_prazo_penal"))
+    prazo_penal_anos = int(float(linha["prazo_penal_anos"])) if linha.get("prazo_penal_anos") not in (None, "") else None
+
+    check_intercorrente = _sim_nao(linha.get("check_intercorrente")) == "Sim"
+    data_ultimo_ato = _parse_data(linha.get("intercorrente_ultimo_ato")) if check_intercorrente else None
+    idata_subseq = None
+    ato_subseq_aberto = False
+    if check_intercorrente:
+        idata_subseq = _parse_data(linha.get("intercorrente_ato_subseq"))
+        ato_subseq_aberto = idata_subseq is None
+        idata_subseq = idata_subseq or data_referencia or date.today()
+
+    res = calcular_por_gestor(
+        nome_gestor=gestor,
+        enquadramento=enquadramento,
+        termo_inicial_fato=fato,
+        data_ciencia=ciencia,
+        global_marcos=global_marcos,
+        subj_marcos=subj_marcos,
+        aplicar_prazo_penal=aplicar_prazo_penal,
+        prazo_penal_anos=prazo_penal_anos,
+        check_intercorrente=check_intercorrente,
+        data_ultimo_ato=data_ultimo_ato,
+        idata_subseq=idata_subseq,
+        natureza=str(linha.get("natureza") or ""),
+        conduta=str(linha.get("conduta") or ""),
+        data_referencia=data_referencia,
+        regras=regras,
+    )
+    saida = linha_resumo(gestor, enquadramento, res, ciencia, fato)
+    # Fora do Resumo: usado pela base local para a reavaliação diária (prescricao_reavaliacao)
+    limite = limite_intercorrente(enquadramento, check_intercorrente, data_ultimo_ato, ato_subseq_aberto, regras)
+    saida["limite_intercorrente"] = limite.isoformat() if limite else ""
+    # Solução reversa (forma fechada): colunas opcionais da saída (--janela-marco)
+    janela = janela_proximo_marco(res, enquadramento, aplicar_prazo_penal, prazo_penal_anos, data_referencia, regras)
+    for coluna, valor in zip(COLUNAS_JANELA_MARCO, (janela.inicio, janela.ultimo_dia, janela.prazo_com_marco)):
+        saida[coluna] = valor.isoformat() if valor else ""
+    return saida
+
+# Situação das linhas que não puderam ser calculadas ("Erro na linha N: motivo")
+PREFIXO_ERRO = "Erro na linha"
+
+def processar_lote(linhas: Iterable[dict],
+                   primeira_linha: int = 2,
+                   data_referencia: date | None = None,
+                   regras: TabelaDecisao | None = None) -> Iterator[dict]:
+    """Gera uma linha de resultado por linha de entrada (erros de entrada são reportados em ``situacao``).
+
+    ``primeira_linha`` é o número da linha do arquivo correspondente ao primeiro item (2 = logo após o cabeçalho).
+    """
+    for n, linha in enumerate(linhas, start=primeira_linha):
+        processo = str(linha.get("processo") or "").strip()
+        try:
+            saida = calcular_linha(linha, data_referencia, regras)
+        except (ValueError, TypeError) as exc:
+            saida = dict.fromkeys(COLUNAS_RESUMO, "")
+            saida["gestor"] = str(linha.get("gestor") or "").strip()
+            saida["situacao"] = f"{PREFIXO_ERRO} {n}: {exc}"
+        yield {"processo": processo, **saida}
+
+def _processar_bloco(bloco: tuple[int, list[dict]],
+                     data_referencia: date | None = None,
+                     regras: TabelaDecisao | None = None) -> list[dict]:
+    primeira_linha, linhas = bloco
+    return list(processar_lote(linhas, primeira_linha, data_referencia, regras))
+
+def _blocos(linhas: Iterable[dict], tamanho: int) -> Iterator[tuple[int, list[dict]]]:
+    it = iter(linhas)
+    primeira_linha = 2
+    while bloco := list(islice(it, tamanho)):
+        yield primeira_linha, bloco
+        primeira_linha += len(bloco)
+
+def processar_carteira(linhas: Iterable[dict],
+                       workers: int | None = None,
+                       tamanho_bloco: int = 5000,
+                       progresso: Callable[[int], None] | None = None,
+                       data_referencia: date | None = None,
+                       regras: TabelaDecisao | None = None) -> Iterator[dict]:
+    """Processa a carteira em blocos distribuídos num ``ProcessPoolExecutor``.
+
+    Os resultados saem na ordem da entrada, qualquer que seja o número de
+    ``workers`` (padrão: ``os.cpu_count()``; 1 = no próprio processo). A leitura
+    continua em streaming: no máximo ``2 * workers`` blocos ficam em trânsito.
+    ``progresso`` recebe o total de linhas já processadas após cada bloco.
+    ``data_referencia``: data "as-of" da situação (padrão: hoje). ``regras``: tabela de
+    decisão (padrão: ``tabela_padrao()``), enviada a cada processo junto com o bloco.
+    """
+    workers = workers or os.cpu_count() or 1
+    feitas = 0
+    if workers <= 1:
+        for bloco in _blocos(linhas, tamanho_bloco):
+            yield from _processar_bloco(bloco, data_referencia, regras)
+            feitas += len(bloco[1])
+            if progresso:
+                progresso(feitas)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pendentes = deque()
+        blocos = _blocos(linhas, tamanho_bloco)
+        for bloco in islice(blocos, 2 * workers):
+            pendentes.append(pool.submit(_processar_bloco, bloco, data_referencia, regras))
+        while pendentes:
+            resultado = pendentes.popleft().result()
+            proximo = next(blocos, None)
+            if proximo is not None:
+                pendentes.append(pool.submit(_processar_bloco, proximo, data_referencia, regras))
+            yield from resultado
+            feitas += len(resultado)
+            if progresso:
+                progresso(feitas)
+
+# --------------------------------------------------------------------------------------
+# Gravação
+# --------------------------------------------------------------------------------------
+# Saídas gravadas na base local (upsert): a situação gravada é a de hoje (ver ``main``)
+EXTENSOES_BANCO = (".sqlite", ".sqlite3", ".db")
+
+def gravar_resultados(caminho: str,
+                      linhas: Iterable[dict],
+                      colunas_extras: Iterable[str] = (),
+                      erros: list[dict] | None = None) -> int:
+    """Grava os resultados em CSV, XLSX (aba "Resumo" + abas auxiliares) ou base SQLite
+    (``.sqlite``/``.sqlite3``/``.db``, upsert por processo/gestor), em streaming.
+
+    ``colunas_extras`` são acrescentadas após as do Resumo (CSV/XLSX). Retorna o número de linhas.
+    Na base, linhas com erro de entrada não são gravadas: vão para ``erros`` (se informada).
+    """
+    colunas = ["processo"] + COLUNAS_RESUMO + list(colunas_extras)
+    if caminho.lower().endswith(EXTENSOES_BANCO):
+        from prescricao_banco import conectar, salvar_resultados_lote
+
+        con = conectar(caminho)
+        try:
+            return salvar_resultados_lote(con, linhas, erros=erros)
+        finally:
+            con.close()
+    if caminho.lower().endswith(".xlsx"):
+        from prescricao_exportacao import gravar_excel_streaming
+
+        return gravar_excel_streaming(caminho, linhas, colunas_resumo=colunas)
+
+    total = 0
+    with open(caminho, "w", newline="", encoding="utf-8-sig") as f:
+        escritor = csv.DictWriter(f, fieldnames=colunas, extrasaction="ignore")
+        escritor.writeheader()
+        for linha in linhas:
+            escritor.writerow(linha)
+            total += 1
+    return total
+
+# --------------------------------------------------------------------------------------
+# Linha do tempo da carteira (várias datas de referência)
+# --------------------------------------------------------------------------------------
+def linha_do_tempo_resultados(linhas: Iterable[dict], inicio: date, meses: int) -> list[dict]:
+    """Situação da carteira no fim de cada mês e vencimentos por mês, numa passada vetorizada.
+
+    Usa as linhas de resultado já calculadas (``prazo_final``, ``enquadramento``,
+    ``situacao``, ``limite_intercorrente``): a data-alvo não depende da data de
+    referência, então não há recálculo por mês. Linhas com erro de entrada são ignoradas.
+    """
+    import numpy as np
+
+    from prescricao_vetorial import (
+        SIT_INTERCORRENTE,
+        SITUACOES,
+        codificar_enquadramentos,
+        contagem_linha_do_tempo,
+        datas_fim_de_mes,
+        histograma_mensal,
+    )
+
+    validas = [l for l in linhas if l.get("enquadramento") in ENQUADRAMENTOS and l.get("prazo_final")]
+    prazo = np.array([str(l["prazo_final"])[:10] for l in validas], dtype="datetime64[D]")
+    limite = np.array([str(l.get("limite_intercorrente") or "NaT")[:10] for l in validas], dtype="datetime64[D]")
+    fixo = np.array([l.get("situacao") == SITUACOES[SIT_INTERCORRENTE] and not l.get("limite_intercorrente")
+                     for l in validas], dtype=bool)
+    refs = datas_fim_de_mes(inicio, meses)
+    contagem = contagem_linha_do_tempo(prazo, refs, codificar_enquadramentos(l["enquadramento"] for l in validas), limite, fixo)
+    vencimentos = histograma_mensal(prazo, inicio, meses)
+    return [
+        {
+            "mes": str(ref.astype("datetime64[M]")),
+            "data_referencia": str(ref),
+            **{sit: int(contagem[j, k]) for k, sit in enumerate(SITUACOES)},
+            "vencimentos_no_mes": int(vencimentos[j]),
+        }
+        for j, ref in enumerate(refs)
+    ]
+
+# --------------------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------------------
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Calcula a prescrição (LC-RJ 63/1990, art. 5º-A) para uma carteira de casos.",
+        epilog="Colunas de entrada: " + ", ".join(c for c, _ in COLUNAS_ENTRADA),
+    )
+    parser.add_argument("entrada", help="Arquivo de casos (.csv ou .xlsx), uma linha por caso/gestor.")
+    parser.add_argument("-o", "--saida", default="prescricao_resultados_lote.csv",
+                        help="Arquivo de saída (.csv, .xlsx ou base .sqlite3). Padrão: %(default)s")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Processos em paralelo (padrão: número de CPUs; 1 = sem paralelismo).")
+    parser.add_argument("--tamanho-bloco", type=int, default=5000,
+                        help="Linhas por bloco enviado a cada processo. Padrão: %(default)s")
+    parser.add_argument("--data-referencia", type=date.fromisoformat, default=None,
+                        help="Data \"as-of\" da situação (AAAA-MM-DD). Padrão: hoje.")
+    parser.add_argument("--conjunto-regras", default=None, metavar="JSON",
+                        help="Conjunto de regras versionado (datas de corte e prazos). Padrão: PRESCRICAO_REGRAS ou o embutido.")
+    parser.add_argument("--janela-marco", action="store_true",
+                        help="Acrescenta o início e o último dia da janela para o próximo marco evitar a prescrição.")
+    parser.add_argument("--movimentos", default=None, metavar="HISTORICO",
+                        help="Histórico de movimentações (agrupado por processo): preenche a intercorrente (primeira "
+                             "paralisação de 3 anos) e os marcos vazios na entrada.")
+    parser.add_argument("--regras", default=None,
+                        help="Tabela de regras de classificação das movimentações (.csv/.xlsx com padrao, classe).")
+    parser.add_argument("--linha-do-tempo", nargs=2, metavar=("AAAA-MM", "MESES"), default=None,
+                        help="Em vez dos resultados, grava a situação da carteira no fim de cada mês e os vencimentos por mês.")
+    args = parser.parse_args(argv)
+    if (args.saida.lower().endswith(EXTENSOES_BANCO) and not args.linha_do_tempo
+            and args.data_referencia not in (None, date.today())):
+        # A reavaliação diária só avança a situação no tempo: uma situação projetada nunca seria corrigida
+        parser.error("a base local guarda a situação de hoje; use --data-referencia só com saída CSV/XLSX")
+
+    regras_calculo = compilar(carregar_conjunto(args.conjunto_regras)) if args.conjunto_regras else tabela_padrao()
+    casos = ler_casos(args.entrada)
+    if args.movimentos:
+        from prescricao_movimentos import TabelaRegras, carregar_regras, completar_casos, ler_historico
+
+        # Uma entrada por processo (paralisações + marcos): o histórico em si é lido em streaming
+        regras = carregar_regras(args.regras) if args.regras else TabelaRegras()
+        historico = {v.processo: (v, m) for v, m in ler_historico(ler_casos(args.movimentos), args.data_referencia, regras,
+                                                                  dias_minimos=regras_calculo.conjunto.dias_intercorrente)}
+        casos = completar_casos(casos, historico)
+    linhas = processar_carteira(casos, workers=args.workers, tamanho_bloco=args.tamanho_bloco,
+                                data_referencia=args.data_referencia, regras=regras_calculo)
+    if args.linha_do_tempo:
+        inicio = date.fromisoformat(args.linha_do_tempo[0][:7] + "-01")
+        meses_saida = linha_do_tempo_resultados(linhas, inicio, int(args.linha_do_tempo[1]))
+        with open(args.saida, "w", newline="", encoding="utf-8-sig") as f:
+            escritor = csv.DictWriter(f, fieldnames=list(meses_saida[0]) if meses_saida else ["mes"])
+            escritor.writeheader()
+            escritor.writerows(meses_saida)
+        print(f"{len(meses_saida)} mês(es) gravado(s) em {args.saida}", file=sys.stderr)
+        return 0
+    erros: list[dict] = []
+    total = gravar_resultados(args.saida, linhas, COLUNAS_JANELA_MARCO if args.janela_marco else (), erros)
+    for e in erros:
+        print(f"{e['processo']} / {e['gestor']}: {e['situacao']} (não gravada)", file=sys.stderr)
+    print(f"{total} linha(s) gravada(s) em {args.saida}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+# prescricao_motor.py
+"""Motor de cálculo da prescrição (LC-RJ 63/1990, art. 5º-A) sem dependência do Streamlit.
+
+Reúne o teste pré-lei, o cálculo do prazo com interrupções, a sugestão de
+enquadramento intertemporal e o cálculo por gestor, para uso tanto pela
+página Streamlit quanto pelo modo lote (``prescricao_lote.py``).
+
+O módulo não tem efeitos colaterais na importação e não importa Streamlit
+nem pandas: todas as entradas são explícitas e o resultado por gestor é um
+``ResultadoGestor``. Datas de corte e prazos vêm da tabela de decisão
+compilada (``prescricao_regras``); ``regras=None`` usa o conjunto padrão.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+
+from prescricao_datas import somar_anos
+from prescricao_regras import (
+    ENQ_FORA,
+    ENQ_NOVO,
+    ENQ_PRE_LEI,
+    ENQ_TRANSICAO,
+    ENQUADRAMENTOS,
+    REGRAS_LC220_24,
+    TERMO_FATO,
+    TERMO_MARCO_LEI,
+    TabelaDecisao,
+    tabela_padrao,
+)
+
+# Paralisação que caracteriza a intercorrente (§ 1º), no conjunto de regras de referência
+DIAS_INTERCORRENTE = REGRAS_LC220_24.dias_intercorrente
+
+# --------------------------------------------------------------------------------------
+# Resultado por gestor
+# --------------------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class ResultadoGestor:
+    """Resultado de ``calcular_por_gestor`` para um gestor."""
+    sit: str
+    detalhe: str
+    natureza: str
+    conduta: str
+    termo_inicial: date | None
+    termo_inicial_label: str
+    base: str
+    prazo_final: date | None
+    interrupcoes: list[date] = field(default_factory=list)
+
+# --------------------------------------------------------------------------------------
+# Teste pré-lei e deadline
+# --------------------------------------------------------------------------------------
+def _prelaw_consumou_ate_cutoff(ciencia: date, marcos: list[date], regras: TabelaDecisao | None = None) -> bool:
+    """Verifica se o quinquênio do regime anterior (ciência) consumou até o marco da lei
+    (18/07/2024), considerando apenas marcos entre ciência e cutoff."""
+    t = regras or tabela_padrao()
+    cutoff = t.conjunto.marco_lei
+    if not isinstance(ciencia, date):
+        return False
+    ints_prev = sorted([d for d in marcos if isinstance(d, date) and ciencia <= d <= cutoff])
+    start = ciencia
+    for d in ints_prev:
+        if d >= start:
+            start = d
+    return somar_anos(start, t.conjunto.anos_regime_anterior) <= cutoff
+
+def compute_deadline(data_inicio: date, interrupcoes: list[date], base_anos: int) -> tuple[date, bool]:
+    """Retorna (data_final, houve_interrupcao_valida). Ignora marcos anteriores ao termo inicial."""
+    ints = sorted([d for d in interrupcoes if d and d >= data_inicio])
+    start = data_inicio
+    for d in ints:
+        if d >= start:
+            start = d  # reinicia a contagem a partir do marco
+    return somar_anos(start, base_anos), (len(ints) > 0)
+
+# --------------------------------------------------------------------------------------
+# Enquadramento intertemporal (sugestão)
+# --------------------------------------------------------------------------------------
+def sugerir_enquadramento(transitou_pre_lc: str,
+                          termo_inicial_fato: date,
+                          data_ciencia: date,
+                          global_marcos: list[date],
+                          regras: TabelaDecisao | None = None) -> str:
+    """Chave intertemporal consolidada: devolve um dos ``ENQUADRAMENTOS``."""
+    t = regras or tabela_padrao()
+    fatos_pre_2021 = (termo_inicial_fato < t.conjunto.marco_fatos)
+
+    if transitou_pre_lc == "Sim":
+        return ENQUADRAMENTOS[ENQ_FORA]
+    elif not fatos_pre_2021:
+        # Fatos ≥ 18/07/2021 → novo regime (5 anos do fato/cessação), independentemente da data de ciência/autuação
+        return ENQUADRAMENTOS[ENQ_NOVO]
+    # Fatos < 18/07/2021 → TESTE PRÉ-LEI: consumou até 18/07/2024 pelo quinquênio da ciência?
+    if _prelaw_consumou_ate_cutoff(data_ciencia, global_marcos, t):
+        return ENQUADRAMENTOS[ENQ_PRE_LEI]
+    # NÃO consumou → Transição bienal (18/07/2024 → 18/07/2026), mesmo que a ciência seja posterior.
+    return ENQUADRAMENTOS[ENQ_TRANSICAO]
+
+# --------------------------------------------------------------------------------------
+# Motor de cálculo por gestor
+# --------------------------------------------------------------------------------------
+def base_prazo(enquadramento: str,
+               aplicar_prazo_penal: str,
+               prazo_penal_anos: int | None,
+               regras: TabelaDecisao | None = None) -> tuple[int, str]:
+    """(anos, rótulo) do prazo aplicável: penal, se houver (exceto no regime anterior); senão o prazo do enquadramento."""
+    t = regras or tabela_padrao()
+    return _base_prazo(t, t.codificar(enquadramento), aplicar_prazo_penal, prazo_penal_anos)
+
+def _base_prazo(t: TabelaDecisao, codigo: int, aplicar_prazo_penal: str, prazo_penal_anos: int | None) -> tuple[int, str]:
+    if aplicar_prazo_penal == "Sim" and prazo_penal_anos and t.aceita_penal[codigo]:
+        return prazo_penal_anos, f"prazo penal ({prazo_penal_anos} anos)"
+    return t.base_anos[codigo], t.base_rotulo[codigo]
+
+def calcular_por_gestor(nome_gestor: str,
+                        enquadramento: str,
+                        termo_inicial_fato: date,
+                        data_ciencia: date,
+                        global_marcos: list[date],
+                        subj_marcos: list[date],
+                        aplicar_prazo_penal: str,
+                        prazo_penal_anos: int | None,
+                        check_intercorrente: bool,
+                        data_ultimo_ato: date | None,
+                        idata_subseq: date | None,
+                        natureza: str = "",
+                        conduta: str = "",
+                        data_referencia: date | None = None,
+                        regras: TabelaDecisao | None = None) -> ResultadoGestor:
+    """Situação e data-alvo de um gestor.
+
+    ``data_referencia`` é a data "as-of" em que a situação é avaliada (padrão: hoje).
+    ``idata_subseq`` já deve vir resolvido (a UI/lote usam a própria data de referência
+    quando o ato subsequente ainda não foi praticado). ``regras``: tabela de decisão
+    (padrão: ``prescricao_regras.tabela_padrao()``).
+    """
+    t = regras or tabela_padrao()
+    codigo = t.codificar(enquadramento)
+    marcos = [d for d in (global_marcos + subj_marcos) if isinstance(d, date)]
+
+    # Prescrição antes da lei — bloco exclusivo
+    if t.regime_anterior[codigo]:
+        cutoff = t.teto_marcos[codigo]
+        ciencia = data_ciencia if isinstance(data_ciencia, date) else None
+        ints_prev = [d for d in marcos if d <= cutoff and (ciencia is None or d >= ciencia)]
+
+        def _prelaw_date(ciencia, ints):
+            if not ciencia:
+                return None
+            ints_prev_sorted = sorted(ints)
+            start = ciencia
+            for d in ints_prev_sorted:
+                if d >= start:
+                    start = d
+            return somar_anos(start, t.base_anos[codigo])
+
+        data_prelaw = _prelaw_date(ciencia, ints_prev)
+        return ResultadoGestor(
+            sit="Prescrição reconhecida (regime anterior)",
+            detalhe=(f"Consumação em {data_prelaw.strftime('%d/%m/%Y')} (antes de {cutoff.strftime('%d/%m/%Y')})."
+                     if isinstance(data_prelaw, date) else
+                     f"Consumação integral antes de {cutoff.strftime('%d/%m/%Y')} (regime anterior)."),
+            natureza=natureza,
+            conduta=conduta,
+            termo_inicial=ciencia,
+            termo_inicial_label=t.termo_rotulo[codigo],
+            base=t.base_rotulo[codigo],
+            prazo_final=data_prelaw,
+            interrupcoes=sorted(ints_prev),
+        )
+
+    # Base de prazo
+    base_anos, base_label = _base_prazo(t, codigo, aplicar_prazo_penal, prazo_penal_anos)
+
+    # Termo inicial do cálculo por regime
+    origem = t.termo_origem[codigo]
+    if origem == TERMO_FATO:
+        termo_inicial_efetivo = termo_inicial_fato
+    elif origem == TERMO_MARCO_LEI:
+        termo_inicial_efetivo = t.conjunto.marco_lei
+    else:
+        termo_inicial_efetivo = data_ciencia
+    termo_inicial_label = t.termo_rotulo[codigo]
+
+    # Interrupções: só marcos a partir do termo inicial (compute_deadline ignora os anteriores)
+    prazo_final, has_valid_interruptions = compute_deadline(termo_inicial_efetivo, marcos, base_anos)
+
+    # Intercorrente
+    intercorrente = False
+    periodo_intercorrente = None
+    if check_intercorrente and data_ultimo_ato and idata_subseq:
+        dias = (idata_subseq - data_ultimo_ato).days
+        if dias >= t.conjunto.dias_intercorrente:
+            intercorrente = True
+            periodo_intercorrente = dias
+
+    hoje = data_referencia or date.today()
+    interrupcoes_consideradas = sorted([d for d in marcos if d >= termo_inicial_efetivo])
+
+    if intercorrente:
+        sit = "Prescrição intercorrente"
+        detalhe = f"{t.rotulo_paralisacao} ({periodo_intercorrente} dias)."
+    else:
+        if hoje >= prazo_final:
+            sit = "Prescrição consumada"
+            detalhe = f"Esgotado o prazo {base_label}: {prazo_final.strftime('%d/%m/%Y')}."
+        else:
+            sit = "Não prescrito"
+            detalhe = f"Data-alvo projetada ({base_label}): {prazo_final.strftime('%d/%m/%Y')}."
+
+    return ResultadoGestor(
+        sit=sit,
+        detalhe=detalhe,
+        natureza=natureza,
+        conduta=conduta,
+        termo_inicial=termo_inicial_efetivo,
+        termo_inicial_label=termo_inicial_label,
+        base=base_label,
+        prazo_final=prazo_final,
+        interrupcoes=interrupcoes_consideradas,
+    )
+
+def limite_intercorrente(enquadramento: str,
+                         check_intercorrente: bool,
+                         data_ultimo_ato: date | None,
+                         ato_subseq_aberto: bool,
+                         regras: TabelaDecisao | None = None) -> date | None:
+    """Data a partir da qual a situação vira "Prescrição intercorrente" só pela passagem do tempo.
+
+    Só existe quando o termo final da paralisação é "hoje" (ato subsequente ainda não
+    praticado); com ato subsequente informado, a intercorrente já está decidida.
+    """
+    t = regras or tabela_padrao()
+    if (not check_intercorrente or not ato_subseq_aberto or not isinstance(data_ultimo_ato, date)
+            or t.regime_anterior[t.codificar(enquadramento)]):
+        return None
+    return data_ultimo_ato + timedelta(days=t.conjunto.dias_intercorrente)
+
+# --------------------------------------------------------------------------------------
+# Solução reversa: até quando um novo marco ainda evita a prescrição
+# --------------------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class JanelaMarco:
+    """Janela para o próximo marco interruptivo de um gestor (datas None quando não há janela)."""
+    inicio: date | None           # primeiro dia em que um marco reinicia a contagem
+    ultimo_dia: date | None       # último dia em que o marco ainda evita a prescrição
+    prazo_com_marco: date | None  # nova data-alvo se o marco ocorrer no último dia
+    motivo: str
+
+def janela_proximo_marco(res: ResultadoGestor,
+                         enquadramento: str,
+                         aplicar_prazo_penal: str,
+                         prazo_penal_anos: int | None,
+                         data_referencia: date | None = None,
+                         regras: TabelaDecisao | None = None) -> JanelaMarco:
+    """Último dia para o próximo marco evitar a prescrição, em forma fechada.
+
+    Pela regra de reinício de ``compute_deadline``, um marco em ``d`` só conta se
+    ``d`` for posterior ao início corrente da contagem (termo inicial ou último
+    marco válido, já filtrado pelo regime em ``res.interrupcoes``) e a nova
+    data-alvo é ``d + base``, crescente em ``d``; a prescrição se consuma em
+    ``prazo_final`` (``hoje >= prazo_final``). Logo a janela é
+    [max(início corrente + 1 dia, data de referência), prazo_final − 1 dia], sem busca.
+    """
+    t = regras or tabela_padrao()
+    codigo = t.codificar(enquadramento)
+    ref = data_referencia or date.today()
+    if t.regime_anterior[codigo]:
+        return JanelaMarco(None, None, None, "Prescrição reconhecida no regime anterior: marcos posteriores não alteram o resultado.")
+    if res.sit == "Prescrição intercorrente":
+        return JanelaMarco(None, None, None, "Prescrição intercorrente: novo marco não afasta a paralisação já verificada.")
+    if not isinstance(res.prazo_final, date) or res.prazo_final <= ref:
+        return JanelaMarco(None, None, None, "Prazo já esgotado na data de referência.")
+    # Marco no próprio dia do início corrente não altera a contagem: a janela começa no dia seguinte
+    inicio_contagem = max(res.interrupcoes, default=res.termo_inicial)
+    inicio = max(inicio_contagem + timedelta(days=1), ref)
+    ultimo_dia = res.prazo_final - timedelta(days=1)
+    base_anos, base_label = _base_prazo(t, codigo, aplicar_prazo_penal, prazo_penal_anos)
+    if somar_anos(inicio, base_anos) <= res.prazo_final:
+        inicio += timedelta(days=1)  # 29/02 → 28/02: reinício em 29/02 logo após 28/02 não estende o prazo
+    return JanelaMarco(
+        inicio=inicio,
+        ultimo_dia=ultimo_dia,
+        prazo_com_marco=somar_anos(ultimo_dia, base_anos),
+        motivo=(f"Marco válido entre {inicio.strftime('%d/%m/%Y')} e {ultimo_dia.strftime('%d/%m/%Y')} "
+                f"reinicia a contagem ({base_label})."),
+    )
+
+# --------------------------------------------------------------------------------------
+# Linha do "Resumo" (mesmo layout da aba do Excel)
+# --------------------------------------------------------------------------------------
+COLUNAS_RESUMO = [
+    "gestor", "situacao", "enquadramento", "base", "termo_inicial",
+    "prazo_final", "ciencia", "fato_cessacao", "interrupcoes",
+]
+
+def linha_resumo(gestor: str, enquadramento: str, res: ResultadoGestor,
+                 data_ciencia: date | None, termo_inicial_fato: date | None) -> dict:
+    """Monta a linha da aba "Resumo" a partir do resultado de ``calcular_por_gestor``."""
+    _termo = res.termo_inicial
+    _prazo = res.prazo_final
+    _ints = res.interrupcoes
+    return {
+        "gestor": gestor,
+        "situacao": res.sit,
+        "enquadramento": enquadramento,
+        "base": res.base,
+        "termo_inicial": _termo.strftime('%Y-%m-%d') if isinstance(_termo, date) else '',
+        "prazo_final": _prazo.strftime('%Y-%m-%d') if isinstance(_prazo, date) else '',
+        "ciencia": data_ciencia.strftime('%Y-%m-%d') if isinstance(data_ciencia, date) else '',
+        "fato_cessacao": termo_inicial_fato.strftime('%Y-%m-%d') if isinstance(termo_inicial_fato, date) else '',
+        "interrupcoes": "; ".join([d.strftime('%Y-%m-%d') for d in _ints]) if _ints else ''
+    }
+
+def linhas_detalhe(gestor: str, enquadramento: str, res: ResultadoGestor,
+                   data_ciencia: date | None, termo_inicial_fato: date | None,
+                   global_marcos: list[date], subj_marcos: list[date]) -> list[dict]:
+    """Linhas campo/valor do detalhamento por gestor (aba individual no Excel)."""
+    return [
+        {"campo": "Gestor", "valor": gestor},
+        {"campo": "Situação", "valor": res.sit},
+        {"campo": "Enquadramento (global)", "valor": enquadramento},
+        {"campo": "Base", "valor": res.base},
+        {"campo": "Termo inicial (cálculo)", "valor": res.termo_inicial.strftime("%Y-%m-%d") if isinstance(res.termo_inicial, date) else ""},
+        {"campo": "Label do termo", "valor": res.termo_inicial_label},
+        {"campo": "Data-alvo de prescrição", "valor": res.prazo_final.strftime("%Y-%m-%d") if isinstance(res.prazo_final, date) else ""},
+        {"campo": "Ciência considerada (TCE-RJ)", "valor": data_ciencia.strftime("%Y-%m-%d") if isinstance(data_ciencia, date) else ""},
+        {"campo": "Fato/Cessação (transparência)", "valor": termo_inicial_fato.strftime("%Y-%m-%d") if isinstance(termo_inicial_fato, date) else ""},
+        {"campo": "Marcos gerais (datas)", "valor": ", ".join(sorted({d.strftime('%Y-%m-%d') for d in global_marcos})) if global_marcos else ""},
+        {"campo": f"Chamamentos qualificados de {gestor}", "valor": ", ".join(sorted({d.strftime('%Y-%m-%d') for d in subj_marcos})) if subj_marcos else ""},
+        {"campo": "Interrupções consideradas (após o termo)", "valor": ", ".join([d.strftime('%Y-%m-%d') for d in res.interrupcoes]) if res.interrupcoes else ""},
+    ]
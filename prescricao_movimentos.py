@@ -0,0 +1,460 @@
+# prescricao_movimentos.py
+"""Histórico de movimentações do processo: intercorrente (§ 1º) e importação de marcos.
+
+``calcular_por_gestor`` compara só um par de datas (último ato útil × ato
+subsequente). Com o histórico de movimentações do processo (CSV/XLSX com
+``processo``, ``data`` e ``tipo``), ``paralisacoes`` encontra, numa única
+passada sobre as datas ordenadas, todo intervalo entre atos consecutivos de
+pelo menos ``DIAS_INTERCORRENTE`` dias, inclusive o intervalo em aberto entre o
+último ato e a data de referência. A primeira paralisação é a que alimenta o
+cálculo (``campos_intercorrente``).
+
+O mesmo histórico alimenta os marcos: ``importar_marcos`` classifica cada
+movimentação por uma tabela de regras (``TabelaRegras``: padrão → marco geral,
+chamamento ou simples protocolo, que não interrompe) e devolve as mesmas
+estruturas de ``separar_marcos`` — marcos gerais e chamamentos por gestor —,
+prontas para ``calcular_por_gestor``.
+
+A leitura é em streaming, um processo por vez: só as movimentações do processo
+corrente ficam em memória, de modo que exportações com milhões de linhas são
+lidas sem carregá-las inteiras. O arquivo deve vir agrupado por processo
+(p.ex. ordenado por processo); dentro do processo, a ordem das datas é livre.
+
+Uso:
+    python prescricao_movimentos.py movimentos.csv -o paralisacoes.csv
+    python prescricao_movimentos.py movimentos.csv --todas --ignorar-tipo "Juntada" -o todas.csv
+    python prescricao_movimentos.py movimentos.csv --marcos --regras regras.csv -o marcos.csv
+    python prescricao_lote.py casos.csv --movimentos movimentos.csv -o resultados.csv
+"""
+import argparse
+import csv
+import re
+import sys
+import unicodedata
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import date
+from functools import lru_cache
+from itertools import chain, groupby
+from typing import Iterable, Iterator
+
+from prescricao_lote import _TIPOS_ALIASES, TIPO_CHAMAMENTO, TIPO_MARCO_GERAL, _parse_data, ler_casos
+from prescricao_motor import DIAS_INTERCORRENTE
+
+# Colunas do histórico (cabeçalho normalizado como em prescricao_lote; primeiro nome presente vale)
+COLUNAS_MOVIMENTO = {
+    "processo": ("processo", "numero_processo", "n_processo"),
+    "data": ("data", "data_movimento", "data_movimentacao", "data_ato"),
+    "tipo": ("tipo", "tipo_movimento", "movimento", "movimentacao"),
+    "descricao": ("descricao", "complemento", "texto"),
+    "gestor": ("gestor", "responsavel", "interessado"),
+}
+
+# --------------------------------------------------------------------------------------
+# Paralisações de um processo
+# --------------------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class Paralisacao:
+    """Intervalo sem ato útil de pelo menos ``DIAS_INTERCORRENTE`` dias."""
+    inicio: date   # último ato útil antes da paralisação
+    fim: date      # ato subsequente (ou data de referência, se em aberto)
+    dias: int
+    aberta: bool   # ato subsequente ainda não praticado na data de referência
+
+@dataclass(slots=True)
+class VarreduraIntercorrente:
+    """Resultado da varredura do histórico de um processo."""
+    processo: str
+    movimentos: int = 0
+    primeiro_ato: date | None = None
+    ultimo_ato: date | None = None
+    paralisacoes: list[Paralisacao] = field(default_factory=list)
+    erros: list[str] = field(default_factory=list)
+
+    @property
+    def primeira(self) -> Paralisacao | None:
+        return self.paralisacoes[0] if self.paralisacoes else None
+
+def paralisacoes(datas: list[date],
+                 data_referencia: date | None = None,
+                 dias_minimos: int = DIAS_INTERCORRENTE) -> list[Paralisacao]:
+    """Todas as paralisações de ``dias_minimos`` ou mais, em ordem cronológica.
+
+    ``datas`` são os atos úteis do processo (a lista é ordenada no lugar se preciso;
+    repetições não importam). Atos posteriores à data de referência são ignorados,
+    e o intervalo entre o último ato e a data de referência conta como paralisação
+    em aberto — o mesmo critério de ``calcular_por_gestor`` (``dias >= DIAS_INTERCORRENTE``).
+    """
+    ref = data_referencia or date.today()
+    if any(a > b for a, b in zip(datas, datas[1:])):
+        datas.sort()
+    encontradas: list[Paralisacao] = []
+    anterior = None
+    for d in datas:
+        if d > ref:
+            break
+        if anterior is not None and (d - anterior).days >= dias_minimos:
+            encontradas.append(Paralisacao(anterior, d, (d - anterior).days, False))
+        anterior = d
+    if anterior is not None and (ref - anterior).days >= dias_minimos:
+        encontradas.append(Paralisacao(anterior, ref, (ref - anterior).days, True))
+    return encontradas
+
+# --------------------------------------------------------------------------------------
+# Varredura em streaming do histórico da carteira
+# --------------------------------------------------------------------------------------
+def _resolver_colunas(linha: dict) -> dict[str, str | None]:
+    return {c: next((n for n in nomes if n in linha), None) for c, nomes in COLUNAS_MOVIMENTO.items()}
+
+def _por_processo(linhas: Iterable[dict]) -> Iterator[tuple[str, list[dict], dict[str, str | None]]]:
+    """(processo, movimentações do processo, colunas resolvidas), um processo por vez."""
+    it = iter(linhas)
+    primeira = next(it, None)
+    if primeira is None:
+        return
+    colunas = _resolver_colunas(primeira)
+    if colunas["data"] is None:
+        raise ValueError("histórico sem coluna de data (" + "/".join(COLUNAS_MOVIMENTO["data"]) + ")")
+    col_proc = colunas["processo"]
+
+    def _processo(linha: dict) -> str:
+        return str(linha.get(col_proc) or "").strip() if col_proc else ""
+
+    vistos: set[str] = set()
+    for processo, grupo in groupby(chain([primeira], it), key=_processo):
+        if processo in vistos:
+            raise ValueError(f"histórico não agrupado por processo: {processo!r} reaparece")
+        vistos.add(processo)
+        yield processo, list(grupo), colunas
+
+def _texto(linha: dict, colunas: dict[str, str | None]) -> str:
+    """Texto classificado pela tabela de regras: ``tipo`` + ``descricao``."""
+    col_tipo, col_desc = colunas["tipo"], colunas["descricao"]
+    texto = str(linha.get(col_tipo) or "") if col_tipo else ""
+    if col_desc and linha.get(col_desc):
+        texto = f"{texto} {linha[col_desc]}"
+    return texto
+
+def _varrer(processo: str,
+            grupo: list[dict],
+            colunas: dict[str, str | None],
+            ref: date,
+            ignorados: set[str],
+            dias_minimos: int,
+            regras: "TabelaRegras") -> VarreduraIntercorrente:
+    col_data, col_tipo = colunas["data"], colunas["tipo"]
+    classificar = regras.classificar
+    varredura = VarreduraIntercorrente(processo, movimentos=len(grupo))
+    datas: list[date] = []
+    for linha in grupo:
+        if ignorados and str(linha.get(col_tipo) or "").strip().lower() in ignorados:
+            continue
+        # Só o próprio tipo decide: protocolo, juntada, certidão… não são ato útil. A descrição fica de fora,
+        # para que um ato real que apenas menciona "vista" ou "expediente" continue interrompendo a paralisação.
+        tipo = str(linha.get(col_tipo) or "").strip() if col_tipo else ""
+        if classificar(tipo or _texto(linha, colunas)) == TIPO_SIMPLES_PROTOCOLO:
+            continue
+        valor = linha.get(col_data)
+        try:
+            d = _parse_data(valor)
+        except ValueError:
+            varredura.erros.append(f"data inválida ({valor})")
+            continue
+        if d is not None:
+            datas.append(d)
+    varredura.paralisacoes = paralisacoes(datas, ref, dias_minimos)
+    ate_ref = bisect_right(datas, ref)  # datas já ordenadas por paralisacoes()
+    if ate_ref:
+        varredura.primeiro_ato, varredura.ultimo_ato = datas[0], datas[ate_ref - 1]
+    return varredura
+
+def varrer_movimentos(linhas: Iterable[dict],
+                      data_referencia: date | None = None,
+                      tipos_ignorados: Iterable[str] = (),
+                      dias_minimos: int = DIAS_INTERCORRENTE,
+                      regras: "TabelaRegras | None" = None) -> Iterator[VarreduraIntercorrente]:
+    """Uma ``VarreduraIntercorrente`` por processo, na ordem do arquivo, em streaming.
+
+    ``linhas`` vêm de ``prescricao_lote.ler_casos`` (ou qualquer iterável de dicts).
+    Não interrompem a paralisação as movimentações cujo ``tipo`` é classificado como simples
+    protocolo por ``regras`` (padrão: ``REGRAS_PADRAO``; ``TabelaRegras([])`` conta todas) e as de
+    ``tipo`` em ``tipos_ignorados`` (sem distinção de maiúsculas). Um processo que
+    reaparece depois de outro (arquivo não agrupado) gera ``ValueError``.
+    """
+    ref = data_referencia or date.today()
+    regras = regras or TabelaRegras()
+    ignorados = {t.strip().lower() for t in tipos_ignorados}
+    for processo, grupo, colunas in _por_processo(linhas):
+        yield _varrer(processo, grupo, colunas, ref, ignorados, dias_minimos, regras)
+
+def campos_intercorrente(varredura: VarreduraIntercorrente) -> dict[str, str]:
+    """Colunas de intercorrente da entrada do modo lote a partir da varredura.
+
+    Com paralisação: último ato e ato subsequente da primeira (ato subsequente vazio se
+    em aberto). Sem paralisação: último ato do histórico, com ato subsequente em aberto —
+    assim a base local sabe quando a intercorrente passará a correr (``limite_intercorrente``).
+    """
+    if varredura.ultimo_ato is None:
+        return {}
+    p = varredura.primeira
+    ultimo, subseq = (p.inicio, None if p.aberta else p.fim) if p else (varredura.ultimo_ato, None)
+    return {
+        "check_intercorrente": "Sim",
+        "intercorrente_ultimo_ato": ultimo.isoformat(),
+        "intercorrente_ato_subseq": subseq.isoformat() if subseq else "",
+    }
+
+# --------------------------------------------------------------------------------------
+# Classificação das movimentações em marcos (tabela de regras)
+# --------------------------------------------------------------------------------------
+TIPO_SIMPLES_PROTOCOLO = "Simples protocolo"
+TIPO_NAO_CLASSIFICADO = "Não classificado"
+CLASSES_MOVIMENTO = [TIPO_MARCO_GERAL, TIPO_CHAMAMENTO, TIPO_SIMPLES_PROTOCOLO]
+
+_CLASSES_ALIASES = {
+    **_TIPOS_ALIASES,
+    "simples protocolo": TIPO_SIMPLES_PROTOCOLO, "protocolo": TIPO_SIMPLES_PROTOCOLO,
+    "nao interrompe": TIPO_SIMPLES_PROTOCOLO, "ignorar": TIPO_SIMPLES_PROTOCOLO, "p": TIPO_SIMPLES_PROTOCOLO,
+}
+
+# (padrão, classe): expressão regular sobre tipo + descrição normalizados (minúsculas, sem acentos).
+# Vale a primeira regra que casar. Simples protocolo vem antes ("juntada de citação" não vira chamamento), mas só
+# quando o ato de protocolo abre o texto (``^``): "Citação ... - expediente 123" e "Auditoria - conclusão" são marcos.
+REGRAS_PADRAO: list[tuple[str, str]] = [
+    (r"^\s*(protocolo|juntada|peticao|certidao|remessa|vista|conclusao|expediente|recebimento)\b", TIPO_SIMPLES_PROTOCOLO),
+    (r"\b(citacao|chamamento|audiencia|oitiva|defesa previa)\b|notificacao para (apresentar )?(defesa|razoes)", TIPO_CHAMAMENTO),
+    # TCE/TOF só com o contexto da instauração: "Ofício ao TCE" não é marco (cada marco falso reinicia a contagem)
+    (r"\bauditoria\b|\binstaurac\w* d[ae] (tce|tof|tomada de contas especial)\b|\b(tce|tof|tomada de contas especial) instaurad[ao]\b"
+     r"|decisao condenatoria|conciliacao", TIPO_MARCO_GERAL),
+]
+
+def _normalizar_texto(texto: str) -> str:
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c)).lower().strip()
+
+class TabelaRegras:
+    """Regras (padrão, classe) compiladas uma vez numa única expressão regular.
+
+    A alternação ancorada no início preserva a prioridade (a primeira regra que casar
+    vale) e a classificação é memoizada por texto: numa exportação, os tipos de
+    movimentação se repetem, então quase toda linha custa uma consulta ao cache.
+    """
+
+    def __init__(self, regras: Iterable[tuple[str, str]] = REGRAS_PADRAO):
+        self.regras: list[tuple[str, str]] = []
+        for padrao, classe in regras:
+            classe_resolvida = _CLASSES_ALIASES.get(_normalizar_texto(classe), classe if classe in CLASSES_MOVIMENTO else None)
+            if classe_resolvida is None:
+                raise ValueError(f"classe desconhecida na regra {padrao!r}: {classe!r}")
+            try:
+                re.compile(padrao)
+            except re.error as exc:
+                raise ValueError(f"padrão inválido {padrao!r}: {exc}") from None
+            self.regras.append((padrao, classe_resolvida))
+        self._classes = [c for _, c in self.regras]
+        try:
+            self._expressao = re.compile(
+                "|".join(f"(?P<r{i}>.*?(?:{p}))" for i, (p, _) in enumerate(self.regras)) or r"(?!)",
+                re.DOTALL,
+            )
+        except re.error as exc:  # padrões válidos isoladamente, mas não combinados (p.ex. grupos nomeados repetidos)
+            raise ValueError(f"tabela de regras inválida: {exc}") from None
+        self.classificar = lru_cache(maxsize=65536)(self._classificar)
+
+    def _classificar(self, texto: str) -> str:
+        m = self._expressao.match(_normalizar_texto(texto))
+        return self._classes[int(m.lastgroup[1:])] if m else TIPO_NAO_CLASSIFICADO
+
+def carregar_regras(origem, nome: str | None = None) -> TabelaRegras:
+    """Tabela de regras de um CSV/XLSX com as colunas ``padrao`` e ``classe`` (na ordem de prioridade)."""
+    regras = [(str(l.get("padrao") or "").strip(), str(l.get("classe") or "").strip()) for l in ler_casos(origem, nome)]
+    return TabelaRegras([(p, c) for p, c in regras if p])
+
+@dataclass(slots=True)
+class MarcosImportados:
+    """Marcos de um processo extraídos do histórico (mesmas estruturas de ``separar_marcos``)."""
+    processo: str
+    marcos_gerais: list[date] = field(default_factory=list)
+    chamamentos: dict[str, list[date]] = field(default_factory=dict)
+    contagem: dict[str, int] = field(default_factory=dict)  # movimentações por classe
+    erros: list[str] = field(default_factory=list)
+
+def _importar(processo: str,
+              grupo: list[dict],
+              colunas: dict[str, str | None],
+              regras: TabelaRegras,
+              gestores: Iterable[str]) -> MarcosImportados:
+    col_data, col_gestor = colunas["data"], colunas["gestor"]
+    classificar = regras.classificar
+    gerais: set[date] = set()
+    por_gestor: dict[str, set[date]] = {g: set() for g in gestores}
+    contagem = dict.fromkeys(CLASSES_MOVIMENTO + [TIPO_NAO_CLASSIFICADO], 0)
+    erros: list[str] = []
+    for linha in grupo:
+        texto = _texto(linha, colunas)
+        classe = classificar(texto)
+        contagem[classe] += 1
+        if classe not in (TIPO_MARCO_GERAL, TIPO_CHAMAMENTO):
+            continue
+        valor = linha.get(col_data)
+        try:
+            d = _parse_data(valor)
+        except ValueError:
+            erros.append(f"data inválida ({valor})")
+            continue
+        if d is None:
+            continue
+        if classe == TIPO_MARCO_GERAL:
+            gerais.add(d)
+            continue
+        gestor = str(linha.get(col_gestor) or "").strip() if col_gestor else ""
+        if gestor:
+            por_gestor.setdefault(gestor, set()).add(d)
+        else:
+            erros.append(f"chamamento sem gestor em {d.strftime('%d/%m/%Y')} ({texto.strip()})")
+    return MarcosImportados(processo, sorted(gerais), {g: sorted(ds) for g, ds in por_gestor.items()}, contagem, erros)
+
+def importar_marcos(linhas: Iterable[dict],
+                    regras: TabelaRegras | None = None,
+                    gestores: Iterable[str] = ()) -> Iterator[MarcosImportados]:
+    """Um ``MarcosImportados`` por processo, na ordem do arquivo, em streaming.
+
+    Cada movimentação é classificada pelo texto de ``tipo`` (+ ``descricao``, se houver):
+    marco geral, chamamento (exige ``gestor``) ou simples protocolo/não classificada, que
+    só entram na contagem. Todo gestor de ``gestores`` aparece em ``chamamentos``.
+    """
+    regras = regras or TabelaRegras()
+    gestores = list(gestores)
+    for processo, grupo, colunas in _por_processo(linhas):
+        yield _importar(processo, grupo, colunas, regras, gestores)
+
+def ler_historico(linhas: Iterable[dict],
+                  data_referencia: date | None = None,
+                  regras: TabelaRegras | None = None,
+                  tipos_ignorados: Iterable[str] = (),
+                  dias_minimos: int = DIAS_INTERCORRENTE) -> Iterator[tuple[VarreduraIntercorrente, MarcosImportados]]:
+    """Varredura da intercorrente e marcos importados de cada processo, numa só leitura do histórico.
+
+    ``regras`` classifica as movimentações para os marcos e para a varredura (simples
+    protocolo não interrompe a paralisação).
+    """
+    ref = data_referencia or date.today()
+    regras = regras or TabelaRegras()
+    ignorados = {t.strip().lower() for t in tipos_ignorados}
+    for processo, grupo, colunas in _por_processo(linhas):
+        yield (_varrer(processo, grupo, colunas, ref, ignorados, dias_minimos, regras),
+               _importar(processo, grupo, colunas, regras, ()))
+
+def linhas_tabela_marcos(importados: MarcosImportados) -> list[dict]:
+    """Linhas (gestor, tipo, data) no layout da tabela de marcos do app."""
+    linhas = [{"gestor": "", "tipo": TIPO_MARCO_GERAL, "data": d.strftime("%d/%m/%Y")} for d in importados.marcos_gerais]
+    linhas += [{"gestor": g, "tipo": TIPO_CHAMAMENTO, "data": d.strftime("%d/%m/%Y")}
+               for g, ds in importados.chamamentos.items() for d in ds]
+    return linhas
+
+def completar_casos(linhas: Iterable[dict],
+                    historico: dict[str, tuple[VarreduraIntercorrente, MarcosImportados]]) -> Iterator[dict]:
+    """Preenche as linhas caso/gestor do modo lote com o histórico do processo.
+
+    Só as colunas vazias na entrada são preenchidas: intercorrente pela primeira paralisação
+    (``campos_intercorrente``), ``marcos_gerais`` e ``chamamentos`` do próprio gestor pelos marcos importados.
+    """
+    for linha in linhas:
+        encontrado = historico.get(str(linha.get("processo") or "").strip())
+        if encontrado is None:
+            yield linha
+            continue
+        varredura, importados = encontrado
+        linha = dict(linha)
+        if not linha.get("intercorrente_ultimo_ato"):
+            linha.update(campos_intercorrente(varredura))
+        if not linha.get("marcos_gerais") and importados.marcos_gerais:
+            linha["marcos_gerais"] = "; ".join(d.isoformat() for d in importados.marcos_gerais)
+        chamamentos = importados.chamamentos.get(str(linha.get("gestor") or "").strip())
+        if not linha.get("chamamentos") and chamamentos:
+            linha["chamamentos"] = "; ".join(d.isoformat() for d in chamamentos)
+        yield linha
+
+# --------------------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------------------
+COLUNAS_SAIDA = ["processo", "movimentos", "primeiro_ato", "ultimo_ato", "paralisacoes",
+                 "inicio", "fim", "dias", "aberta", "erros"]
+
+def _linhas_saida(varreduras: Iterable[VarreduraIntercorrente], todas: bool) -> Iterator[dict]:
+    for v in varreduras:
+        base = {
+            "processo": v.processo,
+            "movimentos": v.movimentos,
+            "primeiro_ato": v.primeiro_ato.isoformat() if v.primeiro_ato else "",
+            "ultimo_ato": v.ultimo_ato.isoformat() if v.ultimo_ato else "",
+            "paralisacoes": len(v.paralisacoes),
+            "erros": "; ".join(v.erros),
+        }
+        for p in (v.paralisacoes if todas else v.paralisacoes[:1]) or [None]:
+            yield {
+                **base,
+                "inicio": p.inicio.isoformat() if p else "",
+                "fim": p.fim.isoformat() if p else "",
+                "dias": p.dias if p else "",
+                "aberta": ("Sim" if p.aberta else "Não") if p else "",
+            }
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Varre o histórico de movimentações: paralisações de 3 anos ou mais (intercorrente) ou marcos (--marcos).",
+    )
+    parser.add_argument("entrada", help="Histórico (.csv ou .xlsx) com processo, data e tipo, agrupado por processo.")
+    parser.add_argument("-o", "--saida", default=None, help="CSV de saída (padrão: stdout).")
+    parser.add_argument("--todas", action="store_true", help="Uma linha por paralisação (padrão: só a primeira de cada processo).")
+    parser.add_argument("--ignorar-tipo", action="append", default=[], metavar="TIPO",
+                        help="Tipo de movimentação que não interrompe a paralisação (repetível).")
+    parser.add_argument("--data-referencia", type=date.fromisoformat, default=None,
+                        help="Data \"as-of\" (AAAA-MM-DD) para a paralisação em aberto. Padrão: hoje.")
+    parser.add_argument("--marcos", action="store_true",
+                        help="Em vez das paralisações, grava os marcos classificados (processo, gestor, tipo, data).")
+    parser.add_argument("--regras", default=None,
+                        help="Tabela de regras (.csv/.xlsx com padrao, classe); padrão: REGRAS_PADRAO. "
+                             "Simples protocolo não interrompe a paralisação.")
+    args = parser.parse_args(argv)
+
+    if args.marcos:
+        return _main_marcos(args)
+    regras = carregar_regras(args.regras) if args.regras else TabelaRegras()
+    varreduras = varrer_movimentos(ler_casos(args.entrada), args.data_referencia, args.ignorar_tipo, regras=regras)
+    f = open(args.saida, "w", newline="", encoding="utf-8-sig") if args.saida else sys.stdout
+    processos = com_paralisacao = 0
+    try:
+        escritor = csv.DictWriter(f, fieldnames=COLUNAS_SAIDA)
+        escritor.writeheader()
+        for v in varreduras:
+            processos += 1
+            com_paralisacao += bool(v.paralisacoes)
+            escritor.writerows(_linhas_saida([v], args.todas))
+    finally:
+        if args.saida:
+            f.close()
+    print(f"{processos} processo(s); {com_paralisacao} com paralisação de {DIAS_INTERCORRENTE} dias ou mais", file=sys.stderr)
+    return 0
+
+def _main_marcos(args: argparse.Namespace) -> int:
+    regras = carregar_regras(args.regras) if args.regras else TabelaRegras()
+    f = open(args.saida, "w", newline="", encoding="utf-8-sig") if args.saida else sys.stdout
+    contagem = dict.fromkeys(CLASSES_MOVIMENTO + [TIPO_NAO_CLASSIFICADO], 0)
+    try:
+        escritor = csv.DictWriter(f, fieldnames=["processo", "gestor", "tipo", "data"])
+        escritor.writeheader()
+        for importados in importar_marcos(ler_casos(args.entrada), regras):
+            escritor.writerows({"processo": importados.processo, **l} for l in linhas_tabela_marcos(importados))
+            for classe, n in importados.contagem.items():
+                contagem[classe] += n
+            for erro in importados.erros:
+                print(f"{importados.processo}: {erro}", file=sys.stderr)
+    finally:
+        if args.saida:
+            f.close()
+    print("; ".join(f"{classe}: {n}" for classe, n in contagem.items()), file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
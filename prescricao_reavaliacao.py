@@ -0,0 +1,115 @@
+# prescricao_reavaliacao.py
+"""Reavaliação diária da base local: só os casos cuja data foi cruzada.
+
+A situação de um gestor muda apenas com a passagem do tempo em dois pontos:
+- "Não prescrito" → "Prescrição consumada" quando ``prazo_final <= hoje``;
+- → "Prescrição intercorrente" quando a paralisação, contada até hoje (ato
+  subsequente ainda não praticado), atinge 3 anos: ``limite_intercorrente <= hoje``.
+
+Os prazos já estão gravados e indexados (``prescricao_banco``), então a
+reavaliação é feita por duas consultas de intervalo, sem recalcular a carteira:
+o custo é proporcional ao número de transições, não ao tamanho da base. Cada
+transição é registrada na tabela ``transicoes`` (e listada na saída).
+
+Uso (p.ex. no cron, toda madrugada):
+    python prescricao_reavaliacao.py carteira.sqlite3
+    python prescricao_reavaliacao.py carteira.sqlite3 --data 2026-12-31 --log transicoes.csv
+"""
+import argparse
+import csv
+import sqlite3
+import sys
+from datetime import date, datetime
+
+from prescricao_banco import conectar
+
+SIT_NAO_PRESCRITO = "Não prescrito"
+SIT_CONSUMADA = "Prescrição consumada"
+SIT_INTERCORRENTE = "Prescrição intercorrente"
+
+COLUNAS_TRANSICAO = ["processo", "gestor", "de", "para", "data_referencia", "registrado_em"]
+
+def reavaliar(con: sqlite3.Connection, hoje: date | None = None) -> list[dict]:
+    """Aplica as transições devidas até ``hoje`` (inclusive) e devolve a lista registrada.
+
+    Idempotente: rodar de novo no mesmo dia não gera transições; dias sem execução são
+    cobertos pela execução seguinte.
+    """
+    hoje_iso = (hoje or date.today()).isoformat()
+    agora = datetime.now().isoformat(timespec="seconds")
+    transicoes: list[dict] = []
+    with con:
+        # Intercorrente primeiro: prevalece sobre a consumação pelo prazo (como em calcular_por_gestor).
+        # O limite cruzado é zerado para sair do índice parcial (não volta a ser lido nas próximas noites).
+        cruzados = con.execute(
+            "SELECT processo, gestor, situacao FROM resultados "
+            "WHERE limite_intercorrente > '' AND limite_intercorrente <= ?",
+            (hoje_iso,),
+        ).fetchall()
+        for processo, gestor, situacao in cruzados:
+            if situacao in (SIT_NAO_PRESCRITO, SIT_CONSUMADA):
+                transicoes.append({"processo": processo, "gestor": gestor, "de": situacao, "para": SIT_INTERCORRENTE})
+        con.executemany(
+            "UPDATE resultados SET limite_intercorrente = '', "
+            "situacao = CASE WHEN situacao IN (?, ?) THEN ? ELSE situacao END "
+            "WHERE processo = ? AND gestor = ?",
+            ((SIT_NAO_PRESCRITO, SIT_CONSUMADA, SIT_INTERCORRENTE, p, g) for p, g, _ in cruzados),
+        )
+
+        # Prazo vencido: índice (situacao, prazo_final)
+        vencidos = con.execute(
+            "SELECT processo, gestor FROM resultados "
+            "WHERE situacao = ? AND prazo_final > '' AND prazo_final <= ?",
+            (SIT_NAO_PRESCRITO, hoje_iso),
+        ).fetchall()
+        con.executemany(
+            "UPDATE resultados SET situacao = ? WHERE processo = ? AND gestor = ?",
+            ((SIT_CONSUMADA, p, g) for p, g in vencidos),
+        )
+        transicoes += [{"processo": p, "gestor": g, "de": SIT_NAO_PRESCRITO, "para": SIT_CONSUMADA} for p, g in vencidos]
+
+        for t in transicoes:
+            t["data_referencia"] = hoje_iso
+            t["registrado_em"] = agora
+        con.executemany(
+            f"INSERT INTO transicoes ({', '.join(COLUNAS_TRANSICAO)}) VALUES ({', '.join('?' * len(COLUNAS_TRANSICAO))})",
+            ([t[c] for c in COLUNAS_TRANSICAO] for t in transicoes),
+        )
+        con.execute(
+            "INSERT INTO reavaliacoes (data_referencia, executado_em, transicoes) VALUES (?, ?, ?)",
+            (hoje_iso, agora, len(transicoes)),
+        )
+    return transicoes
+
+# --------------------------------------------------------------------------------------
+# CLI
+# --------------------------------------------------------------------------------------
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Reavalia a base local: aplica as mudanças de situação causadas pela passagem do tempo.",
+    )
+    parser.add_argument("banco", help="Base SQLite (gerada pelo app ou por prescricao_lote.py -o carteira.sqlite3).")
+    parser.add_argument("--data", type=date.fromisoformat, default=None,
+                        help="Data de referência (AAAA-MM-DD). Padrão: hoje.")
+    parser.add_argument("--log", default=None, help="CSV onde anexar as transições desta execução.")
+    args = parser.parse_args(argv)
+
+    con = conectar(args.banco)
+    try:
+        transicoes = reavaliar(con, args.data)
+    finally:
+        con.close()
+
+    for t in transicoes:
+        print(f"{t['data_referencia']} {t['processo']} / {t['gestor']}: {t['de']} → {t['para']}", file=sys.stderr)
+    if args.log and transicoes:
+        with open(args.log, "a", newline="", encoding="utf-8") as f:
+            escritor = csv.DictWriter(f, fieldnames=COLUNAS_TRANSICAO)
+            if f.tell() == 0:
+                escritor.writeheader()
+            escritor.writerows(transicoes)
+    print(f"{len(transicoes)} transição(ões) em {args.data or date.today()}", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
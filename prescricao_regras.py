@@ -0,0 +1,164 @@
+# prescricao_regras.py
+"""Conjuntos de regras versionados do regime intertemporal e a tabela de decisão compilada.
+
+As datas de corte (fatos a partir de 18/07/2021; vigência em 18/07/2024), os
+prazos (5 anos no novo regime e no regime anterior, 2 na transição) e a
+paralisação da intercorrente (3 anos) formam um ``ConjuntoRegras`` identificado
+por versão e pelos paradigmas do plenário que o fundamentam. Mudar a
+interpretação é publicar outro conjunto (arquivo JSON, ver ``carregar_conjunto``),
+sem editar o motor.
+
+``compilar`` transforma o conjunto numa ``TabelaDecisao``: tuplas indexadas
+pelo código inteiro do enquadramento (posição em ``ENQUADRAMENTOS``) com a
+origem do termo inicial, a base de prazo, o teto dos marcos e o bloco
+exclusivo do regime anterior. O rótulo é convertido em código uma única vez
+(consulta a dicionário); daí em diante a avaliação por linha só faz
+indexação e comparação de inteiros/datas — no motor escalar e, como arrays,
+no vetorizado.
+
+Conjunto padrão: ``PRESCRICAO_REGRAS`` (caminho de um JSON) ou ``REGRAS_LC220_24``.
+"""
+import json
+import os
+from dataclasses import asdict, dataclass, fields
+from datetime import date
+from functools import lru_cache
+
+# Identificadores estáveis dos enquadramentos (entrada/saída do lote, Excel, base local). Não são texto de
+# exibição: o número de anos e a data citados valem para o conjunto padrão; a página mostra
+# ``TabelaDecisao.rotulo``, derivado do conjunto em uso.
+ENQUADRAMENTOS = [
+    "Novo regime (art. 5º-A)",
+    "Transição 2 anos (LC 220/24)",
+    "Prescrição consumada antes da lei",
+    "Fora do alcance: decisão anterior a 18/07/2024",
+]
+
+# Códigos de enquadramento = posição em ENQUADRAMENTOS
+ENQ_NOVO, ENQ_TRANSICAO, ENQ_PRE_LEI, ENQ_FORA = range(4)
+
+# Origem do termo inicial do cálculo
+TERMO_FATO, TERMO_MARCO_LEI, TERMO_CIENCIA = range(3)
+
+# --------------------------------------------------------------------------------------
+# Conjunto de regras (versionado)
+# --------------------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True)
+class ConjuntoRegras:
+    """Parâmetros do regime intertemporal de uma interpretação (versão)."""
+    versao: str
+    descricao: str = ""
+    paradigmas: tuple[str, ...] = ()
+    marco_fatos: date = date(2021, 7, 18)   # fatos anteriores passam pelo teste pré-lei
+    marco_lei: date = date(2024, 7, 18)     # vigência: início da transição e corte do regime anterior
+    anos_novo_regime: int = 5
+    anos_transicao: int = 2
+    anos_regime_anterior: int = 5
+    dias_intercorrente: int = 365 * 3
+
+REGRAS_LC220_24 = ConjuntoRegras(
+    versao="2024.1",
+    descricao="LC-RJ 63/1990, art. 5º-A (LC-RJ 220/2024): novo regime, transição bienal e teste pré-lei.",
+    paradigmas=("224.269-8/23", "227.877-1/14"),
+)
+
+_CAMPOS_DATA = ("marco_fatos", "marco_lei")
+
+def carregar_conjunto(origem) -> ConjuntoRegras:
+    """Lê um conjunto de regras em JSON (campos de ``ConjuntoRegras``; datas em AAAA-MM-DD).
+
+    ``origem`` pode ser um caminho ou um arquivo aberto (p.ex. upload do Streamlit).
+    """
+    if hasattr(origem, "read"):
+        dados = json.load(origem)
+    else:
+        with open(origem, encoding="utf-8") as f:
+            dados = json.load(f)
+    conhecidos = {c.name for c in fields(ConjuntoRegras)}
+    desconhecidos = set(dados) - conhecidos
+    if desconhecidos:
+        raise ValueError(f"campos desconhecidos no conjunto de regras: {', '.join(sorted(desconhecidos))}")
+    if not dados.get("versao"):
+        raise ValueError("conjunto de regras sem versão")
+    for campo in _CAMPOS_DATA:
+        if campo in dados:
+            dados[campo] = date.fromisoformat(dados[campo])
+    dados["paradigmas"] = tuple(dados.get("paradigmas", ()))
+    return ConjuntoRegras(**dados)
+
+def conjunto_para_json(conjunto: ConjuntoRegras) -> str:
+    """Serialização inversa de ``carregar_conjunto`` (ponto de partida para uma nova versão)."""
+    dados = asdict(conjunto)
+    for campo in _CAMPOS_DATA:
+        dados[campo] = dados[campo].isoformat()
+    dados["paradigmas"] = list(dados["paradigmas"])
+    return json.dumps(dados, ensure_ascii=False, indent=2)
+
+# --------------------------------------------------------------------------------------
+# Tabela de decisão compilada
+# --------------------------------------------------------------------------------------
+@dataclass(frozen=True, slots=True, eq=False)
+class TabelaDecisao:
+    """Conjunto compilado; as tuplas são indexadas pelo código do enquadramento."""
+    conjunto: ConjuntoRegras
+    codigo: dict[str, int]                 # rótulo → código (única consulta por texto)
+    termo_origem: tuple[int, ...]          # TERMO_FATO / TERMO_MARCO_LEI / TERMO_CIENCIA
+    termo_rotulo: tuple[str, ...]
+    base_anos: tuple[int, ...]
+    base_rotulo: tuple[str, ...]
+    aceita_penal: tuple[bool, ...]
+    regime_anterior: tuple[bool, ...]      # bloco exclusivo: prescrição reconhecida no regime anterior
+    teto_marcos: tuple[date | None, ...]   # marcos posteriores são ignorados (regime anterior)
+    rotulo: tuple[str, ...]                # texto de exibição do enquadramento (anos e datas do conjunto)
+    rotulo_paralisacao: str                # "Paralisação superior a 3 anos" (dias_intercorrente)
+
+    @property
+    def versao(self) -> str:
+        return self.conjunto.versao
+
+    def codificar(self, enquadramento: str) -> int:
+        try:
+            return self.codigo[enquadramento]
+        except KeyError:
+            raise ValueError(f"enquadramento desconhecido: {enquadramento!r}") from None
+
+    def rotular(self, enquadramento: str) -> str:
+        """Texto de exibição do enquadramento (identificador estável → rótulo do conjunto)."""
+        return self.rotulo[self.codificar(enquadramento)]
+
+def _nome_prazo(anos: int) -> str:
+    return {2: "bienal", 3: "trienal", 5: "quinquenal"}.get(anos, f"{anos} anos")
+
+def _duracao(dias: int) -> str:
+    return f"{dias // 365} anos" if dias % 365 == 0 else f"{dias} dias"
+
+@lru_cache(maxsize=32)
+def compilar(conjunto: ConjuntoRegras) -> TabelaDecisao:
+    """Compila (uma vez por conjunto) a tabela de decisão."""
+    c = conjunto
+    lei = c.marco_lei.strftime("%d/%m/%Y")
+    return TabelaDecisao(
+        conjunto=c,
+        codigo={e: i for i, e in enumerate(ENQUADRAMENTOS)},
+        termo_origem=(TERMO_FATO, TERMO_MARCO_LEI, TERMO_CIENCIA, TERMO_CIENCIA),
+        termo_rotulo=("Termo inicial (fato/cessação)", f"Transição ({lei})",
+                      "Ciência (TCE-RJ) — regime anterior", "Ciência (TCE-RJ)"),
+        base_anos=(c.anos_novo_regime, c.anos_transicao, c.anos_regime_anterior, c.anos_novo_regime),
+        base_rotulo=(_nome_prazo(c.anos_novo_regime), f"{_nome_prazo(c.anos_transicao)} (transição)",
+                     f"{_nome_prazo(c.anos_regime_anterior)} (regime anterior)", _nome_prazo(c.anos_novo_regime)),
+        aceita_penal=(True, True, False, True),
+        regime_anterior=(False, False, True, False),
+        teto_marcos=(None, None, c.marco_lei, None),
+        rotulo=("Novo regime (art. 5º-A)", f"Transição {c.anos_transicao} anos (LC 220/24)",
+                "Prescrição consumada antes da lei", f"Fora do alcance: decisão anterior a {lei}"),
+        rotulo_paralisacao=f"Paralisação superior a {_duracao(c.dias_intercorrente)}",
+    )
+
+@lru_cache(maxsize=1)
+def conjunto_padrao() -> ConjuntoRegras:
+    """Conjunto configurado pelo ambiente (``PRESCRICAO_REGRAS``) ou ``REGRAS_LC220_24``."""
+    caminho = os.environ.get("PRESCRICAO_REGRAS")
+    return carregar_conjunto(caminho) if caminho else REGRAS_LC220_24
+
+def tabela_padrao() -> TabelaDecisao:
+    return compilar(conjunto_padrao())
@@ -0,0 +1,99 @@
+# prescricao_telemetria.py
+"""Telemetria leve por rerun do Streamlit: tempo por seção da página e spans acumulados.
+
+Ativação (desligada por padrão):
+- variável de ambiente ``PRESCRICAO_TELEMETRIA=1`` → registros JSON (uma linha por rerun) em stderr;
+- ``PRESCRICAO_TELEMETRIA=/caminho/arquivo.jsonl`` → registros anexados ao arquivo;
+- ``PRESCRICAO_TELEMETRIA_CHAVE=<segredo>`` + parâmetro de URL ``?telemetria=<segredo>`` →
+  apenas o painel de administração na página (sem a chave no ambiente, o painel não abre).
+
+Desligada, cada chamada é um teste de atributo e retorno imediato; ``span`` devolve
+um gerenciador de contexto nulo compartilhado.
+"""
+import hmac
+import json
+import os
+import sys
+import time
+from contextlib import nullcontext
+from datetime import datetime
+
+_NULO = nullcontext()
+
+class _Span:
+    __slots__ = ("_tm", "_nome", "_t0")
+
+    def __init__(self, tm: "Telemetria", nome: str):
+        self._tm = tm
+        self._nome = nome
+
+    def __enter__(self):
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        dt = time.perf_counter() - self._t0
+        total, n = self._tm.spans.get(self._nome, (0.0, 0))
+        self._tm.spans[self._nome] = (total + dt, n + 1)
+        return False
+
+class Telemetria:
+    """Coleta os tempos de um rerun. Seções são sequenciais (cada ``secao`` fecha a anterior)."""
+
+    def __init__(self, ativo: bool = False, destino: str | None = None):
+        self.ativo = ativo
+        self.destino = destino
+        self.secoes: list[tuple[str, float]] = []
+        self.spans: dict[str, tuple[float, int]] = {}
+        self._t_inicio = time.perf_counter()
+        self._secao: str | None = None
+        self._t_secao = self._t_inicio
+        self.finalizado = False
+
+    def secao(self, nome: str | None) -> None:
+        """Encerra a seção corrente e inicia ``nome``."""
+        if not self.ativo:
+            return
+        agora = time.perf_counter()
+        if self._secao is not None:
+            self.secoes.append((self._secao, agora - self._t_secao))
+        self._secao = nome
+        self._t_secao = agora
+
+    def span(self, nome: str):
+        """Gerenciador de contexto que acumula tempo e contagem em ``nome`` (p.ex. dentro do laço por gestor)."""
+        if not self.ativo:
+            return _NULO
+        return _Span(self, nome)
+
+    def finalizar(self, **contexto) -> dict | None:
+        """Fecha a última seção, emite a linha JSON (se houver destino) e devolve o registro."""
+        if not self.ativo:
+            return None
+        self.secao(None)
+        self.finalizado = True
+        registro = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "total_ms": round((time.perf_counter() - self._t_inicio) * 1000, 3),
+            "secoes": [{"nome": n, "ms": round(dt * 1000, 3)} for n, dt in self.secoes],
+            "spans": {n: {"ms": round(t * 1000, 3), "n": c} for n, (t, c) in self.spans.items()},
+            **contexto,
+        }
+        if self.destino:
+            linha = json.dumps(registro, ensure_ascii=False)
+            if self.destino == "1":
+                print(linha, file=sys.stderr)
+            else:
+                with open(self.destino, "a", encoding="utf-8") as f:
+                    f.write(linha + "\n")
+        return registro
+
+def iniciar_rerun(painel: bool = False) -> Telemetria:
+    """Cria a telemetria do rerun conforme ``PRESCRICAO_TELEMETRIA`` e o pedido de ``painel``."""
+    destino = os.environ.get("PRESCRICAO_TELEMETRIA") or None
+    return Telemetria(ativo=bool(destino) or painel, destino=destino)
+
+def painel_autorizado(chave_informada: str | None) -> bool:
+    """O painel de administração só abre com a chave de ``PRESCRICAO_TELEMETRIA_CHAVE`` (comparação em tempo constante)."""
+    chave = os.environ.get("PRESCRICAO_TELEMETRIA_CHAVE")
+    return bool(chave and chave_informada) and hmac.compare_digest(chave.encode(), str(chave_informada).encode())
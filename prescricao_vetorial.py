@@ -0,0 +1,290 @@
+# prescricao_vetorial.py
+"""Motor vetorizado (NumPy) para prazos prescricionais em lote.
+
+Versão colunar de ``compute_deadline``/``_prelaw_consumou_ate_cutoff``/``calcular_por_gestor``:
+as datas são arrays ``datetime64[D]`` (NaT = ausente) e as interrupções de cada
+linha gestor são uma lista irregular no formato CSR (``offsets`` com n+1
+posições + ``valores``), já contendo marcos gerais + chamamentos do gestor.
+
+Como o reinício da contagem só avança para a frente, o termo de reinício de
+cada linha é o maior marco válido (≥ termo inicial, dentro do limite do
+regime) ou o próprio termo inicial; isso permite resolver tudo com uma
+redução segmentada (``np.maximum.reduceat``) em vez de um laço por caso.
+
+Datas de corte e prazos vêm da tabela de decisão compilada (``prescricao_regras``):
+as tuplas indexadas por código de enquadramento viram arrays, e cada linha é
+resolvida por indexação (``tabela[enq]``), sem comparar rótulos.
+
+A situação é avaliada numa data de referência ("as-of"). Como a data-alvo não
+depende dela, ``linha_do_tempo`` avalia a mesma carteira em muitas datas de uma
+vez (matriz linhas × datas), e ``histograma_mensal`` conta os vencimentos por mês.
+"""
+from dataclasses import dataclass
+from datetime import date
+from functools import lru_cache
+
+import numpy as np
+
+from prescricao_regras import (
+    ENQ_FORA,
+    ENQ_NOVO,
+    ENQ_PRE_LEI,
+    ENQ_TRANSICAO,
+    ENQUADRAMENTOS,
+    TERMO_FATO,
+    TERMO_MARCO_LEI,
+    TabelaDecisao,
+    tabela_padrao,
+)
+
+# Códigos de situação
+SITUACOES = [
+    "Não prescrito",
+    "Prescrição consumada",
+    "Prescrição intercorrente",
+    "Prescrição reconhecida (regime anterior)",
+]
+SIT_NAO_PRESCRITO, SIT_CONSUMADA, SIT_INTERCORRENTE, SIT_RECONHECIDA = range(4)
+
+_NAT = np.datetime64("NaT", "D")
+_MAX_D = np.datetime64("9999-12-31", "D")
+
+@dataclass(frozen=True, slots=True)
+class ResultadoVetorial:
+    """Arrays alinhados por linha gestor."""
+    termo_inicial: np.ndarray   # datetime64[D]
+    prazo_final: np.ndarray     # datetime64[D]
+    base_anos: np.ndarray       # int16
+    situacao: np.ndarray        # int8 (índice em SITUACOES)
+    inicio_contagem: np.ndarray  # datetime64[D] (termo inicial ou último marco válido)
+
+# --------------------------------------------------------------------------------------
+# Conversões
+# --------------------------------------------------------------------------------------
+def codificar_enquadramentos(enquadramentos) -> np.ndarray:
+    """Converte rótulos de ``ENQUADRAMENTOS`` em códigos int8."""
+    idx = {e: i for i, e in enumerate(ENQUADRAMENTOS)}
+    return np.fromiter((idx[e] for e in enquadramentos), dtype=np.int8)
+
+def para_datetime64(datas) -> np.ndarray:
+    """Lista de ``date``/None → ``datetime64[D]`` (None vira NaT)."""
+    return np.array([d if isinstance(d, date) else None for d in datas], dtype="datetime64[D]")
+
+def empacotar_interrupcoes(listas) -> tuple[np.ndarray, np.ndarray]:
+    """Lista de listas de ``date`` → (offsets, valores) no formato CSR."""
+    tamanhos = np.fromiter((len(x) for x in listas), dtype=np.int64)
+    offsets = np.zeros(len(tamanhos) + 1, dtype=np.int64)
+    np.cumsum(tamanhos, out=offsets[1:])
+    valores = np.array([d for x in listas for d in x], dtype="datetime64[D]")
+    return offsets, valores
+
+# --------------------------------------------------------------------------------------
+# Aritmética de datas
+# --------------------------------------------------------------------------------------
+def somar_anos(datas: np.ndarray, anos) -> np.ndarray:
+    """``datas + anos`` com a mesma regra de ``relativedelta(years=n)``: 29/02 → 28/02 em ano não bissexto."""
+    datas = np.asarray(datas, dtype="datetime64[D]")
+    meses = datas.astype("datetime64[M]")
+    dia = (datas - meses).astype(np.int64)                      # 0-based
+    mes = (meses - datas.astype("datetime64[Y]")).astype(np.int64)
+    ano_novo = datas.astype("datetime64[Y]") + np.asarray(anos, dtype=np.int64)
+    inicio_mes = ano_novo.astype("datetime64[M]") + mes
+    dias_no_mes = ((inicio_mes + 1).astype("datetime64[D]") - inicio_mes.astype("datetime64[D]")).astype(np.int64)
+    return inicio_mes.astype("datetime64[D]") + np.minimum(dia, dias_no_mes - 1)
+
+def _reinicio(termo: np.ndarray, limite: np.ndarray, offsets: np.ndarray, valores: np.ndarray) -> np.ndarray:
+    """Maior marco em [termo, limite] por linha (ou o termo, se não houver); NaT se termo for NaT."""
+    n = len(termo)
+    tamanhos = np.diff(offsets)
+    if len(valores) == 0:
+        return termo.copy()
+    linha = np.repeat(np.arange(n), tamanhos)
+    lo = termo[linha]
+    valido = (valores >= lo) & (valores <= limite[linha])   # comparações com NaT são falsas
+    candidatos = np.where(valido, valores, lo)
+    inicio = termo.copy()
+    nao_vazios = tamanhos > 0
+    if nao_vazios.any():
+        maximos = np.maximum.reduceat(candidatos, offsets[:-1][nao_vazios])
+        inicio[nao_vazios] = np.maximum(termo[nao_vazios], maximos)
+    return inicio
+
+# --------------------------------------------------------------------------------------
+# Teste pré-lei e cálculo por linha gestor
+# --------------------------------------------------------------------------------------
+def prelaw_consumou_ate_cutoff(ciencia: np.ndarray,
+                               offsets: np.ndarray,
+                               valores: np.ndarray,
+                               regras: TabelaDecisao | None = None) -> np.ndarray:
+    """Versão vetorizada de ``_prelaw_consumou_ate_cutoff`` (NaT → False)."""
+    t = regras or tabela_padrao()
+    cutoff = np.datetime64(t.conjunto.marco_lei, "D")
+    ciencia = np.asarray(ciencia, dtype="datetime64[D]")
+    limite = np.full(len(ciencia), cutoff)
+    inicio = _reinicio(ciencia, limite, offsets, np.asarray(valores, dtype="datetime64[D]"))
+    return ~np.isnat(inicio) & (somar_anos(inicio, t.conjunto.anos_regime_anterior) <= cutoff)
+
+def sugerir_enquadramentos(transitou_pre_lc: np.ndarray,
+                           termo_inicial_fato: np.ndarray,
+                           data_ciencia: np.ndarray,
+                           offsets_gerais: np.ndarray,
+                           valores_gerais: np.ndarray,
+                           regras: TabelaDecisao | None = None) -> np.ndarray:
+    """Versão colunar de ``sugerir_enquadramento`` (códigos int8); só os marcos gerais entram no teste pré-lei."""
+    t = regras or tabela_padrao()
+    fato = np.asarray(termo_inicial_fato, dtype="datetime64[D]")
+    pre_lei = prelaw_consumou_ate_cutoff(data_ciencia, offsets_gerais, valores_gerais, t)
+    codigos = np.where(pre_lei, ENQ_PRE_LEI, ENQ_TRANSICAO)
+    codigos = np.where(fato >= np.datetime64(t.conjunto.marco_fatos, "D"), ENQ_NOVO, codigos)
+    return np.where(np.asarray(transitou_pre_lc, dtype=bool), ENQ_FORA, codigos).astype(np.int8)
+
+@dataclass(frozen=True, slots=True)
+class _TabelaArrays:
+    """Colunas da ``TabelaDecisao`` como arrays indexáveis por código de enquadramento."""
+    termo_origem: np.ndarray   # int8
+    base_anos: np.ndarray      # int16
+    aceita_penal: np.ndarray   # bool
+    regime_anterior: np.ndarray  # bool
+    teto_marcos: np.ndarray    # datetime64[D] (sem teto: 9999-12-31)
+    marco_lei: np.datetime64
+    dias_intercorrente: np.timedelta64
+
+@lru_cache(maxsize=8)
+def _arrays(t: TabelaDecisao) -> _TabelaArrays:
+    return _TabelaArrays(
+        termo_origem=np.array(t.termo_origem, dtype=np.int8),
+        base_anos=np.array(t.base_anos, dtype=np.int16),
+        aceita_penal=np.array(t.aceita_penal, dtype=bool),
+        regime_anterior=np.array(t.regime_anterior, dtype=bool),
+        teto_marcos=np.array([d or _MAX_D for d in t.teto_marcos], dtype="datetime64[D]"),
+        marco_lei=np.datetime64(t.conjunto.marco_lei, "D"),
+        dias_intercorrente=np.timedelta64(t.conjunto.dias_intercorrente, "D"),
+    )
+
+def calcular_vetorial(enquadramento: np.ndarray,
+                      termo_inicial_fato: np.ndarray,
+                      data_ciencia: np.ndarray,
+                      offsets: np.ndarray,
+                      valores: np.ndarray,
+                      prazo_penal_anos: np.ndarray | None = None,
+                      data_ultimo_ato: np.ndarray | None = None,
+                      idata_subseq: np.ndarray | None = None,
+                      data_referencia: date | None = None,
+                      regras: TabelaDecisao | None = None) -> ResultadoVetorial:
+    """Equivalente colunar de ``calcular_por_gestor``, avaliado em ``data_referencia`` (padrão: hoje).
+
+    ``prazo_penal_anos``: 0 onde não se aplica prazo penal. ``data_ultimo_ato``: NaT onde a
+    intercorrente não é checada. ``idata_subseq``: NaT onde o ato subsequente ainda não foi
+    praticado (a paralisação conta até a data de referência).
+    """
+    ta = _arrays(regras or tabela_padrao())
+    enq = np.asarray(enquadramento, dtype=np.int8)
+    fato = np.asarray(termo_inicial_fato, dtype="datetime64[D]")
+    ciencia = np.asarray(data_ciencia, dtype="datetime64[D]")
+    valores = np.asarray(valores, dtype="datetime64[D]")
+    n = len(enq)
+    pre_lei = ta.regime_anterior[enq]
+
+    # Termo inicial por regime (origem na tabela de decisão)
+    origem = ta.termo_origem[enq]
+    termo = np.where(origem == TERMO_FATO, fato, np.where(origem == TERMO_MARCO_LEI, ta.marco_lei, ciencia))
+    # Regime anterior só considera marcos até o marco da lei
+    limite = ta.teto_marcos[enq]
+
+    # Base de prazo (penal prevalece onde a tabela admite)
+    base = ta.base_anos[enq]
+    if prazo_penal_anos is not None:
+        penal = np.asarray(prazo_penal_anos, dtype=np.int16)
+        base = np.where((penal > 0) & ta.aceita_penal[enq], penal, base)
+
+    inicio_contagem = _reinicio(termo, limite, offsets, valores)
+    prazo = somar_anos(inicio_contagem, base)
+
+    # Situação
+    ref64 = np.datetime64(data_referencia or date.today(), "D")
+    sit = np.where(prazo <= ref64, SIT_CONSUMADA, SIT_NAO_PRESCRITO).astype(np.int8)
+    if data_ultimo_ato is not None:
+        subseq = np.full(n, _NAT) if idata_subseq is None else np.asarray(idata_subseq, dtype="datetime64[D]")
+        dias = np.where(np.isnat(subseq), ref64, subseq) - np.asarray(data_ultimo_ato, dtype="datetime64[D]")
+        sit[dias >= ta.dias_intercorrente] = SIT_INTERCORRENTE
+    sit[pre_lei] = SIT_RECONHECIDA
+
+    return ResultadoVetorial(termo_inicial=termo, prazo_final=prazo, base_anos=base, situacao=sit,
+                             inicio_contagem=inicio_contagem)
+
+def janela_proximo_marco(res: ResultadoVetorial, data_referencia: date | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Versão colunar de ``prescricao_motor.janela_proximo_marco``: (início, último dia) da janela; NaT sem janela."""
+    ref64 = np.datetime64(data_referencia or date.today(), "D")
+    aberta = ((res.situacao != SIT_INTERCORRENTE) & (res.situacao != SIT_RECONHECIDA)
+              & (res.prazo_final > ref64))  # NaT → False
+    inicio = np.maximum(res.inicio_contagem + 1, ref64)
+    inicio = np.where(somar_anos(inicio, res.base_anos) <= res.prazo_final, inicio + 1, inicio)  # 29/02
+    return np.where(aberta, inicio, _NAT), np.where(aberta, res.prazo_final - 1, _NAT)
+
+# --------------------------------------------------------------------------------------
+# Linha do tempo: várias datas de referência numa passada
+# --------------------------------------------------------------------------------------
+def limites_intercorrente(data_ultimo_ato: np.ndarray,
+                          idata_subseq: np.ndarray | None = None,
+                          regras: TabelaDecisao | None = None) -> np.ndarray:
+    """Data em que a intercorrente se consuma pela passagem do tempo (ato subsequente em aberto); NaT nos demais."""
+    ultimo = np.asarray(data_ultimo_ato, dtype="datetime64[D]")
+    limite = ultimo + _arrays(regras or tabela_padrao()).dias_intercorrente
+    if idata_subseq is None:
+        return limite
+    return np.where(np.isnat(np.asarray(idata_subseq, dtype="datetime64[D]")), limite, _NAT)
+
+def datas_fim_de_mes(inicio: date, meses: int) -> np.ndarray:
+    """Último dia de cada mês, a partir do mês de ``inicio`` (``meses`` datas)."""
+    m = np.datetime64(inicio, "M") + np.arange(meses)
+    return (m + 1).astype("datetime64[D]") - 1
+
+def linha_do_tempo(prazo_final: np.ndarray,
+                   datas_referencia: np.ndarray,
+                   enquadramento: np.ndarray | None = None,
+                   limite_intercorrente: np.ndarray | None = None,
+                   intercorrente_fixo: np.ndarray | None = None) -> np.ndarray:
+    """Situação (int8, índice em SITUACOES) de cada linha em cada data: matriz linhas × datas.
+
+    ``limite_intercorrente``: ver ``limites_intercorrente``. ``intercorrente_fixo``: linhas cuja
+    intercorrente já está decidida por ato subsequente informado (vale em qualquer data).
+    Linhas pré-lei são "reconhecida" em todas as datas.
+    """
+    prazo = np.asarray(prazo_final, dtype="datetime64[D]")[:, None]
+    refs = np.asarray(datas_referencia, dtype="datetime64[D]")[None, :]
+    sit = np.where(prazo <= refs, SIT_CONSUMADA, SIT_NAO_PRESCRITO).astype(np.int8)
+    if limite_intercorrente is not None:
+        sit[np.asarray(limite_intercorrente, dtype="datetime64[D]")[:, None] <= refs] = SIT_INTERCORRENTE
+    if intercorrente_fixo is not None:
+        sit[np.asarray(intercorrente_fixo, dtype=bool)] = SIT_INTERCORRENTE
+    if enquadramento is not None:
+        sit[np.asarray(enquadramento) == ENQ_PRE_LEI] = SIT_RECONHECIDA
+    return sit
+
+def contagem_linha_do_tempo(prazo_final: np.ndarray,
+                            datas_referencia: np.ndarray,
+                            enquadramento: np.ndarray | None = None,
+                            limite_intercorrente: np.ndarray | None = None,
+                            intercorrente_fixo: np.ndarray | None = None,
+                            tamanho_bloco: int = 65536) -> np.ndarray:
+    """Contagem por situação em cada data (datas × SITUACOES), em blocos de linhas (memória limitada)."""
+    refs = np.asarray(datas_referencia, dtype="datetime64[D]")
+    n = len(prazo_final)
+    contagem = np.zeros((len(refs), len(SITUACOES)), dtype=np.int64)
+    fatia = lambda a, i: None if a is None else np.asarray(a)[i:i + tamanho_bloco]
+    for i in range(0, n, tamanho_bloco):
+        sit = linha_do_tempo(fatia(prazo_final, i), refs, fatia(enquadramento, i),
+                             fatia(limite_intercorrente, i), fatia(intercorrente_fixo, i))
+        for k in range(len(SITUACOES)):
+            contagem[:, k] += (sit == k).sum(axis=0)
+    return contagem
+
+def histograma_mensal(prazo_final: np.ndarray, inicio: date, meses: int, mascara: np.ndarray | None = None) -> np.ndarray:
+    """Número de datas-alvo em cada mês, de ``inicio`` até ``meses`` meses depois (fora do intervalo/NaT: ignorados)."""
+    prazo = np.asarray(prazo_final, dtype="datetime64[D]")
+    if mascara is not None:
+        prazo = prazo[np.asarray(mascara, dtype=bool)]
+    prazo = prazo[~np.isnat(prazo)]
+    idx = (prazo.astype("datetime64[M]") - np.datetime64(inicio, "M")).astype(np.int64)
+    idx = idx[(idx >= 0) & (idx < meses)]
+    return np.bincount(idx, minlength=meses)
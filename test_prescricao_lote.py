@@ -0,0 +1,31 @@
+# test_prescricao_lote.py
+from datetime import date
+
+from prescricao_lote import PREFIXO_ERRO, processar_lote
+
+def test_ciencia_vazia_vira_erro_da_linha():
+    linhas = [
+        {"processo": "1", "gestor": "A", "fato_cessacao": "2019-01-01", "ciencia": "", "transitou_pre_lc": "Sim"},
+        {"processo": "2", "gestor": "B", "fato_cessacao": "2022-01-01", "ciencia": "2022-06-01"},
+    ]
+    erro, ok = processar_lote(linhas)
+    assert erro["situacao"].startswith(f"{PREFIXO_ERRO} 2:")
+    assert not ok["situacao"].startswith(PREFIXO_ERRO)
+
+def test_ciencia_ausente_no_regime_anterior():
+    (saida,) = processar_lote([{"processo": "1", "gestor": "A", "fato_cessacao": "2015-01-01",
+                                "enquadramento": "Prescrição consumada antes da lei"}])
+    assert saida["situacao"] == f"{PREFIXO_ERRO} 2: ciencia ausente"
+
+def test_entrada_invalida_vira_linha_de_erro():
+    linhas = [
+        {"processo": "1", "gestor": "A", "fato_cessacao": "31/02/2020", "ciencia": "2021-01-01"},
+        {"processo": "2", "gestor": "B", "fato_cessacao": "2022-01-01", "ciencia": "2022-06-01", "prazo_penal_anos": "oito"},
+        {"processo": "3", "gestor": "C", "fato_cessacao": "2022-01-01", "ciencia": "2022-06-01", "enquadramento": "Outro"},
+        {"processo": "4", "gestor": "D", "fato_cessacao": "2022-01-01", "ciencia": "2022-06-01"},
+    ]
+    saidas = list(processar_lote(linhas, data_referencia=date(2026, 1, 1)))
+    assert [s["processo"] for s in saidas] == ["1", "2", "3", "4"]
+    for n, s in enumerate(saidas[:3], start=2):
+        assert s["situacao"].startswith(f"{PREFIXO_ERRO} {n}:")
+    assert saidas[3]["situacao"] == "Não prescrito"
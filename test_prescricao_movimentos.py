@@ -0,0 +1,38 @@
+# test_prescricao_movimentos.py
+from datetime import date
+
+from prescricao_movimentos import TabelaRegras, varrer_movimentos
+
+REF = date(2020, 1, 1)
+
+def _historico(*movimentos):
+    return [{"processo": "P1", "data": d, "tipo": t} for d, t in movimentos]
+
+def test_juntada_nao_interrompe_paralisacao():
+    linhas = _historico(("2015-03-01", "Despacho"), ("2017-06-01", "Juntada de petição"), ("2018-06-01", "Decisão"))
+    (v,) = varrer_movimentos(linhas, REF)
+    p = v.primeira
+    assert (p.inicio, p.fim, p.aberta) == (date(2015, 3, 1), date(2018, 6, 1), False)
+
+def test_sem_regras_toda_movimentacao_interrompe():
+    linhas = _historico(("2015-03-01", "Despacho"), ("2017-06-01", "Juntada de petição"), ("2018-06-01", "Decisão"))
+    (v,) = varrer_movimentos(linhas, REF, regras=TabelaRegras([]))
+    assert v.paralisacoes == []
+
+def test_mencao_ao_tce_nao_e_marco_geral():
+    regras = TabelaRegras()
+    assert regras.classificar("Ofício ao TCE") != "Marco geral"
+    assert regras.classificar("Instauração de TCE") == "Marco geral"
+
+def test_palavra_de_protocolo_no_meio_nao_rebaixa_o_marco():
+    regras = TabelaRegras()
+    assert regras.classificar("Citação do responsável - expediente 123/2020") == "Chamamento"
+    assert regras.classificar("Decisão condenatória - vista às partes") == "Marco geral"
+    assert regras.classificar("Auditoria - conclusão") == "Marco geral"
+    assert regras.classificar("Juntada de citação") == "Simples protocolo"
+
+def test_ato_que_menciona_protocolo_interrompe_paralisacao():
+    linhas = _historico(("2015-03-01", "Despacho"), ("2017-06-01", "Decisão condenatória - vista às partes"),
+                        ("2018-06-01", "Decisão"))
+    (v,) = varrer_movimentos(linhas, REF)
+    assert v.paralisacoes == []
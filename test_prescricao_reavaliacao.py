@@ -0,0 +1,43 @@
+# test_prescricao_reavaliacao.py
+from datetime import date
+
+from prescricao_banco import conectar, salvar_resultados_lote
+from prescricao_lote import processar_lote
+from prescricao_reavaliacao import SIT_CONSUMADA, SIT_INTERCORRENTE, SIT_NAO_PRESCRITO, reavaliar
+
+def _base(tmp_path):
+    linhas = [
+        # prazo final 2027-01-10
+        {"processo": "1", "gestor": "A", "fato_cessacao": "2022-01-10", "ciencia": "2022-06-01"},
+        # paralisação desde 2024-03-01 (ato subsequente em aberto): limite 2027-03-01
+        {"processo": "2", "gestor": "B", "fato_cessacao": "2023-01-10", "ciencia": "2023-06-01",
+         "check_intercorrente": "Sim", "intercorrente_ultimo_ato": "2024-03-01"},
+        {"processo": "3", "gestor": "C", "fato_cessacao": "2025-01-10", "ciencia": "2025-06-01"},
+    ]
+    con = conectar(str(tmp_path / "carteira.sqlite3"))
+    salvar_resultados_lote(con, processar_lote(linhas, data_referencia=date(2026, 1, 1)))
+    return con
+
+def _situacoes(con) -> dict[str, str]:
+    return {r["processo"]: r["situacao"] for r in con.execute("SELECT processo, situacao FROM resultados")}
+
+def test_reavaliar_registra_vencidos_e_intercorrente(tmp_path):
+    con = _base(tmp_path)
+    assert set(_situacoes(con).values()) == {SIT_NAO_PRESCRITO}
+
+    assert reavaliar(con, date(2027, 1, 9)) == []
+    (vencido,) = reavaliar(con, date(2027, 1, 10))
+    assert (vencido["processo"], vencido["gestor"], vencido["de"], vencido["para"]) == ("1", "A", SIT_NAO_PRESCRITO, SIT_CONSUMADA)
+    assert vencido["data_referencia"] == "2027-01-10"
+
+    (parado,) = reavaliar(con, date(2027, 3, 1))
+    assert (parado["processo"], parado["de"], parado["para"]) == ("2", SIT_NAO_PRESCRITO, SIT_INTERCORRENTE)
+    assert reavaliar(con, date(2027, 3, 1)) == []
+
+    assert _situacoes(con) == {"1": SIT_CONSUMADA, "2": SIT_INTERCORRENTE, "3": SIT_NAO_PRESCRITO}
+    registradas = con.execute("SELECT processo, de, para, data_referencia FROM transicoes ORDER BY rowid").fetchall()
+    assert [tuple(r) for r in registradas] == [
+        ("1", SIT_NAO_PRESCRITO, SIT_CONSUMADA, "2027-01-10"),
+        ("2", SIT_NAO_PRESCRITO, SIT_INTERCORRENTE, "2027-03-01"),
+    ]
+    con.close()
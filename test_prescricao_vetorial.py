@@ -0,0 +1,92 @@
+# test_prescricao_vetorial.py
+from datetime import date
+from itertools import product
+
+import numpy as np
+
+from prescricao_lote import calcular_linha
+from prescricao_regras import ENQ_NOVO, ENQUADRAMENTOS
+from prescricao_vetorial import (
+    SITUACOES,
+    calcular_vetorial,
+    codificar_enquadramentos,
+    empacotar_interrupcoes,
+    janela_proximo_marco,
+    para_datetime64,
+)
+
+REF = date(2026, 1, 1)
+
+def _casos() -> list[dict]:
+    """Grade de casos: todos os enquadramentos × datas de fato/ciência × marcos (com 29/02) × prazo penal × paralisação."""
+    fatos = [date(2016, 2, 29), date(2020, 7, 1), date(2022, 3, 10)]
+    ciencias = [date(2017, 5, 2), date(2021, 1, 15)]
+    marcos = [[], [date(2018, 2, 28)], [date(2019, 6, 1), date(2024, 2, 29)], [date(2015, 1, 1), date(2023, 11, 30)]]
+    penais = [None, 8]
+    ultimos_atos = [None, date(2021, 6, 1), date(2023, 6, 1)]
+    casos = []
+    for enq, fato, ciencia, ms, penal, ato in product(ENQUADRAMENTOS, fatos, ciencias, marcos, penais, ultimos_atos):
+        casos.append({
+            "gestor": "G",
+            "enquadramento": enq,
+            "fato_cessacao": fato.isoformat(),
+            "ciencia": ciencia.isoformat(),
+            "marcos_gerais": "; ".join(d.isoformat() for d in ms[:1]),
+            "chamamentos": "; ".join(d.isoformat() for d in ms[1:]),
+            "aplicar_prazo_penal": "Sim" if penal else "Não",
+            "prazo_penal_anos": penal or "",
+            "check_intercorrente": "Sim" if ato else "Não",
+            "intercorrente_ultimo_ato": ato.isoformat() if ato else "",
+            "_fato": fato, "_ciencia": ciencia, "_marcos": ms, "_penal": penal or 0, "_ato": ato,
+        })
+    return casos
+
+def _vetorial(casos: list[dict]):
+    offsets, valores = empacotar_interrupcoes([c["_marcos"] for c in casos])
+    return calcular_vetorial(
+        codificar_enquadramentos([c["enquadramento"] for c in casos]),
+        para_datetime64([c["_fato"] for c in casos]),
+        para_datetime64([c["_ciencia"] for c in casos]),
+        offsets, valores,
+        prazo_penal_anos=np.array([c["_penal"] for c in casos]),
+        data_ultimo_ato=para_datetime64([c["_ato"] for c in casos]),
+        data_referencia=REF,
+    )
+
+def _iso(d64) -> str:
+    return "" if np.isnat(d64) else str(d64)
+
+def test_vetorial_equivale_ao_calculo_por_linha():
+    casos = _casos()
+    res = _vetorial(casos)
+    for i, caso in enumerate(casos):
+        esperado = calcular_linha(caso, REF)
+        assert SITUACOES[res.situacao[i]] == esperado["situacao"], caso
+        assert _iso(res.prazo_final[i]) == esperado["prazo_final"], caso
+        assert _iso(res.termo_inicial[i]) == esperado["termo_inicial"], caso
+
+def test_janela_vetorial_equivale_a_escalar():
+    casos = _casos()
+    inicio, ultimo = janela_proximo_marco(_vetorial(casos), REF)
+    for i, caso in enumerate(casos):
+        esperado = calcular_linha(caso, REF)
+        assert _iso(inicio[i]) == esperado["marco_janela_inicio"], caso
+        assert _iso(ultimo[i]) == esperado["marco_ultimo_dia"], caso
+
+def test_janela_apos_marco_em_28_02_de_ano_bissexto():
+    # Reinício em 29/02/2024 dá 28/02/2029, o mesmo prazo do marco de 28/02: a janela só abre em 01/03
+    caso = {"gestor": "G", "enquadramento": ENQUADRAMENTOS[ENQ_NOVO], "fato_cessacao": "2022-03-10",
+            "ciencia": "2022-06-01", "marcos_gerais": "2024-02-28"}
+    ref = date(2024, 2, 1)
+    esperado = calcular_linha(caso, ref)
+    assert esperado["prazo_final"] == "2029-02-28"
+    assert esperado["marco_janela_inicio"] == "2024-03-01"
+    assert esperado["marco_ultimo_dia"] == "2029-02-27"
+    assert calcular_linha({**caso, "marcos_gerais": "2024-02-28; 2024-02-29"}, ref)["prazo_final"] == "2029-02-28"
+    assert calcular_linha({**caso, "marcos_gerais": "2024-02-28; 2024-03-01"}, ref)["prazo_final"] == "2029-03-01"
+
+    offsets, valores = empacotar_interrupcoes([[date(2024, 2, 28)]])
+    res = calcular_vetorial(codificar_enquadramentos([caso["enquadramento"]]), para_datetime64([date(2022, 3, 10)]),
+                            para_datetime64([date(2022, 6, 1)]), offsets, valores, data_referencia=ref)
+    inicio, ultimo = janela_proximo_marco(res, ref)
+    assert (_iso(inicio[0]), _iso(ultimo[0])) == ("2024-03-01", "2029-02-27")